@@ -0,0 +1,761 @@
+"""
+Gerador de dados sintéticos e servidor local que imita o layout de URLs do
+dadosabertos.camara.leg.br, para rodar e medir o gera_csv.py sem rede.
+
+Uso:
+    python dados_sinteticos.py gerar --pasta fixture --escala 10
+    python dados_sinteticos.py servir --pasta fixture --porta 8000
+
+Com o servidor no ar, basta apontar o pipeline para ele:
+    DADOS_ABERTOS_URL=http://localhost:8000 python gera_csv.py
+
+Os testes (tests/) geram um conjunto em escala 1 e sobem o servidor numa thread:
+    python -m pytest -q
+"""
+import argparse
+import csv
+import email.utils
+import functools
+import gzip
+import itertools
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+anos_padrao = (2023, 2024)
+legislatura_padrao = 57
+
+# Volumes por ano na escala 1x. A escala multiplica tudo, exceto o número de deputados.
+volumes_base = {
+    "proposicoes": 4000,
+    "eventos": 1500,
+    "votacoes": 800,
+}
+
+partidos = [
+    ("PL", 37906), ("PT", 36844), ("UNIÃO", 38009), ("PP", 37903), ("MDB", 36899),
+    ("PSD", 36834), ("REPUBLICANOS", 37908), ("PDT", 36786), ("PSB", 36832),
+    ("PSDB", 36835), ("PSOL", 36839), ("PODE", 37905), ("AVANTE", 37907),
+    ("PCdoB", 36779), ("PV", 36851), ("CIDADANIA", 37904), ("NOVO", 37901),
+    ("SOLIDARIEDADE", 37902), ("REDE", 37909), ("PRD", 38010),
+]
+ufs = ["AC", "AL", "AM", "AP", "BA", "CE", "DF", "ES", "GO", "MA", "MG", "MS", "MT", "PA",
+       "PB", "PE", "PI", "PR", "RJ", "RN", "RO", "RR", "RS", "SC", "SE", "SP", "TO"]
+
+# (siglaTipo, descricaoTipo, peso)
+tipos_proposicao = [
+    ("PL", "Projeto de Lei", 30),
+    ("PLP", "Projeto de Lei Complementar", 3),
+    ("PEC", "Proposta de Emenda à Constituição", 1),
+    ("PDL", "Projeto de Decreto Legislativo de Sustação de Atos Normativos do Poder Executivo", 4),
+    ("PLV", "Projeto de Lei de Conversão", 1),
+    ("VTS", "Voto em Separado", 2),
+    ("SBT", "Substitutivo", 3),
+    ("PRL", "Parecer do Relator", 12),
+    ("EMP", "Emenda de Plenário", 4),
+    ("EMP", "Emenda de Plenário à MPV (Ato Conjunto 1/2020)", 3),
+    ("EMR", "Emenda de Relator", 2),
+    ("EMO", "Emenda ao Orçamento", 8),
+    ("EML", "Emenda à LDO", 2),
+    ("REQ", "Requerimento de Audiência Pública", 10),
+    ("REQ", "Requerimento de Informação", 6),
+    ("REQ", "Requerimento de Convocação de Ministro de Estado na Comissão", 1),
+    ("REQ", "Requerimento de Convocação de Autoridade", 1),
+    ("REQ", "Requerimento de Instituição de CPI", 1),
+    ("PFC", "Proposta de Fiscalização e Controle", 1),
+    ("RIC", "Requerimento de Informação", 4),
+]
+regimes_tramitacao = [
+    ("Ordinário (Art. 151, III, RICD)", 70),
+    ("Urgência (Art. 155, RICD)", 15),
+    ("Especial (Art. 202 c/c 191, RICD)", 5),
+    ("Especial", 2),
+    ("Prioridade (Art. 151, II, RICD)", 8),
+]
+ementas = [
+    "Dispõe sobre a política nacional de {}.",
+    "Altera a Lei nº {} para tratar de segurança pública.",
+    "Institui o Dia Nacional do {}.",
+    "Denomina ponte sobre o rio {}.",
+    "Concede o título de patrono a {}.",
+    "Estabelece normas gerais para o {} no âmbito do SUS.",
+    "Acrescenta dispositivo ao Código Civil sobre {}.",
+    "Institui a Semana de conscientização sobre {}.",
+]
+temas = [
+    "Homenagens e Datas Comemorativas", "Saúde", "Educação", "Economia",
+    "Direito Penal e Processual Penal", "Meio Ambiente e Desenvolvimento Sustentável",
+    "Trabalho e Emprego", "Administração Pública",
+]
+tipos_evento = [
+    ("Sessão Deliberativa", 20),
+    ("Reunião Deliberativa", 25),
+    ("Audiência Pública", 20),
+    ("Audiência Pública e Deliberação", 5),
+    ("Evento Técnico", 4),
+    ("Reunião Técnica", 4),
+    ("Visita Técnica", 2),
+    ("Sessão Não Deliberativa Solene", 5),
+    ("Seminário", 5),
+]
+opcoes_voto = [("Sim", 55), ("Não", 35), ("Abstenção", 3), ("Obstrução", 5), ("Artigo 17", 2)]
+opcoes_orientacao = [("Sim", 45), ("Não", 35), ("Liberado", 12), ("Obstrução", 8)]
+orgaos = [
+    ("PLEN", "Plenário", "Plenário"),
+    ("CCJC", "Comissão de Constituição e Justiça e de Cidadania", "Comissão de Constituição e Justiça e de Cidadania"),
+    ("CFT", "Comissão de Finanças e Tributação", "Comissão de Finanças e Tributação"),
+    ("CSAUDE", "Comissão de Saúde", "Comissão de Saúde"),
+    ("CE", "Comissão de Educação", "Comissão de Educação"),
+    ("CMADS", "Comissão de Meio Ambiente e Desenvolvimento Sustentável", "Comissão de Meio Ambiente e Desenvolvimento Sustentável"),
+    ("PEC04523", "Comissão Especial sobre a PEC 45/2023", "Comissão Especial destinada a proferir parecer à PEC 45/2023"),
+    ("CPIMST", "CPI - Movimento dos Trabalhadores Sem Terra", "CPI do MST"),
+    ("CMO", "Comissão Mista de Planos, Orçamentos Públicos e Fiscalização", "Comissão Mista de Orçamento"),
+]
+cargos_orgaos = [("Titular", 60), ("Suplente", 30), ("Presidente", 3), ("1º Vice-Presidente", 3), ("2º Vice-Presidente", 2), ("3º Vice-Presidente", 2)]
+
+url_camara = "https://dadosabertos.camara.leg.br"
+
+
+# Tamanho dos blocos (em eventos ou votações) em que presenças e votos são sorteados e gravados
+tamanho_bloco = 1000
+# Deputados que votam em cada votação de comissão
+votantes_comissao = 40
+# Fração das votações de plenário sem evento associado, como acontece no portal
+fracao_plenario_sem_evento = 0.05
+# Um em cada intervalo_licencas deputados da legislatura está licenciado: fica fora da
+# listagem de deputados em exercício, e a API informa a situação só no detalhe
+intervalo_licencas = 50
+
+
+def sortear_indices(rng, opcoes, n):
+    """Sorteia n índices de uma lista de pares (valor, peso)."""
+    pesos = np.array([p for *_, p in opcoes], dtype=float)
+    return rng.choice(len(opcoes), size=n, p=pesos / pesos.sum())
+
+
+def sortear_amostras(rng, tamanhos, populacao):
+    """
+    Sorteia, para cada grupo i, tamanhos[i] elementos distintos de range(populacao).
+    Retorna os vetores achatados (grupo, elemento), em ordem de grupo.
+    """
+    ordem = np.argsort(rng.random((len(tamanhos), populacao)), axis=1)
+    mascara = np.arange(populacao) < np.minimum(tamanhos, populacao)[:, None]
+    return np.nonzero(mascara)[0], ordem[mascara]
+
+
+def blocos(n, tamanho=tamanho_bloco):
+    """Fatias consecutivas de range(n) com até `tamanho` elementos."""
+    for inicio in range(0, n, tamanho):
+        yield slice(inicio, min(inicio + tamanho, n))
+
+
+def com_prefixo(prefixo, valores):
+    """Concatena um prefixo a cada valor do vetor (ex.: URIs a partir de ids)."""
+    return np.char.add(prefixo, np.asarray(valores).astype(str))
+
+
+def escrever_csv(caminho, colunas, linhas):
+    """Grava um CSV no formato do portal (separador ';', UTF-8)."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo, delimiter=";", quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+        escritor.writerow(colunas)
+        escritor.writerows(linhas)
+
+
+def campos_csv(valores, n):
+    """
+    Textos de uma coluna do CSV (n linhas), entre aspas só onde há ';', aspas ou quebra
+    de linha, como faria o csv.writer com QUOTE_MINIMAL.
+    """
+    texto = valores.astype(str) if isinstance(valores, np.ndarray) else np.array([str(valores)])
+    especiais = np.zeros(len(texto), dtype=bool)
+    for caractere in ';"\n':
+        especiais |= np.char.find(texto, caractere) >= 0
+    if especiais.any():
+        citado = np.char.add(np.char.add('"', np.char.replace(texto, '"', '""')), '"')
+        texto = np.where(especiais, citado, texto)
+    return texto.tolist() if isinstance(valores, np.ndarray) else itertools.repeat(texto[0], n)
+
+
+def escrever_colunas(caminho, colunas, blocos_colunas):
+    """
+    Grava um CSV no formato do portal a partir de blocos de colunas: cada bloco é uma
+    lista, na ordem de `colunas`, de vetores numpy (um valor por linha) ou de valores
+    constantes. As linhas de cada bloco são montadas e gravadas de uma vez.
+    """
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(";".join(colunas) + "\n")
+        for valores in blocos_colunas:
+            n = max(len(v) for v in valores if isinstance(v, np.ndarray))
+            if n:
+                arquivo.write("\n".join(map(";".join, zip(*(campos_csv(v, n) for v in valores)))) + "\n")
+
+
+def caminho_arquivo(pasta, dataset, nome):
+    """Caminho local equivalente a /arquivos/{dataset}/csv/{nome} no portal."""
+    return os.path.join(pasta, "arquivos", dataset, "csv", nome)
+
+
+def datas_aleatorias(rng, ano, n):
+    """Sorteia n datas e horas dentro do ano (datetime64[s])."""
+    return np.datetime64(f"{ano}-01-01T00:00:00") + rng.integers(0, 365 * 24 * 3600, size=n).astype("timedelta64[s]")
+
+
+def formatar_datas(datas, unidade="m"):
+    """Formata datas no padrão ISO do portal, até a unidade pedida ('D', 'm' ou 's')."""
+    return np.datetime_as_string(datas, unit=unidade)
+
+
+def atributos_deputados(deputados):
+    """Vetores com os campos dos deputados usados nas linhas dos CSVs, na ordem da lista."""
+    ids = np.array([d["id"] for d in deputados])
+    return {
+        "id": ids,
+        "uri": com_prefixo(f"{url_camara}/api/v2/deputados/", ids),
+        "nome": np.array([d["nome"] for d in deputados]),
+        "siglaPartido": np.array([d["siglaPartido"] for d in deputados]),
+        "uriPartido": com_prefixo(f"{url_camara}/api/v2/partidos/", [d["idPartido"] for d in deputados]),
+        "siglaUf": np.array([d["siglaUf"] for d in deputados]),
+    }
+
+
+def gerar_deputados(rng, pasta, legislatura=legislatura_padrao, n_deputados=513, n_historicos=1500):
+    """
+    Gera o deputados.csv (deputados da legislatura + históricos) e o arquivo
+    api/deputados.json usado pelo servidor para responder à API.
+    """
+    deputados = []
+    ids = rng.choice(np.arange(60000, 240000), size=n_deputados + n_historicos, replace=False)
+    for i, id_dep in enumerate(ids):
+        atual = i < n_deputados
+        partido, id_partido = partidos[int(rng.integers(len(partidos)))]
+        nascimento = datetime(1950, 1, 1) + timedelta(days=int(rng.integers(0, 365 * 50)))
+        deputados.append({
+            "id": int(id_dep),
+            "nome": f"Deputado {id_dep}",
+            "nomeCivil": f"Fulano de Tal {id_dep}",
+            "cpf": f"{int(rng.integers(0, 10**11)):011d}",
+            "siglaSexo": "F" if rng.random() < 0.18 else "M",
+            "dataNascimento": nascimento.strftime("%Y-%m-%d"),
+            "siglaPartido": partido,
+            "idPartido": id_partido,
+            "siglaUf": ufs[int(rng.integers(len(ufs)))],
+            "idLegislaturaInicial": int(rng.integers(48, legislatura + 1)) if atual else int(rng.integers(40, legislatura)),
+            "idLegislaturaFinal": legislatura if atual else int(rng.integers(45, legislatura)),
+            "atual": atual,
+            "situacao": ("Licença" if i % intervalo_licencas == intervalo_licencas - 1 else "Exercício")
+                        if atual else "Fim de Mandato",
+        })
+
+    colunas = ["uri", "nome", "idLegislaturaInicial", "idLegislaturaFinal", "nomeCivil", "cpf",
+               "siglaSexo", "urlRedeSocial", "urlWebsite", "dataNascimento", "dataFalecimento",
+               "ufNascimento", "municipioNascimento"]
+    linhas = [[f"{url_camara}/api/v2/deputados/{d['id']}", d["nome"], d["idLegislaturaInicial"],
+               d["idLegislaturaFinal"], d["nomeCivil"], d["cpf"], d["siglaSexo"], "", "",
+               d["dataNascimento"], "", d["siglaUf"], "Cidade"] for d in deputados]
+    escrever_csv(caminho_arquivo(pasta, "deputados", "deputados.csv"), colunas, linhas)
+
+    os.makedirs(os.path.join(pasta, "api"), exist_ok=True)
+    with open(os.path.join(pasta, "api", "deputados.json"), "w", encoding="utf-8") as arquivo:
+        json.dump(deputados, arquivo, ensure_ascii=False)
+
+    return [d for d in deputados if d["atual"]]
+
+
+def gerar_proposicoes(rng, pasta, ano, deputados, escala, proximo_id):
+    """Gera proposições, autores e temas de um ano. Retorna o vetor de ids de REQ."""
+    n = volumes_base["proposicoes"] * escala
+    ids = np.arange(proximo_id, proximo_id + n)
+    tipos = sortear_indices(rng, tipos_proposicao, n)
+    regimes = sortear_indices(rng, regimes_tramitacao, n)
+    datas = formatar_datas(datas_aleatorias(rng, ano, n))
+    siglas = np.array([sigla for sigla, _, _ in tipos_proposicao])[tipos]
+    descricoes = np.array([descricao for _, descricao, _ in tipos_proposicao])[tipos]
+    modelos = rng.integers(len(ementas), size=n)
+    antes, depois = (np.array(partes) for partes in zip(*(ementa.split("{}") for ementa in ementas)))
+    textos = np.char.add(np.char.add(antes[modelos], rng.integers(1000, 99999, size=n).astype(str)), depois[modelos])
+    uris = com_prefixo(f"{url_camara}/api/v2/proposicoes/", ids)
+
+    colunas = ["id", "uri", "siglaTipo", "numero", "ano", "codTipo", "descricaoTipo", "ementa",
+               "ementaDetalhada", "keywords", "dataApresentacao", "uriOrgaoNumerador",
+               "uriPropAnterior", "uriPropPrincipal", "uriPropPosterior", "urlInteiroTeor", "urnFinal",
+               "ultimoStatus_dataHora", "ultimoStatus_sequencia", "ultimoStatus_uriRelator",
+               "ultimoStatus_idOrgao", "ultimoStatus_siglaOrgao", "ultimoStatus_uriOrgao",
+               "ultimoStatus_regime", "ultimoStatus_descricaoTramitacao", "ultimoStatus_idTipoTramitacao",
+               "ultimoStatus_descricaoSituacao", "ultimoStatus_idSituacao", "ultimoStatus_despacho",
+               "ultimoStatus_apreciacao", "ultimoStatus_url"]
+    escrever_colunas(caminho_arquivo(pasta, "proposicoes", f"proposicoes-{ano}.csv"), colunas, [[
+        ids, uris, siglas, np.arange(1, n + 1), ano, 139, descricoes, textos, "", "", datas, "", "", "", "", "", "",
+        datas, 1, "", 180, "PLEN", "", np.array([regime for regime, _ in regimes_tramitacao])[regimes],
+        "Apresentação", 100, "Aguardando Despacho", 924, "", "Proposição Sujeita à Apreciação do Plenário", "",
+    ]])
+
+    # Autores: 1 a 4 por proposição, com alguns autores que não são deputados.
+    colunas = ["idProposicao", "uriProposicao", "idDeputadoAutor", "uriAutor", "codTipoAutor",
+               "tipoAutor", "nomeAutor", "siglaPartidoAutor", "uriPartidoAutor", "siglaUFAutor",
+               "ordemAssinatura", "proponente"]
+    n_autores = rng.integers(1, 5, size=n)
+    proposicao = np.repeat(np.arange(n), n_autores)
+    ordem = np.arange(len(proposicao)) - np.repeat(np.cumsum(n_autores) - n_autores, n_autores) + 1
+    executivo = rng.random(len(proposicao)) < 0.05
+    dep = rng.integers(len(deputados), size=len(proposicao))
+    proponente = ((ordem == 1) | executivo | (rng.random(len(proposicao)) < 0.7)).astype(int)
+    atributos = atributos_deputados(deputados)
+    escrever_colunas(caminho_arquivo(pasta, "proposicoesAutores", f"proposicoesAutores-{ano}.csv"), colunas, [[
+        ids[proposicao], uris[proposicao],
+        np.where(executivo, "", atributos["id"][dep].astype(str)),
+        np.where(executivo, f"{url_camara}/api/v2/orgaos/2001", atributos["uri"][dep]),
+        np.where(executivo, 40000, 10000),
+        np.where(executivo, "Órgão do Poder Executivo", "Deputado(a)"),
+        np.where(executivo, "Poder Executivo", atributos["nome"][dep]),
+        np.where(executivo, "", atributos["siglaPartido"][dep]),
+        np.where(executivo, "", atributos["uriPartido"][dep]),
+        np.where(executivo, "", atributos["siglaUf"][dep]),
+        ordem, proponente,
+    ]])
+
+    colunas = ["uriProposicao", "siglaTipo", "numero", "ano", "codTema", "tema", "relevancia"]
+    com_tema = np.nonzero(rng.random(n) < 0.7)[0]
+    tema = rng.integers(len(temas), size=len(com_tema))
+    escrever_colunas(caminho_arquivo(pasta, "proposicoesTemas", f"proposicoesTemas-{ano}.csv"), colunas, [[
+        uris[com_tema], siglas[com_tema], com_tema + 1, ano, 40 + tema, np.array(temas)[tema], 0,
+    ]])
+
+    return ids[siglas == "REQ"]
+
+
+def gerar_eventos(rng, pasta, ano, deputados, escala, proximo_id, reqs):
+    """Gera eventos, presenças e requerimentos de um ano. Retorna (ids, datas) dos eventos de plenário."""
+    n = volumes_base["eventos"] * escala
+    ids = np.arange(proximo_id, proximo_id + n)
+    tipos = np.array([tipo for tipo, _ in tipos_evento])[sortear_indices(rng, tipos_evento, n)]
+    datas = datas_aleatorias(rng, ano, n)
+    inicio = formatar_datas(datas)
+    uris = com_prefixo(f"{url_camara}/api/v2/eventos/", ids)
+
+    colunas = ["id", "uri", "urlDocumentoPauta", "dataHoraInicio", "dataHoraFim", "situacao",
+               "descricao", "descricaoTipo", "localExterno", "localCamara_nome"]
+    escrever_colunas(caminho_arquivo(pasta, "eventos", f"eventos-{ano}.csv"), colunas, [[
+        ids, uris, "", inicio, formatar_datas(datas + np.timedelta64(3, "h")), "Encerrada", "Evento sintético",
+        tipos, "", "Anexo II",
+    ]])
+
+    # Presenças: 400 deputados nas sessões deliberativas e 25 nos demais eventos
+    plenario = tipos == "Sessão Deliberativa"
+    presentes = np.where(plenario, 400, 25)
+    atributos = atributos_deputados(deputados)
+
+    def presencas():
+        for bloco in blocos(n):
+            evento, dep = sortear_amostras(rng, presentes[bloco], len(deputados))
+            evento += bloco.start
+            yield [ids[evento], uris[evento], inicio[evento], atributos["id"][dep], atributos["uri"][dep]]
+
+    colunas = ["idEvento", "uriEvento", "dataHoraInicio", "idDeputado", "uriDeputado"]
+    escrever_colunas(caminho_arquivo(pasta, "eventosPresencaDeputados", f"eventosPresencaDeputados-{ano}.csv"),
+                     colunas, presencas())
+
+    colunas = ["idEvento", "uriEvento", "tituloRequerimento", "uriRequerimento"]
+    audiencias = np.nonzero(np.char.startswith(tipos, "Audiência Pública"))[0] if len(reqs) else np.array([], dtype=int)
+    evento = np.repeat(audiencias, rng.integers(1, 4, size=len(audiencias)))
+    req = reqs[rng.integers(len(reqs), size=len(evento))] if len(reqs) else np.array([], dtype=int)
+    escrever_colunas(caminho_arquivo(pasta, "eventosRequerimentos", f"eventosRequerimentos-{ano}.csv"), colunas, [[
+        ids[evento], uris[evento], np.char.add(com_prefixo("REQ ", req % 1000), f"/{ano}"),
+        com_prefixo(f"{url_camara}/api/v2/proposicoes/", req),
+    ]])
+
+    return ids[plenario], datas[plenario]
+
+
+def gerar_votacoes(rng, pasta, ano, deputados, escala, proximo_id, plenario, legislatura=legislatura_padrao):
+    """
+    Gera votações, votos individuais e orientações de bancada de um ano. Votações de
+    plenário têm voto de todos os deputados (algumas sem evento associado); as de
+    comissão, de votantes_comissao deputados.
+    """
+    n = volumes_base["votacoes"] * escala
+    ids = np.char.add(np.char.add(np.arange(proximo_id, proximo_id + n).astype(str), "-"),
+                      rng.integers(1, 300, size=n).astype(str))
+    uris = com_prefixo(f"{url_camara}/api/v2/votacoes/", ids)
+    ids_plenario, datas_plenario = plenario
+    if len(ids_plenario):
+        no_plenario = rng.random(n) < 0.6
+        sessao = rng.integers(len(ids_plenario), size=n)
+        eventos = ids_plenario[sessao]
+        datas = np.where(no_plenario, datas_plenario[sessao], datas_aleatorias(rng, ano, n))
+    else:
+        no_plenario = np.zeros(n, dtype=bool)
+        eventos = np.zeros(n, dtype=int)
+        datas = datas_aleatorias(rng, ano, n)
+    com_evento = no_plenario & (rng.random(n) >= fracao_plenario_sem_evento)
+    horas = formatar_datas(datas, "s")
+    votantes = np.where(no_plenario, len(deputados), votantes_comissao)
+    atributos = atributos_deputados(deputados)
+    nomes_voto = np.array([voto for voto, _ in opcoes_voto])
+    sim = np.zeros(n, dtype=int)
+    nao = np.zeros(n, dtype=int)
+
+    def votos():
+        for bloco in blocos(n):
+            votacao, dep = sortear_amostras(rng, votantes[bloco], len(deputados))
+            votacao += bloco.start
+            voto = sortear_indices(rng, opcoes_voto, len(votacao))
+            sim[:] += np.bincount(votacao[voto == 0], minlength=n)
+            nao[:] += np.bincount(votacao[voto == 1], minlength=n)
+            # ~10% dos votos não são registrados
+            registrado = rng.random(len(votacao)) >= 0.1
+            votacao, dep, voto = votacao[registrado], dep[registrado], voto[registrado]
+            yield [ids[votacao], uris[votacao], horas[votacao], nomes_voto[voto], atributos["id"][dep],
+                   atributos["uri"][dep], atributos["nome"][dep], atributos["siglaPartido"][dep],
+                   atributos["uriPartido"][dep], atributos["siglaUf"][dep], legislatura, ""]
+
+    escrever_colunas(caminho_arquivo(pasta, "votacoesVotos", f"votacoesVotos-{ano}.csv"),
+                     ["idVotacao", "uriVotacao", "dataHoraVoto", "voto", "deputado_id", "deputado_uri",
+                      "deputado_nome", "deputado_siglaPartido", "deputado_uriPartido", "deputado_siglaUf",
+                      "deputado_idLegislatura", "deputado_urlFoto"], votos())
+
+    colunas = ["id", "uri", "data", "dataHoraRegistro", "idOrgao", "uriOrgao", "siglaOrgao", "idEvento",
+               "uriEvento", "aprovacao", "votosSim", "votosNao", "votosOutros", "descricao",
+               "ultimaAberturaVotacao_dataHoraRegistro", "ultimaAberturaVotacao_descricao",
+               "ultimaApresentacaoProposicao_dataHoraRegistro", "ultimaApresentacaoProposicao_descricao",
+               "ultimaApresentacaoProposicao_idProposicao", "ultimaApresentacaoProposicao_uriProposicao"]
+    id_orgao = np.where(no_plenario, 180, 2003)
+    escrever_colunas(caminho_arquivo(pasta, "votacoes", f"votacoes-{ano}.csv"), colunas, [[
+        ids, uris, formatar_datas(datas, "D"), horas, id_orgao, com_prefixo(f"{url_camara}/api/v2/orgaos/", id_orgao),
+        np.where(no_plenario, "PLEN", "CCJC"), np.where(com_evento, eventos.astype(str), ""),
+        np.where(com_evento, com_prefixo(f"{url_camara}/api/v2/eventos/", eventos), ""),
+        (sim > nao).astype(int), sim, nao, votantes - sim - nao, "Votação sintética", "", "", "", "", "", "",
+    ]])
+
+    # Orientações de plenário: uma por partido e a do Governo
+    votacao = np.repeat(np.nonzero(no_plenario)[0], len(partidos) + 1)
+    orientacoes = np.array([orientacao for orientacao, _ in opcoes_orientacao])[
+        sortear_indices(rng, opcoes_orientacao, no_plenario.sum() * len(partidos))].reshape(-1, len(partidos))
+    bancadas = np.array([sigla for sigla, _ in partidos] + ["Governo"])
+    uris_bancadas = np.append(com_prefixo(f"{url_camara}/api/v2/partidos/", [id_partido for _, id_partido in partidos]), "")
+    escrever_colunas(caminho_arquivo(pasta, "votacoesOrientacoes", f"votacoesOrientacoes-{ano}.csv"),
+                     ["idVotacao", "uriVotacao", "siglaOrgao", "descricao", "siglaBancada", "uriBancada",
+                      "orientacao"], [[
+        ids[votacao], uris[votacao], "PLEN", "Orientação", np.tile(bancadas, no_plenario.sum()),
+        np.tile(uris_bancadas, no_plenario.sum()),
+        np.column_stack([orientacoes, np.full(len(orientacoes), "Sim")]).ravel(),
+    ]])
+
+
+def gerar_orgaos(rng, pasta, deputados, legislatura=legislatura_padrao):
+    """Gera o orgaos.csv e os cargos dos deputados na legislatura."""
+    colunas = ["id", "uri", "sigla", "nome", "apelido", "codTipoOrgao", "tipoOrgao", "nomePublicacao",
+               "dataInicio", "dataInstalacao", "dataFim", "dataFimOriginal", "codSituacao",
+               "descricaoSituacao", "casa", "sala", "urlWebsite"]
+    linhas = [[2000 + i, f"{url_camara}/api/v2/orgaos/{2000 + i}", sigla, nome, nome, 2, "Comissão",
+               publicacao, "2023-02-01", "2023-02-01", "", "", "" if sigla == "PLEN" else 1,
+               "Em funcionamento", "CD", "", ""] for i, (sigla, nome, publicacao) in enumerate(orgaos)]
+    escrever_csv(caminho_arquivo(pasta, "orgaos", "orgaos.csv"), colunas, linhas)
+
+    colunas = ["uriOrgao", "siglaOrgao", "nomeOrgao", "nomePublicacaoOrgao", "uriDeputado", "nomeDeputado",
+               "siglaPartido", "siglaUF", "cargo", "dataInicio", "dataFim"]
+    linhas = []
+    for dep in deputados:
+        for i in rng.choice(len(orgaos), size=int(rng.integers(1, 5)), replace=False):
+            sigla, nome, publicacao = orgaos[i]
+            cargo = cargos_orgaos[sortear_indices(rng, cargos_orgaos, 1)[0]][0]
+            linhas.append([f"{url_camara}/api/v2/orgaos/{2000 + i}", sigla, nome, publicacao,
+                           f"{url_camara}/api/v2/deputados/{dep['id']}", dep["nome"], dep["siglaPartido"],
+                           dep["siglaUf"], cargo, "2023-02-01", ""])
+    escrever_csv(caminho_arquivo(pasta, "orgaosDeputados", f"orgaosDeputados-L{legislatura}.csv"), colunas, linhas)
+
+
+def gerar_dados(pasta, escala=1, anos=anos_padrao, semente=0):
+    """
+    Gera um conjunto completo de arquivos sintéticos com o mesmo layout de URLs do
+    dadosabertos.camara.leg.br.
+
+    Parâmetros:
+    - pasta: Diretório raiz onde os arquivos serão gravados.
+    - escala: Fator multiplicativo dos volumes (1, 10, 100...).
+    - anos: Anos a gerar.
+    - semente: Semente do gerador aleatório, para resultados reprodutíveis.
+    """
+    rng = np.random.default_rng(semente)
+    deputados = gerar_deputados(rng, pasta)
+    gerar_orgaos(rng, pasta, deputados)
+
+    proximo_id = {"proposicoes": 2300000, "eventos": 65000, "votacoes": 2350000}
+    for ano in anos:
+        print(f"Gerando dados sintéticos de {ano} (escala {escala}x)...")
+        reqs = gerar_proposicoes(rng, pasta, ano, deputados, escala, proximo_id["proposicoes"])
+        proximo_id["proposicoes"] += volumes_base["proposicoes"] * escala
+        plenario = gerar_eventos(rng, pasta, ano, deputados, escala, proximo_id["eventos"], reqs)
+        proximo_id["eventos"] += volumes_base["eventos"] * escala
+        gerar_votacoes(rng, pasta, ano, deputados, escala, proximo_id["votacoes"], plenario)
+        proximo_id["votacoes"] += volumes_base["votacoes"] * escala
+
+
+class ManipuladorDadosAbertos(SimpleHTTPRequestHandler):
+    """
+    Serve os arquivos gerados com o mesmo layout do portal (/arquivos/...), com
+    ETag, Last-Modified, requisições condicionais, Range e HEAD, além da API de
+    deputados (/api/v2/deputados/{id} e a listagem paginada /api/v2/deputados?idLegislatura=N).
+    """
+
+    deputados = {}
+    # Número de requisições de arquivo que terão a conexão cortada no meio (para testar retomada)
+    falhas_restantes = 0
+    # Comprime as respostas com gzip quando o cliente aceita (Accept-Encoding), ignorando Range
+    comprimir = False
+    trava = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/api/v2/deputados"):
+            return self.responder_api(url)
+        return self.responder_arquivo(url.path)
+
+    def do_HEAD(self):
+        # Mesmos cabeçalhos do GET, sem corpo (ver responder_json e responder_arquivo)
+        self.do_GET()
+
+    def responder_json(self, status, conteudo):
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(corpo)
+
+    def responder_api(self, url):
+        partes = url.path.rstrip("/").split("/")
+        if len(partes) == 5 and partes[4].isdigit():
+            deputado = self.deputados.get(int(partes[4]))
+            if deputado is None:
+                return self.responder_json(404, {"status": 404, "title": "Not Found"})
+            return self.responder_json(200, {"dados": detalhe_deputado(deputado), "links": []})
+        if len(partes) == 4:
+            return self.responder_listagem(url)
+        return self.responder_json(404, {"status": 404, "title": "Not Found"})
+
+    def responder_listagem(self, url):
+        # Sem idLegislatura, a API lista só os deputados em exercício
+        parametros = parse_qs(url.query)
+        try:
+            legislatura = int(parametros["idLegislatura"][0]) if "idLegislatura" in parametros else None
+            itens = min(int(parametros.get("itens", [15])[0]), 100)
+            pagina = int(parametros.get("pagina", [1])[0])
+        except ValueError:
+            return self.responder_json(400, {"status": 400, "title": "Bad Request"})
+
+        if legislatura is None:
+            deputados = [d for d in self.deputados.values() if d["situacao"] == "Exercício"]
+            filtro = ""
+        else:
+            deputados = [d for d in self.deputados.values()
+                         if d["idLegislaturaInicial"] <= legislatura <= d["idLegislaturaFinal"]]
+            filtro = f"idLegislatura={legislatura}&"
+        deputados.sort(key=lambda d: d["nome"])
+        ultima = max(1, -(-len(deputados) // itens))
+        base = f"http://{self.headers.get('Host')}{url.path}?{filtro}itens={itens}"
+        links = [{"rel": "self", "href": f"{base}&pagina={pagina}"},
+                 {"rel": "first", "href": f"{base}&pagina=1"},
+                 {"rel": "last", "href": f"{base}&pagina={ultima}"}]
+        if pagina < ultima:
+            links.insert(1, {"rel": "next", "href": f"{base}&pagina={pagina + 1}"})
+        dados = [item_lista_deputado(d, legislatura or d["idLegislaturaFinal"])
+                 for d in deputados[(pagina - 1) * itens:pagina * itens]]
+        return self.responder_json(200, {"dados": dados, "links": links})
+
+    def responder_arquivo(self, caminho_url):
+        caminho = self.translate_path(caminho_url)
+        if not os.path.isfile(caminho):
+            self.send_error(404, "File not found")
+            return
+        estado = os.stat(caminho)
+        etag = f'"{estado.st_size:x}-{int(estado.st_mtime):x}"'
+        ultima_modificacao = email.utils.formatdate(estado.st_mtime, usegmt=True)
+
+        if self.headers.get("If-None-Match") == etag or (
+            self.headers.get("If-None-Match") is None
+            and self.headers.get("If-Modified-Since") == ultima_modificacao
+        ):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", ultima_modificacao)
+            self.end_headers()
+            return
+
+        if self.comprimir and "gzip" in self.headers.get("Accept-Encoding", ""):
+            return self.responder_comprimido(caminho, etag, ultima_modificacao)
+
+        inicio, fim = 0, estado.st_size - 1
+        intervalo = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        parcial = intervalo is not None and if_range in (None, etag, ultima_modificacao)
+        if parcial:
+            inicio = int(intervalo.group(1))
+            fim = int(intervalo.group(2)) if intervalo.group(2) else fim
+            if inicio >= estado.st_size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{estado.st_size}")
+                self.end_headers()
+                return
+
+        self.send_response(206 if parcial else 200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(fim - inicio + 1))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", ultima_modificacao)
+        self.send_header("Accept-Ranges", "bytes")
+        if parcial:
+            self.send_header("Content-Range", f"bytes {inicio}-{fim}/{estado.st_size}")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+
+        cortar = False
+        with self.trava:
+            if type(self).falhas_restantes > 0:
+                type(self).falhas_restantes -= 1
+                cortar = True
+        restante = fim - inicio + 1
+        if cortar:
+            restante //= 2
+        with open(caminho, "rb") as arquivo:
+            arquivo.seek(inicio)
+            while restante > 0:
+                bloco = arquivo.read(min(restante, 256 * 1024))
+                if not bloco:
+                    break
+                self.wfile.write(bloco)
+                restante -= len(bloco)
+        if cortar:
+            self.close_connection = True
+            self.connection.shutdown(2)
+
+    def responder_comprimido(self, caminho, etag, ultima_modificacao):
+        with open(caminho, "rb") as arquivo:
+            corpo = gzip.compress(arquivo.read(), compresslevel=1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", ultima_modificacao)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(corpo)
+
+
+def item_lista_deputado(deputado, legislatura):
+    """Monta um item do campo 'dados' da listagem /api/v2/deputados?idLegislatura=N."""
+    return {
+        "id": deputado["id"],
+        "uri": f"{url_camara}/api/v2/deputados/{deputado['id']}",
+        "nome": deputado["nome"],
+        "siglaPartido": deputado["siglaPartido"],
+        "uriPartido": f"{url_camara}/api/v2/partidos/{deputado['idPartido']}",
+        "siglaUf": deputado["siglaUf"],
+        "idLegislatura": legislatura,
+        "urlFoto": f"https://www.camara.leg.br/internet/deputado/bandep/{deputado['id']}.jpg",
+        "email": f"dep.{deputado['id']}@camara.leg.br",
+    }
+
+
+def detalhe_deputado(deputado):
+    """Monta o campo 'dados' da resposta de /api/v2/deputados/{id}."""
+    uri = f"{url_camara}/api/v2/deputados/{deputado['id']}"
+    return {
+        "id": deputado["id"],
+        "uri": uri,
+        "nomeCivil": deputado["nomeCivil"],
+        "ultimoStatus": {
+            "id": deputado["id"],
+            "uri": uri,
+            "nome": deputado["nome"],
+            "siglaPartido": deputado["siglaPartido"],
+            "uriPartido": f"{url_camara}/api/v2/partidos/{deputado['idPartido']}",
+            "siglaUf": deputado["siglaUf"],
+            "idLegislatura": deputado["idLegislaturaFinal"],
+            "urlFoto": f"https://www.camara.leg.br/internet/deputado/bandep/{deputado['id']}.jpg",
+            "email": f"dep.{deputado['id']}@camara.leg.br",
+            "data": "2023-02-01",
+            "nomeEleitoral": deputado["nome"],
+            "gabinete": {"nome": "100", "predio": "4", "sala": "100", "andar": "1",
+                         "telefone": "3215-5100", "email": f"dep.{deputado['id']}@camara.leg.br"},
+            "situacao": deputado["situacao"],
+            "condicaoEleitoral": "Titular",
+            "descricaoStatus": None,
+        },
+        "cpf": deputado["cpf"],
+        "sexo": deputado["siglaSexo"],
+        "urlWebsite": None,
+        "redeSocial": [],
+        "dataNascimento": deputado["dataNascimento"],
+        "dataFalecimento": None,
+        "ufNascimento": deputado["siglaUf"],
+        "municipioNascimento": "Cidade",
+        "escolaridade": "Superior",
+    }
+
+
+def criar_servidor(pasta, porta=8000, falhas=0, comprimir=False):
+    """
+    Cria (sem iniciar) o servidor local com os arquivos de `pasta`. Cada servidor tem
+    seu próprio estado (deputados, falhas restantes), então vários podem rodar no mesmo
+    processo, como nos testes.
+
+    Parâmetros:
+    - pasta: Diretório gerado por gerar_dados.
+    - porta: Porta HTTP (0 para escolher uma livre).
+    - falhas: Número de downloads que terão a conexão cortada no meio.
+    - comprimir: Responde com gzip aos clientes que aceitam.
+
+    Retorna:
+    - ThreadingHTTPServer; a porta escolhida fica em server_address[1].
+    """
+    with open(os.path.join(pasta, "api", "deputados.json"), encoding="utf-8") as arquivo:
+        deputados = {d["id"]: d for d in json.load(arquivo)}
+    manipulador = type("Manipulador", (ManipuladorDadosAbertos,), {
+        "deputados": deputados, "falhas_restantes": falhas, "comprimir": comprimir, "trava": threading.Lock(),
+    })
+    return ThreadingHTTPServer(("", porta), functools.partial(manipulador, directory=pasta))
+
+
+def servir(pasta, porta=8000, falhas=0, comprimir=False):
+    """
+    Sobe o servidor local com os arquivos de `pasta` (ver criar_servidor).
+    """
+    servidor = criar_servidor(pasta, porta, falhas, comprimir)
+    print(f"Servindo {pasta} em http://localhost:{porta}")
+    servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    gerar = comandos.add_parser("gerar", help="gera os arquivos sintéticos")
+    gerar.add_argument("--pasta", default="fixture")
+    gerar.add_argument("--escala", type=int, default=1)
+    gerar.add_argument("--anos", type=int, nargs="+", default=list(anos_padrao))
+    gerar.add_argument("--semente", type=int, default=0)
+    servidor = comandos.add_parser("servir", help="serve os arquivos gerados")
+    servidor.add_argument("--pasta", default="fixture")
+    servidor.add_argument("--porta", type=int, default=8000)
+    servidor.add_argument("--falhas", type=int, default=0)
+    servidor.add_argument("--comprimir", action="store_true")
+    argumentos = parser.parse_args()
+
+    if argumentos.comando == "gerar":
+        gerar_dados(argumentos.pasta, argumentos.escala, argumentos.anos, argumentos.semente)
+    else:
+        servir(argumentos.pasta, argumentos.porta, argumentos.falhas, argumentos.comprimir)
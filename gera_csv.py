@@ -6,16 +6,568 @@ from datetime import datetime
 import re
 from pandas.tseries.offsets import MonthBegin
 import numpy as np
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from requests.adapters import HTTPAdapter
+import base64
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+
+# pyarrow é opcional: sem ele os CSVs são lidos diretamente, sem o cache colunar
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+# fcntl só existe em sistemas POSIX: sem ele a trava do manifesto vale só entre threads
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 ano_atual = 2024
 ano_ini_legis = 2023
+legislatura_atual = 57
+
+# Número máximo de downloads simultâneos (e de conexões mantidas abertas na sessão)
+max_downloads_simultaneos = 8
+
+# Endereços do portal. DADOS_ABERTOS_URL aponta o pipeline para outro servidor com o mesmo
+# layout de URLs (ex.: o servidor local de dados_sinteticos.py, para testes sem rede).
+url_dados_abertos = os.environ.get("DADOS_ABERTOS_URL")
+url_arquivos = f"{url_dados_abertos}/arquivos" if url_dados_abertos else "http://dadosabertos.camara.leg.br/arquivos"
+url_api = f"{url_dados_abertos}/api/v2" if url_dados_abertos else "https://dadosabertos.camara.leg.br/api/v2"
+
+# Arquivos publicados por ano, na ordem em que devem ser baixados (maiores primeiro)
+datasets_anuais = [
+    "votacoesVotos", "proposicoesAutores", "eventosPresencaDeputados", "proposicoes",
+    "votacoesOrientacoes", "votacoes", "proposicoesTemas", "eventos", "eventosRequerimentos"
+]
+
+def url_arquivo_anual(nome_arquivo, ano):
+    """
+    Monta a URL de um arquivo anual do portal de dados abertos.
+    """
+    return f"{url_arquivos}/{nome_arquivo}/csv/{nome_arquivo}-{ano}.csv"
+
+def criar_sessao_http(max_conexoes=max_downloads_simultaneos):
+    """
+    Cria uma sessão HTTP com keep-alive, compartilhada por todos os downloads.
+
+    Parâmetros:
+    - max_conexoes: Número de conexões mantidas abertas por host.
+
+    Retorna:
+    - Sessão requests configurada.
+    """
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+sessao_http = criar_sessao_http()
+
+# Downloads: tamanho dos blocos gravados em disco, tentativas e timeout (conexão, leitura) em segundos
+tamanho_bloco_download = 1024 * 1024
+max_tentativas_download = 5
+timeout_download = (10, 120)
+
+# Manifesto do cache da pasta temporária: ETag, Last-Modified, tamanho e checksum de cada arquivo
+arquivo_manifesto = "manifesto.json"
+trava_manifesto = threading.Lock()
+
+def carregar_manifesto(pasta_temp="temp"):
+    """
+    Lê o manifesto do cache da pasta temporária.
+
+    Retorna:
+    - Dicionário {nome do arquivo: registro}, vazio se o manifesto não existir.
+    """
+    caminho = os.path.join(pasta_temp, arquivo_manifesto)
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, encoding='utf-8') as file:
+            return json.load(file)
+    except ValueError:
+        print(f"Manifesto inválido, ignorando: {caminho}")
+        return {}
+
+def atualizar_manifesto(pasta_temp, arquivo_csv, registro):
+    """
+    Grava (ou remove, se registro for None) o registro de um arquivo no manifesto.
+    A gravação é atômica, e a leitura-alteração-gravação fica sob trava entre threads
+    (trava_manifesto) e entre processos (flock no arquivo '.lock'), pois downloads
+    rodam em paralelo tanto nas threads quanto nos processos das etapas.
+    """
+    caminho = os.path.join(pasta_temp, arquivo_manifesto)
+    with trava_manifesto, open(caminho + ".lock", 'a') as trava:
+        if fcntl is not None:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+        manifesto = carregar_manifesto(pasta_temp)
+        if registro is None:
+            manifesto.pop(os.path.basename(arquivo_csv), None)
+        else:
+            manifesto[os.path.basename(arquivo_csv)] = registro
+        arquivo_parcial = f"{caminho}.{os.getpid()}.tmp"
+        with open(arquivo_parcial, 'w', encoding='utf-8') as file:
+            json.dump(manifesto, file, indent=2, ensure_ascii=False)
+        os.replace(arquivo_parcial, caminho)
+
+def calcular_checksum(caminho, tamanho_bloco=1024 * 1024):
+    """
+    Calcula o SHA-256 de um arquivo, lendo em blocos.
+    """
+    sha256 = hashlib.sha256()
+    with open(caminho, 'rb') as file:
+        for bloco in iter(lambda: file.read(tamanho_bloco), b''):
+            sha256.update(bloco)
+    return sha256.hexdigest()
 
 def convert_to_integer(df):
     for col in df.select_dtypes(include=['float', 'int']).columns:
         df[col] = df[col].astype(int)
     return df
 
+def caminho_arquivo_csv(nome_arquivo, pasta_temp="temp", ano=""):
+    """
+    Retorna o caminho do arquivo CSV na pasta temporária.
+    """
+    return os.path.join(pasta_temp, f"{nome_arquivo}_{ano}.csv") if ano else os.path.join(pasta_temp, f"{nome_arquivo}.csv")
+
+# Esquema de leitura de cada conjunto de dados: colunas usadas e seus tipos compactos.
+# Só as colunas listadas são lidas do CSV; conjuntos sem esquema (ex.: órgãos) são lidos inteiros.
+esquemas_datasets = {
+    "deputados": {
+        "uri": "str", "nome": "str", "nomeCivil": "str", "cpf": "str", "siglaSexo": "category",
+        "dataNascimento": "str"
+    },
+    "proposicoes": {
+        "id": "Int32", "siglaTipo": "category", "numero": "Int32", "ano": "Int16",
+        "descricaoTipo": "category", "dataApresentacao": "datetime64[ns]", "ementa": "str",
+        "keywords": "str", "ultimoStatus_regime": "category"
+    },
+    "proposicoesAutores": {
+        "idProposicao": "Int32", "idDeputadoAutor": "Int32", "codTipoAutor": "Int32",
+        "tipoAutor": "category", "nomeAutor": "str", "siglaPartidoAutor": "category",
+        "siglaUFAutor": "category", "ordemAssinatura": "Int16", "proponente": "Int8"
+    },
+    "proposicoesTemas": {
+        "uriProposicao": "str", "tema": "category"
+    },
+    "eventos": {
+        "id": "Int32", "dataHoraInicio": "datetime64[ns]", "descricaoTipo": "category"
+    },
+    "eventosPresencaDeputados": {
+        "idEvento": "Int32", "dataHoraInicio": "datetime64[ns]", "idDeputado": "Int32"
+    },
+    "eventosRequerimentos": {
+        "idEvento": "Int32", "tituloRequerimento": "str", "uriRequerimento": "str"
+    },
+    "votacoes": {
+        "id": "str", "data": "str", "dataHoraRegistro": "str", "idOrgao": "Int32",
+        "siglaOrgao": "category", "idEvento": "Int32", "aprovacao": "Int8",
+        "votosSim": "Int16", "votosNao": "Int16", "votosOutros": "Int16"
+    },
+    "votacoesVotos": {
+        "idVotacao": "category", "dataHoraVoto": "datetime64[ns]", "voto": "category",
+        "deputado_id": "Int32", "deputado_nome": "category", "deputado_siglaPartido": "category",
+        "deputado_siglaUf": "category", "deputado_idLegislatura": "Int16"
+    },
+    "votacoesOrientacoes": {
+        "idVotacao": "category", "siglaOrgao": "category", "orientacao": "category",
+        "uriBancada": "str", "siglaBancada": "category"
+    },
+    "orgaosDeputados": {
+        "siglaOrgao": "category", "nomeOrgao": "category", "nomePublicacaoOrgao": "category",
+        "uriDeputado": "str", "nomeDeputado": "str", "siglaPartido": "category",
+        "siglaUF": "category", "cargo": "category", "dataInicio": "str", "dataFim": "str"
+    },
+}
+
+def aplicar_esquema(df, esquema):
+    """
+    Converte as colunas do DataFrame para os tipos do esquema. Valores que não
+    podem ser convertidos viram nulos, em vez de derrubar a leitura.
+    """
+    for coluna, tipo in esquema.items():
+        if coluna not in df.columns or df[coluna].dtype == tipo:
+            continue
+        if tipo == "datetime64[ns]":
+            df[coluna] = pd.to_datetime(df[coluna], errors='coerce', format='ISO8601')
+        elif tipo == "str":
+            if df[coluna].dtype != object:
+                df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+        elif tipo == "category":
+            df[coluna] = df[coluna].astype(tipo)
+        else:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(tipo)
+    return df
+
+# Identificadores (de deputado, proposição, evento, requerimento, bancada, legislatura)
+# são sempre inteiros em todas as etapas, nunca texto: lidos dos CSVs como Int32
+# anulável e, nas tabelas do índice (sem nulos), como int64. Assim todas as junções
+# são feitas sobre chaves inteiras.
+tipo_id = "Int32"
+
+def extrair_id_uri(uris):
+    """
+    Extrai, de forma vetorizada, o id numérico do final de cada URI
+    (ex.: '.../deputados/204554' -> 204554).
+
+    Parâmetros:
+    - uris: Series com as URIs (pode ter nulos).
+
+    Retorna:
+    - Series de inteiros (tipo_id), com nulo onde a URI é nula ou não termina em número.
+    """
+    return pd.to_numeric(uris.astype(object).str.extract(r'(\d+)$', expand=False), errors='coerce').astype(tipo_id)
+
+# Início de cada legislatura (1º de fevereiro); a última data é o fim da última legislatura.
+# Para incluir uma nova legislatura basta acrescentar a data em que ela termina.
+inicio_legislaturas = pd.DatetimeIndex([
+    "1995-02-01", "1999-02-01", "2003-02-01", "2007-02-01",
+    "2011-02-01", "2015-02-01", "2019-02-01", "2023-02-01", "2027-02-01"
+])
+primeira_legislatura = 50
+
+def definir_legislatura(datas):
+    """
+    Atribui a legislatura (inteiro, ex.: 57) a cada data, com uma única busca binária
+    na tabela inicio_legislaturas.
+
+    Parâmetros:
+    - datas: Series de datas (datetime ou texto ISO).
+
+    Retorna:
+    - Series Int64 com o número da legislatura, nula para datas nulas ou fora da tabela.
+    """
+    datas = pd.to_datetime(datas, errors='coerce')
+    posicao = inicio_legislaturas.searchsorted(datas, side='right') - 1
+    valida = datas.notna().to_numpy() & (posicao >= 0) & (posicao < len(inicio_legislaturas) - 1)
+    return pd.Series(primeira_legislatura + posicao, index=datas.index).where(valida).astype('Int64')
+
+def ler_csv_com_esquema(arquivo_csv, esquema=None):
+    """
+    Lê um CSV do portal. Com esquema, lê só as colunas listadas e já com os tipos
+    compactos (inteiros, categorias, datas) definidos no momento do parse.
+
+    Parâmetros:
+    - arquivo_csv: Caminho do CSV.
+    - esquema: Dicionário {coluna: tipo}, como os de esquemas_datasets.
+
+    Retorna:
+    - DataFrame Pandas.
+    """
+    if esquema is None:
+        return pd.read_csv(arquivo_csv, sep=';', low_memory=False)
+
+    colunas = set(esquema)
+    tipos = {coluna: tipo for coluna, tipo in esquema.items() if tipo != "datetime64[ns]"}
+    try:
+        df = pd.read_csv(arquivo_csv, sep=';', usecols=lambda coluna: coluna in colunas, dtype=tipos)
+    except (ValueError, TypeError) as e:
+        # Algum valor fora do tipo esperado: ler como texto e converter com coerção
+        print(f"Tipos do esquema não conferem em {arquivo_csv}, convertendo com coerção ({str(e)})")
+        df = pd.read_csv(arquivo_csv, sep=';', usecols=lambda coluna: coluna in colunas, low_memory=False)
+    return aplicar_esquema(df, esquema)
+
+# Cache colunar (Arrow IPC/Feather, sem compressão para poder ser mapeado em memória)
+usar_cache_colunar = True
+
+def caminho_arquivo_colunar(arquivo_csv):
+    """
+    Retorna o caminho do arquivo colunar correspondente a um CSV da pasta temporária.
+    """
+    return os.path.splitext(arquivo_csv)[0] + ".arrow"
+
+def checksum_origem(arquivo_csv, pasta_temp="temp"):
+    """
+    Checksum do CSV de origem, lido do manifesto (ou calculado, se o arquivo não estiver nele).
+    """
+    registro = carregar_manifesto(pasta_temp).get(os.path.basename(arquivo_csv))
+    if registro and registro.get('sha256') and registro.get('tamanho') == os.path.getsize(arquivo_csv):
+        return registro['sha256']
+    return calcular_checksum(arquivo_csv)
+
+def assinatura_cache(sha256_origem, esquema):
+    """
+    Chave de validade do arquivo colunar: muda quando o CSV de origem ou o esquema mudam.
+    """
+    return hashlib.sha256((sha256_origem + json.dumps(esquema, sort_keys=True)).encode()).hexdigest()
+
+def gravar_arquivo_colunar(df, arquivo_colunar, assinatura):
+    """
+    Grava o DataFrame em Arrow IPC, guardando a assinatura do cache nos metadados.
+    Colunas de texto com tipos misturados são convertidas para texto antes da gravação.
+    """
+    try:
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for coluna in df.select_dtypes(include='object').columns:
+            df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+
+    metadados = dict(tabela.schema.metadata or {})
+    metadados[b'assinatura'] = assinatura.encode()
+    tabela = tabela.replace_schema_metadata(metadados)
+    # Nome temporário por processo e thread: o mesmo CSV pode ser lido por etapas paralelas
+    arquivo_parcial = f"{arquivo_colunar}.{os.getpid()}.{threading.get_ident()}.tmp"
+    feather.write_feather(tabela, arquivo_parcial, compression='uncompressed')
+    os.replace(arquivo_parcial, arquivo_colunar)
+
+def ler_csv(arquivo_csv, pasta_temp="temp", esquema=None):
+    """
+    Lê um CSV da pasta temporária. Na primeira leitura o CSV é convertido para um
+    arquivo colunar tipado; nas seguintes, lê-se o arquivo colunar (mapeado em memória),
+    sem parse de CSV. O arquivo colunar é refeito sempre que o CSV de origem ou o
+    esquema mudam.
+
+    Parâmetros:
+    - arquivo_csv: Caminho do CSV.
+    - pasta_temp: Diretório do manifesto (padrão: 'temp').
+    - esquema: Colunas e tipos a ler (ver esquemas_datasets). Sem esquema, lê tudo.
+
+    Retorna:
+    - DataFrame Pandas com o conteúdo do CSV.
+    """
+    if pa is None or not usar_cache_colunar:
+        return ler_csv_com_esquema(arquivo_csv, esquema)
+
+    arquivo_colunar = caminho_arquivo_colunar(arquivo_csv)
+    assinatura = assinatura_cache(checksum_origem(arquivo_csv, pasta_temp), esquema)
+    if os.path.exists(arquivo_colunar):
+        try:
+            tabela = feather.read_table(arquivo_colunar, memory_map=True)
+            if (tabela.schema.metadata or {}).get(b'assinatura') == assinatura.encode():
+                return tabela.to_pandas()
+        except (pa.ArrowInvalid, OSError) as e:
+            print(f"Cache colunar inválido, refazendo: {arquivo_colunar} ({str(e)})")
+
+    df = ler_csv_com_esquema(arquivo_csv, esquema)
+    gravar_arquivo_colunar(df, arquivo_colunar, assinatura)
+    return df
+
+def checksum_do_servidor(cabecalhos_resposta):
+    """
+    Extrai o SHA-256 informado pelo servidor no cabeçalho Digest, se houver.
+
+    Retorna:
+    - Checksum em hexadecimal, ou None se o servidor não informou.
+    """
+    for parte in cabecalhos_resposta.get('Digest', '').split(','):
+        algoritmo, _, valor = parte.strip().partition('=')
+        if algoritmo.lower() == 'sha-256' and valor:
+            return base64.b64decode(valor).hex()
+    return None
+
+def transferir_arquivo(url, arquivo_parcial, cabecalhos, validador_parcial=None):
+    """
+    Transfere o conteúdo de uma URL em blocos, direto para o arquivo parcial, sem
+    carregar o arquivo inteiro em memória. Se o arquivo parcial já tem conteúdo de uma
+    tentativa anterior, pede só o restante com Range/If-Range.
+
+    Parâmetros:
+    - url: URL do arquivo.
+    - arquivo_parcial: Caminho do arquivo '.part' que recebe os dados.
+    - cabecalhos: Cabeçalhos condicionais (If-None-Match/If-Modified-Since).
+    - validador_parcial: ETag ou Last-Modified da versão que está no arquivo parcial.
+
+    Retorna:
+    - Tupla (status HTTP, cabeçalhos da resposta, tamanho total esperado ou None,
+      se a transferência chegou ao fim sem a conexão cair).
+    """
+    inicio = os.path.getsize(arquivo_parcial) if os.path.exists(arquivo_parcial) else 0
+    # Sem compressão de transporte: tamanho, checksum e offsets do Range valem para os bytes gravados
+    cabecalhos = dict(cabecalhos, **{'Accept-Encoding': 'identity'})
+    if inicio and validador_parcial:
+        cabecalhos['Range'] = f"bytes={inicio}-"
+        cabecalhos['If-Range'] = validador_parcial
+    else:
+        inicio = 0
+
+    with sessao_http.get(url, headers=cabecalhos, stream=True, timeout=timeout_download) as response:
+        if response.status_code == 206:
+            # Content-Range: bytes inicio-fim/total
+            total = response.headers.get('Content-Range', '').rpartition('/')[2]
+            modo = 'ab'
+        elif response.status_code == 200:
+            total = response.headers.get('Content-Length')
+            modo = 'wb'
+        else:
+            return response.status_code, response.headers, None, False
+
+        if response.headers.get('Content-Encoding', 'identity').lower() != 'identity':
+            # Servidor comprimiu mesmo assim: os tamanhos informados são dos bytes comprimidos,
+            # então o conteúdo (já descomprimido) é gravado por inteiro, sem conferir tamanho
+            if response.status_code == 206:
+                return 416, response.headers, None, False
+            total = None
+
+        completo = True
+        with open(arquivo_parcial, modo) as file:
+            try:
+                for bloco in response.iter_content(chunk_size=tamanho_bloco_download):
+                    file.write(bloco)
+            except requests.RequestException as e:
+                # O que já chegou fica no arquivo parcial para ser retomado
+                print(f"Conexão interrompida em {url}: {str(e)}")
+                completo = False
+        total = int(total) if total and total.isdigit() else None
+        return response.status_code, response.headers, total, completo
+
+def baixar_arquivo(nome_arquivo, url, pasta_temp="temp", ano=""):
+    """
+    Baixa um arquivo CSV para a pasta temporária usando a sessão HTTP compartilhada,
+    sem ler o conteúdo. Pode ser chamada de várias threads ao mesmo tempo.
+
+    Se o arquivo já está no cache e registrado no manifesto, faz uma requisição
+    condicional (If-None-Match/If-Modified-Since) e só baixa de novo se o servidor
+    responder que o arquivo mudou.
+
+    O download é gravado em blocos num arquivo '.part', retomado com Range se a
+    conexão cair, repetido até max_tentativas_download vezes com espera exponencial,
+    e só é movido para o lugar definitivo depois de conferidos tamanho e checksum.
+
+    Parâmetros:
+    - nome_arquivo: Nome base para o arquivo (sem extensão).
+    - url: URL de onde o CSV será baixado.
+    - pasta_temp: Diretório onde o arquivo será salvo (padrão: 'temp').
+    - ano: Ano do arquivo, usado no nome do arquivo salvo.
+
+    Retorna:
+    - Caminho do arquivo salvo, ou None se o download falhou.
+    """
+    os.makedirs(pasta_temp, exist_ok=True)
+    arquivo_csv = caminho_arquivo_csv(nome_arquivo, pasta_temp, ano)
+    arquivo_parcial = arquivo_csv + ".part"
+
+    # Montar os cabeçalhos condicionais a partir do manifesto, se o arquivo em cache for o registrado
+    cabecalhos = {}
+    registro = carregar_manifesto(pasta_temp).get(os.path.basename(arquivo_csv))
+    if registro and os.path.exists(arquivo_csv) and os.path.getsize(arquivo_csv) == registro.get('tamanho'):
+        if registro.get('etag'):
+            cabecalhos['If-None-Match'] = registro['etag']
+        if registro.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = registro['last_modified']
+
+    # Um '.part' de uma execução anterior não tem versão conhecida e não pode ser retomado
+    if os.path.exists(arquivo_parcial):
+        os.remove(arquivo_parcial)
+    validador_parcial = None
+
+    print(f"Baixando o CSV de {nome_arquivo}...{url}")
+    for tentativa in range(1, max_tentativas_download + 1):
+        try:
+            status, headers, total, completo = transferir_arquivo(url, arquivo_parcial, cabecalhos, validador_parcial)
+        except requests.RequestException as e:
+            status, headers, total, completo = None, {}, None, False
+            print(f"Falha na conexão com {url}: {str(e)}")
+
+        if status == 304:
+            if calcular_checksum(arquivo_csv) == registro.get('sha256'):
+                print(f"Arquivo não mudou no servidor, mantendo: {arquivo_csv}")
+                return arquivo_csv
+            # O arquivo local foi corrompido: baixar de novo sem condição, na próxima tentativa
+            print(f"Checksum do cache não confere, baixando de novo: {arquivo_csv}")
+            cabecalhos = {}
+        elif status in (200, 206):
+            tamanho = os.path.getsize(arquivo_parcial)
+            checksum = calcular_checksum(arquivo_parcial)
+            # Com compressão de transporte, o Digest do servidor é dos bytes comprimidos
+            codificado = headers.get('Content-Encoding', 'identity').lower() != 'identity'
+            esperado = None if codificado else checksum_do_servidor(headers)
+            if (tamanho == total if total is not None else completo) and (esperado is None or checksum == esperado):
+                os.replace(arquivo_parcial, arquivo_csv)
+                atualizar_manifesto(pasta_temp, arquivo_csv, {
+                    'url': url,
+                    'etag': headers.get('ETag'),
+                    'last_modified': headers.get('Last-Modified'),
+                    'tamanho': tamanho,
+                    'sha256': checksum,
+                    'baixado_em': datetime.now().isoformat(timespec='seconds')
+                })
+                print(f"Arquivo salvo em: {arquivo_csv}")
+                return arquivo_csv
+            print(f"Download incompleto ou corrompido de {nome_arquivo} {ano}: {tamanho} de {total} bytes")
+            # Passou do tamanho, está completo com checksum errado ou veio comprimido: não dá para retomar
+            if codificado or (total is not None and tamanho > total) or (esperado is not None and (tamanho == total if total is not None else completo)):
+                os.remove(arquivo_parcial)
+        elif status == 416:
+            # O trecho pedido não existe mais no servidor: recomeçar do zero
+            os.remove(arquivo_parcial)
+            validador_parcial = None
+            continue
+        elif status is not None and status != 429 and status < 500:
+            print(f"Erro ao baixar o arquivo: {status}")
+            return None
+
+        # Guardar a versão do que já foi baixado para retomar com If-Range
+        validador_parcial = headers.get('ETag') or headers.get('Last-Modified') or validador_parcial
+        if tentativa < max_tentativas_download:
+            espera = 2 ** (tentativa - 1)
+            print(f"Tentando novamente {nome_arquivo} {ano} em {espera}s ({tentativa}/{max_tentativas_download})")
+            time.sleep(espera)
+
+    print(f"Erro ao baixar o arquivo depois de {max_tentativas_download} tentativas: {url}")
+    if os.path.exists(arquivo_parcial):
+        os.remove(arquivo_parcial)
+    return None
+
+def listar_downloads(ano_atual, ano_ini_legis, legislatura):
+    """
+    Reúne de uma vez todos os arquivos (conjunto de dados, ano) usados pelo índice.
+
+    Parâmetros:
+    - ano_atual: Ano atual.
+    - ano_ini_legis: Ano inicial da legislatura.
+    - legislatura: Legislatura dos cargos dos deputados.
+
+    Retorna:
+    - Lista de tuplas (nome_arquivo, url, ano) no formato aceito por baixar_arquivo.
+    """
+    downloads = []
+    for nome_arquivo in datasets_anuais:
+        for ano in range(ano_ini_legis, ano_atual + 1):
+            downloads.append((nome_arquivo, url_arquivo_anual(nome_arquivo, ano), str(ano)))
+    downloads.append(("orgaosDeputados", f"{url_arquivos}/orgaosDeputados/csv/orgaosDeputados-L{legislatura}.csv", ""))
+    downloads.append(("deputados", f"{url_arquivos}/deputados/csv/deputados.csv", ""))
+    downloads.append(("orgaos", f"{url_arquivos}/orgaos/csv/orgaos.csv", ""))
+    return downloads
+
+def baixar_arquivos(downloads, pasta_temp="temp", max_simultaneos=max_downloads_simultaneos):
+    """
+    Baixa uma lista de arquivos em paralelo, com no máximo max_simultaneos downloads
+    ao mesmo tempo, todos pela mesma sessão HTTP (conexões reaproveitadas).
+
+    Parâmetros:
+    - downloads: Lista de tuplas (nome_arquivo, url, ano), como a de listar_downloads.
+    - pasta_temp: Diretório onde os arquivos serão salvos (padrão: 'temp').
+    - max_simultaneos: Limite de downloads concorrentes.
+
+    Retorna:
+    - Dicionário {(nome_arquivo, ano): caminho do arquivo ou None}.
+    """
+    caminhos = {}
+    with ThreadPoolExecutor(max_workers=max_simultaneos) as executor:
+        futuros = {
+            executor.submit(baixar_arquivo, nome_arquivo, url, pasta_temp, ano): (nome_arquivo, ano)
+            for nome_arquivo, url, ano in downloads
+        }
+        for futuro in as_completed(futuros):
+            chave = futuros[futuro]
+            try:
+                caminhos[chave] = futuro.result()
+            except requests.RequestException as e:
+                print(f"Erro ao baixar {chave[0]} {chave[1]}: {str(e)}")
+                caminhos[chave] = None
+    return caminhos
+
 def baixar_csv_generico(nome_arquivo, url, pasta_temp="temp", ano = ""):
     """
     Função genérica para baixar um arquivo CSV de uma URL e salvar na pasta especificada, 
@@ -30,49 +582,30 @@ def baixar_csv_generico(nome_arquivo, url, pasta_temp="temp", ano = ""):
     - DataFrame Pandas com o conteúdo do CSV.
     """
     
-    # Verificar se a pasta temporária existe, se não, criá-la
-    if not os.path.exists(pasta_temp):
-        os.makedirs(pasta_temp)
-    
-    # Definir o nome completo do arquivo baseado no ano atual
-    ano_atual = datetime.now().year
-
-    arquivo_csv = os.path.join(pasta_temp, f"{nome_arquivo}_{ano}.csv") if ano else os.path.join(pasta_temp, f"{nome_arquivo}.csv")
-
-    # Verificar se o arquivo já existe, se tem ano e não é o ano atual
-    if os.path.exists(arquivo_csv):
-    # if os.path.exists(arquivo_csv) and ano !="" and ano != str(ano_atual):
-        print(f"Arquivo já existe em: {arquivo_csv}")
-        try :
-            return pd.read_csv(arquivo_csv, sep=';', low_memory=False)
-        except:
-            count = count + 1 if 'count' in locals() else 1
-            if count < 10:
-                print("tentando novamente:....{count}")
-                os.remove(arquivo_csv)
-                baixar_csv_generico(nome_arquivo, url, pasta_temp, ano)    
-            else:
-                print("não rolou:....{count}")
-                raise SystemExit("Erro fatal: O programa foi encerrado.")
-    # Caso o arquivo não exista ou o ano seja o atual, fazer o download
-    print(f"Baixando o CSV de {nome_arquivo}...{url}")
-    response = requests.get(url)
-    if response.status_code == 200:
-        with open(arquivo_csv, 'wb') as file:
-            file.write(response.content)
-        print(f"Arquivo salvo em: {arquivo_csv}")
-    else:
-        print(f"Erro ao baixar o arquivo: {response.status_code}")
-        return None
-    # Ler e retornar o CSV baixado
-    try:
-        return pd.read_csv(arquivo_csv, sep=';', low_memory=False)
-    except Exception as e:
-        print(f"Erro ao ler arquivo par dataframe")
-        print(f"Detalhes do erro: {str(e)}")
-        time.sleep(3)
-        baixar_csv_generico(nome_arquivo, url, pasta_temp, ano)
-        
+    arquivo_csv = caminho_arquivo_csv(nome_arquivo, pasta_temp, ano)
+
+    for tentativa in range(1, max_tentativas_download + 1):
+        # Verificar se o arquivo já existe; se não existir, fazer o download
+        if os.path.exists(arquivo_csv):
+            print(f"Arquivo já existe em: {arquivo_csv}")
+        elif baixar_arquivo(nome_arquivo, url, pasta_temp, ano) is None:
+            return None
+
+        # Ler e retornar o CSV
+        try:
+            return ler_csv(arquivo_csv, pasta_temp, esquemas_datasets.get(nome_arquivo))
+        except Exception as e:
+            print(f"Erro ao ler arquivo para dataframe ({tentativa}/{max_tentativas_download})")
+            print(f"Detalhes do erro: {str(e)}")
+            os.remove(arquivo_csv)
+            if os.path.exists(caminho_arquivo_colunar(arquivo_csv)):
+                os.remove(caminho_arquivo_colunar(arquivo_csv))
+            atualizar_manifesto(pasta_temp, arquivo_csv, None)
+            time.sleep(2 ** (tentativa - 1))
+
+    print(f"Não foi possível ler {arquivo_csv} depois de {max_tentativas_download} tentativas")
+    raise SystemExit("Erro fatal: O programa foi encerrado.")
+
 def pegar_deputados(pasta_temp="temp"):
     """
     Função que baixa e processa o arquivo de deputados.
@@ -84,7 +617,7 @@ def pegar_deputados(pasta_temp="temp"):
     - DataFrame Pandas com o conteúdo dos deputados.
     """
     
-    url = 'http://dadosabertos.camara.leg.br/arquivos/deputados/csv/deputados.csv'
+    url = f"{url_arquivos}/deputados/csv/deputados.csv"
     
     # Utiliza a função genérica para baixar o CSV
     data = baixar_csv_generico("deputados", url, pasta_temp)
@@ -92,17 +625,85 @@ def pegar_deputados(pasta_temp="temp"):
     # Se o download foi bem-sucedido, processar o DataFrame
     if data is not None:
         # Extrair idDeputado do campo 'uri'
-        data['idDeputado'] = data['uri'].apply(lambda x: re.search(r'\d+$', x).group() if pd.notnull(x) else None)
+        data['idDeputado'] = extrair_id_uri(data['uri'])
 
-        # Selecionar colunas relevantes
-        data = data[['idDeputado', 'nome', 'nomeCivil', 'cpf', 'siglaSexo']].copy()
-
-        # Converter idDeputado para string e remover duplicatas
-        data['idDeputado'] = data['idDeputado'].astype(str)
+        # Selecionar colunas relevantes e remover duplicatas
+        data = data[['idDeputado', 'nome', 'nomeCivil', 'cpf', 'siglaSexo', 'uri', 'dataNascimento']].copy()
         data = data.drop_duplicates()
 
     return data
 
+def iterar_anos(nome_arquivo, descricao, ano_atual, ano_ini_legis, pasta_temp="temp"):
+    """
+    Gerador que baixa (se preciso) e lê o arquivo anual de um conjunto de dados,
+    um ano por vez, entre o ano de início da legislatura e o ano atual.
+
+    Parâmetros:
+    - nome_arquivo: Nome do conjunto de dados no portal (ex.: 'proposicoes').
+    - descricao: Descrição usada nas mensagens de progresso.
+    - ano_atual: Ano atual.
+    - ano_ini_legis: Ano inicial da legislatura.
+    - pasta_temp: Diretório onde os arquivos CSV serão salvos (padrão: 'temp').
+
+    Retorna:
+    - Gerador de tuplas (ano, DataFrame), só para os anos baixados com sucesso.
+    """
+    for ano in range(ano_ini_legis, ano_atual + 1):
+        print(f"Baixando {descricao} para o ano {ano}...")
+        data = baixar_csv_generico(nome_arquivo, url_arquivo_anual(nome_arquivo, ano), pasta_temp, str(ano))
+        if data is not None:
+            yield ano, data
+
+def concatenar_anos(frames):
+    """
+    Concatena de uma só vez os DataFrames anuais. As colunas categóricas recebem
+    antes o mesmo conjunto de categorias, para que continuem categóricas no resultado.
+
+    Parâmetros:
+    - frames: Iterável de DataFrames (ex.: um gerador).
+
+    Retorna:
+    - DataFrame com todas as linhas, ou DataFrame vazio se não houver nenhum.
+    """
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+
+    for coluna in frames[0].columns:
+        if not all(coluna in f.columns and isinstance(f[coluna].dtype, pd.CategoricalDtype) for f in frames):
+            continue
+        categorias = frames[0][coluna].cat.categories
+        for f in frames[1:]:
+            categorias = categorias.union(f[coluna].cat.categories)
+        for f in frames:
+            f[coluna] = f[coluna].cat.set_categories(categorias)
+
+    return pd.concat(frames, ignore_index=True)
+
+def carregar_anos(nome_arquivo, descricao, ano_atual, ano_ini_legis, pasta_temp="temp", processar=None, marcar_ano=False):
+    """
+    Carrega todos os anos de um conjunto de dados num único DataFrame, processando
+    cada ano à medida que é lido e concatenando uma única vez no final.
+
+    Parâmetros:
+    - nome_arquivo, descricao, ano_atual, ano_ini_legis, pasta_temp: Como em iterar_anos.
+    - processar: Função opcional aplicada ao DataFrame de cada ano.
+    - marcar_ano: Se True, adiciona a coluna 'ano.loop' com o ano do arquivo.
+
+    Retorna:
+    - DataFrame Pandas com os dados de todos os anos.
+    """
+    def frames():
+        for ano, data in iterar_anos(nome_arquivo, descricao, ano_atual, ano_ini_legis, pasta_temp):
+            if processar is not None:
+                data = processar(data)
+            if marcar_ano:
+                # Adicionar coluna com o ano em loop
+                data['ano.loop'] = ano
+            yield data
+
+    return concatenar_anos(frames())
+
 def pegar_proposicoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
     """
     Função que baixa os arquivos de proposições para os anos entre o ano atual e o ano de início da legislatura.
@@ -115,31 +716,17 @@ def pegar_proposicoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
     Retorna:
     - DataFrame Pandas com o conteúdo de todas as proposições.
     """
-    
-    proposicoes = pd.DataFrame()  # DataFrame vazio para acumular as proposições
 
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando proposições para o ano {ano}...")
-
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/proposicoes/csv/proposicoes-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"proposicoes", url, pasta_temp, str(ano))
+    def processar(data):
+        # Selecionar colunas relevantes e renomear id para id.proposicao
+        data = data[['id', 'siglaTipo', 'numero', 'ano', 'descricaoTipo', 'dataApresentacao',
+                     'ementa', 'keywords', 'ultimoStatus_regime']].copy()
+        data.rename(columns={'id': 'id.proposicao'}, inplace=True)
+        return data
 
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Selecionar colunas relevantes e renomear id para id.proposicao
-            data = data[['id', 'siglaTipo', 'numero', 'ano', 'descricaoTipo', 'dataApresentacao',
-                         'ementa', 'keywords', 'ultimoStatus_regime']].copy()
-            data.rename(columns={'id': 'id.proposicao'}, inplace=True)
-            
-            # Adicionar coluna com o ano em loop
-            data['ano.loop'] = ano
-            data['dataApresentacao'] = pd.to_datetime(data['dataApresentacao'])
-            data['dataApresentacao'] = data['dataApresentacao'].dt.strftime('%Y-%m-%dT%H:%M:%S')
-            # Concatenar os dados baixados ao DataFrame principal
-            proposicoes = pd.concat([proposicoes, data], ignore_index=True)
+    proposicoes = carregar_anos("proposicoes", "proposições", ano_atual, ano_ini_legis, pasta_temp, processar, marcar_ano=True)
+    proposicoes['dataApresentacao'] = pd.to_datetime(proposicoes['dataApresentacao'])
+    proposicoes['dataApresentacao'] = proposicoes['dataApresentacao'].dt.strftime('%Y-%m-%dT%H:%M:%S')
     return proposicoes
 
 
@@ -155,29 +742,9 @@ def pegar_autores_proposicoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
     Retorna:
     - DataFrame Pandas com o conteúdo de todos os autores das proposições.
     """
-    
-    autores_prop = pd.DataFrame()  # DataFrame vazio para acumular os autores das proposições
-
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando autores das proposições para o ano {ano}...")
-
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/proposicoesAutores/csv/proposicoesAutores-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"proposicoesAutores", url, pasta_temp, str(ano))
-
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Adicionar coluna com o ano em loop
-            data['ano.loop'] = ano
-
-            # Concatenar os dados baixados ao DataFrame principal
-            autores_prop = pd.concat([autores_prop, data], ignore_index=True)
 
-        # Pausa de 10 segundos para evitar sobrecarga de requisições
-    autores_prop['idDeputadoAutor'] =autores_prop['idDeputadoAutor'].fillna(0).astype(int)
-    autores_prop['idDeputadoAutor'] = autores_prop['idDeputadoAutor'].astype('int64')
+    autores_prop = carregar_anos("proposicoesAutores", "autores das proposições", ano_atual, ano_ini_legis, pasta_temp, marcar_ano=True)
+    autores_prop['idDeputadoAutor'] = autores_prop['idDeputadoAutor'].fillna(0).astype('int64')
     return autores_prop
 
 
@@ -193,33 +760,13 @@ def pegar_temas_proposicoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
     Retorna:
     - DataFrame Pandas com o conteúdo de todos os temas das proposições.
     """
-    
-    temas_prop = pd.DataFrame()  # DataFrame vazio para acumular os temas das proposições
-
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando temas das proposições para o ano {ano}...")
-
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/proposicoesTemas/csv/proposicoesTemas-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"proposicoesTemas", url, pasta_temp, str(ano))
-
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Extrair id.proposicao do campo 'uriProposicao'
-            data['id.proposicao'] = data['uriProposicao'].apply(lambda x: re.search(r'\d+$', x).group() if pd.notnull(x) else None)
 
-            # Remover a coluna 'uriProposicao'
-            data = data.drop(columns=['uriProposicao'])
+    def processar(data):
+        # Extrair id.proposicao do campo 'uriProposicao' e remover a coluna 'uriProposicao'
+        data['id.proposicao'] = extrair_id_uri(data['uriProposicao'])
+        return data.drop(columns=['uriProposicao'])
 
-            # Adicionar coluna com o ano em loop
-            data['ano.loop'] = ano
-
-            # Concatenar os dados baixados ao DataFrame principal
-            temas_prop = pd.concat([temas_prop, data], ignore_index=True)
-    
-    return temas_prop
+    return carregar_anos("proposicoesTemas", "temas das proposições", ano_atual, ano_ini_legis, pasta_temp, processar, marcar_ano=True)
 
 def pegar_eventos(ano_atual, ano_ini_legis, pasta_temp="temp"):
     """
@@ -231,75 +778,31 @@ def pegar_eventos(ano_atual, ano_ini_legis, pasta_temp="temp"):
     - pasta_temp: Diretório onde os arquivos CSV serão salvos (padrão: 'temp').
     
     Retorna:
-    - DataFrame Pandas com o conteúdo de todos os eventos.
+    - DataFrame Pandas com o conteúdo de todos os eventos, com a legislatura de cada evento.
     """
-    
-    eventos = pd.DataFrame()  # DataFrame vazio para acumular os eventos
 
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando eventos para o ano {ano}...")
-
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/eventos/csv/eventos-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"eventos", url, pasta_temp, str(ano))
-
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Se for o primeiro ano (ano_atual), inicializa o DataFrame eventos
-            if ano == ano_ini_legis:
-                eventos = data
-            else:
-                # Caso contrário, concatena os novos dados ao DataFrame de eventos
-                eventos = pd.concat([eventos, data], ignore_index=True)
-
-        # Pausa de 10 segundos para evitar sobrecarga de requisições
+    eventos = carregar_anos("eventos", "eventos", ano_atual, ano_ini_legis, pasta_temp)
+    eventos['legislat'] = definir_legislatura(eventos['dataHoraInicio'])
     return eventos
 
 def pegar_presenca_eventos_deputados(ano_atual, ano_ini_legis, pasta_temp="temp"):
     """
     Função que baixa os arquivos de presença em eventos dos deputados para os anos entre o ano atual e o ano de início da legislatura.
     """
-    dep_eventos = pd.DataFrame()  # DataFrame vazio para acumular os dados de presença em eventos
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando presença de eventos para o ano {ano}...")
-        url = f"http://dadosabertos.camara.leg.br/arquivos/eventosPresencaDeputados/csv/eventosPresencaDeputados-{ano}.csv"
-        data = baixar_csv_generico(f"eventosPresencaDeputados", url, pasta_temp, str(ano))
-        if data is not None:
-            data = data[['idEvento', 'dataHoraInicio', 'idDeputado']]
-            dep_eventos = pd.concat([dep_eventos, data], ignore_index=True)
-    return dep_eventos
+    return carregar_anos("eventosPresencaDeputados", "presença de eventos", ano_atual, ano_ini_legis, pasta_temp,
+                         lambda data: data[['idEvento', 'dataHoraInicio', 'idDeputado']])
 
 def pegar_requerimentos_eventos(ano_atual, ano_ini_legis, pasta_temp="temp"):
     """
     Função que baixa os arquivos de requerimentos dos eventos para os anos entre o ano atual e o ano de início da legislatura.
     """
-    
-    requer_eventos = pd.DataFrame()  # DataFrame vazio para acumular os requerimentos dos eventos
-
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando requerimentos dos eventos para o ano {ano}...")
-
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/eventosRequerimentos/csv/eventosRequerimentos-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"eventosRequerimentos", url, pasta_temp, str(ano))
-
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Extrair idRequerimento do campo 'uriRequerimento'
-            data['idRequerimento'] = data['uriRequerimento'].apply(lambda x: re.search(r'\d+$', x).group() if pd.notnull(x) else None)
-
-            # Selecionar colunas relevantes
-            data = data[['idEvento', 'idRequerimento', 'tituloRequerimento']]
 
-            # Concatenar os dados baixados ao DataFrame principal
-            requer_eventos = pd.concat([requer_eventos, data], ignore_index=True)
+    def processar(data):
+        # Extrair idRequerimento do campo 'uriRequerimento' e selecionar colunas relevantes
+        data['idRequerimento'] = extrair_id_uri(data['uriRequerimento'])
+        return data[['idEvento', 'idRequerimento', 'tituloRequerimento']]
 
-        # Pausa de 10 segundos para evitar sobrecarga de requisições
-    return requer_eventos
+    return carregar_anos("eventosRequerimentos", "requerimentos dos eventos", ano_atual, ano_ini_legis, pasta_temp, processar)
 
 def pegar_votacoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
     """
@@ -313,27 +816,8 @@ def pegar_votacoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
     Retorna:
     - DataFrame Pandas com o conteúdo de todas as votações.
     """
-    
-    votacoes = pd.DataFrame()  # DataFrame vazio para acumular as votações
-
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando votações para o ano {ano}...")
-
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/votacoes/csv/votacoes-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"votacoes", url, pasta_temp, str(ano))
-
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Selecionar colunas relevantes (excluir colunas especificadas)
-            data = data.drop(columns=['uri', 'uriOrgao', 'uriEvento', 
-                                      'ultimaApresentacaoProposicao_descricao',
-                                      'ultimaApresentacaoProposicao_uriProposicao'])
 
-            # Concatenar os dados baixados ao DataFrame principal
-            votacoes = pd.concat([votacoes, data], ignore_index=True)
+    votacoes = carregar_anos("votacoes", "votações", ano_atual, ano_ini_legis, pasta_temp)
     votacoes['aprovacao'] =votacoes['aprovacao'].fillna(0).astype(int)
     votacoes['aprovacao'] = votacoes['aprovacao'].astype('int64')
 
@@ -351,58 +835,307 @@ def pegar_votacoes_deputados(ano_atual, ano_ini_legis, pasta_temp="temp"):
     Retorna:
     - DataFrame Pandas com o conteúdo de todas as votações por deputado.
     """
-    
-    dep_votacoes = pd.DataFrame()  # DataFrame vazio para acumular as votações por deputado
 
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando votações por deputado para o ano {ano}...")
+    def processar(data):
+        # Selecionar colunas relevantes
+        return data[['idVotacao', 'dataHoraVoto', 'voto', 'deputado_id', 'deputado_nome',
+                     'deputado_siglaPartido', 'deputado_siglaUf', 'deputado_idLegislatura']]
 
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/votacoesVotos/csv/votacoesVotos-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"votacoesVotos", url, pasta_temp, str(ano))
+    return carregar_anos("votacoesVotos", "votações por deputado", ano_atual, ano_ini_legis, pasta_temp, processar)
 
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Selecionar colunas relevantes
-            data = data[['idVotacao', 'dataHoraVoto', 'voto', 'deputado_id', 'deputado_nome',
-                         'deputado_siglaPartido', 'deputado_siglaUf', 'deputado_idLegislatura']].copy()
 
-            # Concatenar os dados baixados ao DataFrame principal
-            dep_votacoes = pd.concat([dep_votacoes, data], ignore_index=True)
-    
-    return dep_votacoes
+# Agregação dos votos (votacoesVotos) em blocos, sem manter a tabela inteira em memória
+agregar_votos_em_blocos = False
+tamanho_bloco_votos = 500_000
+colunas_agregacao_votos = ['idVotacao', 'dataHoraVoto', 'voto', 'deputado_id',
+                           'deputado_siglaPartido', 'deputado_idLegislatura']
 
+def ler_csv_em_blocos(arquivo_csv, esquema, colunas, tamanho_bloco=tamanho_bloco_votos):
+    """
+    Gerador que lê um CSV do portal em blocos de até tamanho_bloco linhas, só com as
+    colunas pedidas e já convertidas para os tipos do esquema.
+    """
+    esquema_bloco = {coluna: esquema[coluna] for coluna in colunas}
+    with pd.read_csv(arquivo_csv, sep=';', usecols=colunas, chunksize=tamanho_bloco, low_memory=False) as leitor:
+        for bloco in leitor:
+            yield aplicar_esquema(bloco, esquema_bloco)
 
-def pegar_votacoes_orientacoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
+def votacoes_plenario(votacoes_df):
     """
-    Função que baixa os arquivos de votações e orientação dos líderes para os anos entre o ano atual e o ano de início da legislatura.
+    Retorna os ids (texto) das votações de plenário, as únicas usadas na Var 19.
     """
-    
-    votacoes_orientacoes = pd.DataFrame()  # DataFrame vazio para acumular as votações e orientações
+    plenario = votacoes_df[votacoes_df['siglaOrgao'] == 'PLEN']
+    return pd.Index(plenario['id'].astype(str).unique())
 
-    for ano in range(ano_ini_legis, ano_atual + 1):
-        print(f"Baixando votações e orientações para o ano {ano}...")
+def contar_votos_mensais(votos):
+    """
+    Conta os votos de cada deputado por mês, no formato usado por criar_indice_legislativo.
+    """
+    mes = pd.to_datetime(votos['dataHoraVoto'], errors='coerce').dt.to_period('M').dt.to_timestamp()
+    contagem = pd.DataFrame({'idDeputado': votos['deputado_id'], 'dataHoraInicio': mes})
+    return contagem.groupby(['idDeputado', 'dataHoraInicio']).size().reset_index(name='N')
 
-        # Construir a URL para o ano específico
-        url = f"http://dadosabertos.camara.leg.br/arquivos/votacoesOrientacoes/csv/votacoesOrientacoes-{ano}.csv"
-        
-        # Utiliza a função genérica para baixar o CSV
-        data = baixar_csv_generico(f"votacoesOrientacoes", url, pasta_temp, str(ano))
+def codificar(valores, categorias=None, acrescentar=True):
+    """
+    Troca valores por códigos inteiros (posições em categorias), acrescentando às
+    categorias os valores ainda não vistos (ou, com acrescentar=False, dando a eles
+    o código -1). Valores nulos recebem o código -1.
 
-        # Se o download foi bem-sucedido, processar o DataFrame
-        if data is not None:
-            # Extrair idBancada do campo 'uriBancada'
-            data['idBancada'] = data['uriBancada'].apply(lambda x: re.search(r'\d+$', x).group() if pd.notnull(x) else None)
+    Retorna:
+    - Tupla (códigos, categorias atualizadas).
+    """
+    locais, novas = pd.factorize(valores)
+    novas = pd.Index(np.asarray(novas) if isinstance(novas, pd.Categorical) else novas)
+    if categorias is None:
+        categorias = novas if acrescentar else pd.Index([])
+    elif acrescentar:
+        categorias = categorias.append(novas.difference(categorias))
+    posicoes = np.append(categorias.get_indexer(novas), -1)
+    return posicoes[locais], categorias
+
+# Campos da TabelaVotos e as colunas de votacoesVotos de onde vêm
+campos_tabela_votos = {
+    'legislat': 'deputado_idLegislatura',
+    'votacao': 'idVotacao',
+    'deputado': 'deputado_id',
+    'partido': 'deputado_siglaPartido',
+    'voto': 'voto',
+}
+
+class TabelaVotos:
+    """
+    Somas dos votos de plenário por grupo, acumuladas bloco a bloco.
+
+    Cada campo (ver campos_tabela_votos) é trocado por códigos inteiros, posições em
+    categorias[campo], que crescem conforme aparecem valores novos; o voto usa -1 para
+    voto nulo. De cada bloco só ficam as somas por grupo, feitas com np.bincount sobre
+    os códigos e acrescentadas a acumuladores densos (um eixo por campo do grupo); o
+    bloco em si é descartado. Votos sem legislatura, votação, deputado ou partido são
+    descartados.
+    """
+
+    def __init__(self):
+        self.categorias = {campo: None for campo in campos_tabela_votos}
+        self.somas = {}
+
+    def codificar(self, votos, acrescentar=True):
+        """
+        Códigos de um bloco de votos (DataFrame com as colunas de campos_tabela_votos).
+        Com acrescentar=False, votos com valores ainda não vistos são descartados.
+
+        Retorna:
+        - Dicionário {campo: vetor de códigos}, só com os votos válidos.
+        """
+        codigos = {}
+        for campo, coluna in campos_tabela_votos.items():
+            codigos[campo], self.categorias[campo] = codificar(votos[coluna], self.categorias[campo], acrescentar)
+        validos = np.logical_and.reduce([codigo >= 0 for campo, codigo in codigos.items() if campo != 'voto'])
+        return {campo: codigo[validos] for campo, codigo in codigos.items()}
+
+    def codificar_como(self, campo, valores):
+        """
+        Códigos de valores de outra tabela nas categorias de um campo, para juntar com os
+        votos por código; valores que não aparecem nos votos recebem -1.
+        """
+        return codificar(valores, self.categorias[campo], acrescentar=False)[0]
+
+    def igual_a(self, campo, codigos, valor):
+        """
+        Vetor int8 com 1 onde o campo tem o valor dado e 0 nos demais.
+        """
+        categorias = self.categorias[campo]
+        if categorias is None or valor not in categorias:
+            return np.zeros(len(codigos[campo]), dtype=np.int8)
+        return (codigos[campo] == categorias.get_loc(valor)).astype(np.int8)
+
+    def acumular(self, nome, campos, codigos, valores=None):
+        """
+        Soma um vetor (um valor por voto do bloco; sem valores, conta os votos) por
+        combinação de campos e acrescenta ao acumulador `nome`, que cresce junto com as
+        categorias.
+        """
+        if not len(codigos[campos[0]]):
+            return
+        tamanhos = tuple(len(self.categorias[campo]) for campo in campos)
+        posicoes = np.ravel_multi_index(tuple(codigos[campo] for campo in campos), tamanhos)
+        soma = np.bincount(posicoes, weights=valores, minlength=int(np.prod(tamanhos))).reshape(tamanhos)
+        anterior = self.somas.get(nome)
+        if anterior is not None:
+            soma[tuple(slice(0, tamanho) for tamanho in anterior.shape)] += anterior
+        self.somas[nome] = soma
+
+    def tabela(self, soma, contagem, campos):
+        """
+        Acumuladores de soma e contagem como DataFrame, uma linha por combinação de campos
+        com contagem positiva.
+
+        Retorna:
+        - DataFrame com os campos, 'sum' e 'count'.
+        """
+        if contagem not in self.somas:
+            return pd.DataFrame(columns=[*campos, 'sum', 'count'])
+        posicoes = np.nonzero(self.somas[contagem])
+        somas = pd.DataFrame({campo: self.categorias[campo][codigo] for campo, codigo in zip(campos, posicoes)})
+        somas['sum'] = self.somas[soma][posicoes] if soma in self.somas else 0.0
+        somas['count'] = self.somas[contagem][posicoes]
+        return somas
+
+def somar_desvios(tabela_votos, codigos):
+    """
+    Acrescenta aos acumuladores, por (legislatura, deputado), o desvio de cada voto 'Sim'
+    do bloco em relação à média do partido naquela votação (Var 19). As médias vêm dos
+    acumuladores 'sim' e 'votos' da primeira leitura (ver agregar_votos).
+    """
+    sim = tabela_votos.igual_a('voto', codigos, 'Sim')
+    grupo = (codigos['legislat'], codigos['votacao'], codigos['partido'])
+    media_partido = tabela_votos.somas['sim'][grupo] / tabela_votos.somas['votos'][grupo]
+    tabela_votos.acumular('desvios', ['legislat', 'deputado'], codigos, np.abs(sim - media_partido))
+    tabela_votos.acumular('votos_deputado', ['legislat', 'deputado'], codigos)
+
+def indexar_orientacoes(tabela_votos, orientacoes_df):
+    """
+    Chave inteira (votação, partido) de cada orientação, nos códigos da TabelaVotos e
+    ordenada para a busca binária. Orientações que não são um voto possível ('Liberado')
+    e bancadas que não são partidos ficam de fora.
 
-            # Selecionar colunas relevantes
-            data = data[['idVotacao', 'siglaOrgao', 'orientacao', 'idBancada', 'siglaBancada']]
+    Parâmetros:
+    - tabela_votos: TabelaVotos com as categorias de todos os votos de plenário.
+    - orientacoes_df: DataFrame com idVotacao, siglaBancada e orientacao (ver pegar_votacoes_orientacoes).
 
-            # Concatenar os dados baixados ao DataFrame principal
-            votacoes_orientacoes = pd.concat([votacoes_orientacoes, data], ignore_index=True)
-    
-    return votacoes_orientacoes
+    Retorna:
+    - Tupla (chaves, código do voto orientado), ou None se não há orientação válida.
+    """
+    if tabela_votos.categorias['partido'] is None:
+        return None
+    votacao = tabela_votos.codificar_como('votacao', orientacoes_df['idVotacao'])
+    partido = tabela_votos.codificar_como('partido', orientacoes_df['siglaBancada'])
+    orientacao = tabela_votos.codificar_como('voto', orientacoes_df['orientacao'])
+    validas = (votacao >= 0) & (partido >= 0) & (orientacao >= 0)
+    if not validas.any():
+        return None
+    numero_partidos = len(tabela_votos.categorias['partido'])
+    chaves, primeiras = np.unique(votacao[validas].astype(np.int64) * numero_partidos + partido[validas], return_index=True)
+    return chaves, orientacao[validas][primeiras]
+
+def somar_orientacao(tabela_votos, codigos, orientacoes):
+    """
+    Acrescenta aos acumuladores, por (legislatura, deputado), os votos do bloco que
+    seguiram a orientação da bancada do deputado na votação e os votos com orientação.
+
+    Parâmetros:
+    - tabela_votos: TabelaVotos.
+    - codigos: Códigos do bloco (ver TabelaVotos.codificar).
+    - orientacoes: Orientações indexadas (ver indexar_orientacoes).
+    """
+    if orientacoes is None:
+        return
+    chaves, orientacao = orientacoes
+    chave_votos = codigos['votacao'].astype(np.int64) * len(tabela_votos.categorias['partido']) + codigos['partido']
+    posicao = np.minimum(np.searchsorted(chaves, chave_votos), len(chaves) - 1)
+    orientados = chaves[posicao] == chave_votos
+    seguiu = orientados & (codigos['voto'] == orientacao[posicao])
+    tabela_votos.acumular('seguiu', ['legislat', 'deputado'], codigos, seguiu)
+    tabela_votos.acumular('orientados', ['legislat', 'deputado'], codigos, orientados)
+
+def agregar_votos(ler_blocos, plenario, orientacoes_df):
+    """
+    Agrega os votos dos deputados no que o índice precisa deles: a contagem de votos por
+    deputado e mês e, por (legislatura, deputado), as somas dos desvios em relação ao
+    partido (Var 19) e dos votos que seguiram a orientação da bancada.
+
+    Os blocos são lidos duas vezes. Na primeira ficam as contagens mensais e, por
+    (legislatura, votação, partido), os votos 'Sim' e o total de votos de plenário; na
+    segunda, com a média de cada partido em cada votação já conhecida, desvios e
+    orientações são somados por deputado. Cada bloco é descartado assim que somado, de
+    modo que a memória usada fica limitada ao tamanho de um bloco mais os acumuladores
+    (ver TabelaVotos).
+
+    Parâmetros:
+    - ler_blocos: Função sem argumentos que devolve, a cada chamada, um iterável novo de
+      blocos de votos (DataFrames com as colunas de colunas_agregacao_votos).
+    - plenario: Ids das votações de plenário (ver votacoes_plenario).
+    - orientacoes_df: DataFrame com idVotacao, siglaBancada e orientacao (ver pegar_votacoes_orientacoes).
+
+    Retorna:
+    - Tupla (votos_mensais, desvios, orientacao): DataFrame com idDeputado, dataHoraInicio
+      e N, e DataFrames com legislat, idDeputado, 'sum' e 'count' dos desvios e dos votos
+      que seguiram a orientação.
+    """
+    mensais = []
+    tabela_votos = TabelaVotos()
+    grupo_votacao = ['legislat', 'votacao', 'partido']
+    for bloco in ler_blocos():
+        mensais.append(contar_votos_mensais(bloco))
+        codigos = tabela_votos.codificar(bloco[bloco['idVotacao'].isin(plenario)])
+        tabela_votos.acumular('sim', grupo_votacao, codigos, tabela_votos.igual_a('voto', codigos, 'Sim'))
+        tabela_votos.acumular('votos', grupo_votacao, codigos)
+
+    if 'votos' in tabela_votos.somas:
+        orientacoes = indexar_orientacoes(tabela_votos, orientacoes_df)
+        for bloco in ler_blocos():
+            codigos = tabela_votos.codificar(bloco[bloco['idVotacao'].isin(plenario)], acrescentar=False)
+            somar_desvios(tabela_votos, codigos)
+            somar_orientacao(tabela_votos, codigos, orientacoes)
+
+    campos = ['legislat', 'deputado']
+    desvios = tabela_votos.tabela('desvios', 'votos_deputado', campos).rename(columns={'deputado': 'idDeputado'})
+    orientacao = tabela_votos.tabela('seguiu', 'orientados', campos).rename(columns={'deputado': 'idDeputado'})
+    if not mensais:
+        return pd.DataFrame(columns=['idDeputado', 'dataHoraInicio', 'N']), desvios, orientacao
+    votos_mensais = pd.concat(mensais).groupby(['idDeputado', 'dataHoraInicio'])['N'].sum().reset_index()
+    return votos_mensais, desvios, orientacao
+
+def agregar_votos_deputados(votacoes_df, orientacoes_df, ano_atual, ano_ini_legis, pasta_temp="temp", tamanho_bloco=tamanho_bloco_votos):
+    """
+    Modo em blocos: agrega os arquivos votacoesVotos-{ano}.csv lendo tamanho_bloco linhas
+    por vez, sem montar a tabela de todos os votos.
+
+    Parâmetros:
+    - votacoes_df: DataFrame de votações (para saber quais são de plenário).
+    - orientacoes_df: DataFrame de orientações das bancadas (ver pegar_votacoes_orientacoes).
+    - ano_atual: Ano atual.
+    - ano_ini_legis: Ano inicial da legislatura.
+    - pasta_temp: Diretório onde os arquivos CSV são salvos (padrão: 'temp').
+    - tamanho_bloco: Número de linhas lidas por vez.
+
+    Retorna:
+    - Tupla (votos_mensais, desvios, orientacao), como em agregar_votos.
+    """
+    esquema = esquemas_datasets["votacoesVotos"]
+
+    def blocos():
+        for ano in range(ano_ini_legis, ano_atual + 1):
+            print(f"Agregando votações por deputado para o ano {ano}...")
+            arquivo_csv = caminho_arquivo_csv("votacoesVotos", pasta_temp, str(ano))
+            if not os.path.exists(arquivo_csv) and baixar_arquivo("votacoesVotos", url_arquivo_anual("votacoesVotos", ano), pasta_temp, str(ano)) is None:
+                continue
+            yield from ler_csv_em_blocos(arquivo_csv, esquema, colunas_agregacao_votos, tamanho_bloco)
+
+    return agregar_votos(blocos, votacoes_plenario(votacoes_df), orientacoes_df)
+
+def agregar_votos_em_memoria(votacoes_df, orientacoes_df, ano_atual, ano_ini_legis, pasta_temp="temp"):
+    """
+    Carrega a tabela de todos os votos (pegar_votacoes_deputados) e a agrega como um
+    único bloco.
+
+    Retorna:
+    - Tupla (votos_mensais, desvios, orientacao), como em agregar_votos.
+    """
+    dep_votacoes_df = pegar_votacoes_deputados(ano_atual, ano_ini_legis, pasta_temp)
+    return agregar_votos(lambda: [dep_votacoes_df], votacoes_plenario(votacoes_df), orientacoes_df)
+
+
+def pegar_votacoes_orientacoes(ano_atual, ano_ini_legis, pasta_temp="temp"):
+    """
+    Função que baixa os arquivos de votações e orientação dos líderes para os anos entre o ano atual e o ano de início da legislatura.
+    """
+
+    def processar(data):
+        # Extrair idBancada do campo 'uriBancada' e selecionar colunas relevantes
+        data['idBancada'] = extrair_id_uri(data['uriBancada'])
+        return data[['idVotacao', 'siglaOrgao', 'orientacao', 'idBancada', 'siglaBancada']]
+
+    return carregar_anos("votacoesOrientacoes", "votações e orientações", ano_atual, ano_ini_legis, pasta_temp, processar)
 
 
 def pegar_cargos_deputados(legislatura):
@@ -414,14 +1147,14 @@ def pegar_cargos_deputados(legislatura):
 
     print(f"Baixando cargos dos deputados para a legislatura {legislatura}...") 
     # Construir a URL para o ano específico
-    url = f"http://dadosabertos.camara.leg.br/arquivos/orgaosDeputados/csv/orgaosDeputados-L{legislatura}.csv"
+    url = f"{url_arquivos}/orgaosDeputados/csv/orgaosDeputados-L{legislatura}.csv"
 
     # Utiliza a função genérica para baixar o CSV
     data = baixar_csv_generico("orgaosDeputados", url)  
     # Se o download foi bem-sucedido, processar o DataFrame
     if data is not None:
         # Extrair id.deputado do campo 'uriDeputado'
-        data['id.deputado'] = data['uriDeputado'].apply(lambda x: re.search(r'\d+$', x).group() if pd.notnull(x) else None) 
+        data['id.deputado'] = extrair_id_uri(data['uriDeputado'])
         # Selecionar colunas relevantes e adicionar a legislatura
         data = data[['siglaOrgao', 'nomeOrgao', 'nomePublicacaoOrgao', 'nomeDeputado', 'id.deputado',
                      'siglaPartido', 'siglaUF', 'cargo', 'dataInicio', 'dataFim']].copy()
@@ -442,7 +1175,7 @@ def pegar_orgaos(pasta_temp="temp"):
     - DataFrame Pandas com o conteúdo dos órgãos.
     """
     
-    url = "http://dadosabertos.camara.leg.br/arquivos/orgaos/csv/orgaos.csv"
+    url = f"{url_arquivos}/orgaos/csv/orgaos.csv"
     
     # Utiliza a função genérica para baixar o CSV
     orgaos = baixar_csv_generico("orgaos", url, pasta_temp)
@@ -451,13 +1184,13 @@ def pegar_orgaos(pasta_temp="temp"):
 
     return orgaos
 
-def criar_indice_legislativo(dep_eventos_df, dep_votacoes_df):
+def criar_indice_legislativo(dep_eventos_df, votos_mensais_df):
     """
     Função que combina dados de presenças em eventos e votações de deputados para criar o índice legislativo.
     
     Parâmetros:
     - dep_eventos_df: DataFrame contendo as presenças dos deputados nos eventos.
-    - dep_votacoes_df: DataFrame contendo os votos dos deputados.
+    - votos_mensais_df: DataFrame com o número de votos de cada deputado por mês (ver agregar_votos).
 
     Retorna:
     - DataFrame com o índice legislativo combinado.
@@ -468,53 +1201,86 @@ def criar_indice_legislativo(dep_eventos_df, dep_votacoes_df):
 
     ind_legis = dep_eventos_df.groupby(['idDeputado', 'dataHoraInicio']).size().reset_index(name='N')
 
-    # Processar o DataFrame de votações
-    dep_votacoes_df['dataHoraVoto'] = pd.to_datetime(dep_votacoes_df['dataHoraVoto'], errors='coerce').dt.to_period('M').dt.to_timestamp()
-
-    ind_votacoes = dep_votacoes_df.groupby(['deputado_id', 'dataHoraVoto']).size().reset_index(name='N')
-    ind_votacoes.rename(columns={'deputado_id': 'idDeputado', 'dataHoraVoto': 'dataHoraInicio'}, inplace=True)
+    # Votações: já contadas por deputado e mês
+    ind_votacoes = votos_mensais_df
 
     # Combinar os dois DataFrames (full join)
     ind_legis = pd.merge(ind_legis, ind_votacoes, on=['idDeputado', 'dataHoraInicio'], how='outer')
 
     # Criar a coluna 'legislat' com base nas faixas de datas
-    base_date = datetime(1995, 2, 1)
-    
-    def define_legislatura(date):
-        if pd.isnull(date):  # Verificar se a data é nula
-            return None
-        if base_date <= date < base_date + timedelta(days=4*365):
-            return "50"
-        elif base_date + timedelta(days=4*365) <= date < base_date + timedelta(days=8*365):
-            return "51"
-        elif base_date + timedelta(days=8*365) <= date < base_date + timedelta(days=12*365):
-            return "52"
-        elif base_date + timedelta(days=12*365) <= date < base_date + timedelta(days=16*365):
-            return "53"
-        elif base_date + timedelta(days=16*365) <= date < base_date + timedelta(days=20*365):
-            return "54"
-        elif base_date + timedelta(days=20*365) <= date < base_date + timedelta(days=24*365):
-            return "55"
-        elif base_date + timedelta(days=24*365) <= date < base_date + timedelta(days=28*365):
-            return "56"
-        elif base_date + timedelta(days=28*365) <= date < base_date + timedelta(days=32*365):
-            return "57"
-        else:
-            return None
-
-    # Aplicar a função para definir a legislatura
-    ind_legis['legislat'] = ind_legis['dataHoraInicio'].apply(define_legislatura)
+    ind_legis['legislat'] = definir_legislatura(ind_legis['dataHoraInicio'])
 
     # Remover duplicatas e contar meses
     ind_legis = ind_legis[['idDeputado', 'dataHoraInicio', 'legislat']].drop_duplicates()
     
     # Agrupar por 'idDeputado' e 'legislat' e contar meses
     ind_legis = ind_legis.groupby(['idDeputado', 'legislat']).size().reset_index(name='meses')
-    ind_legis['legislat'] = ind_legis['legislat'].astype('int64')
+    ind_legis[['idDeputado', 'legislat']] = ind_legis[['idDeputado', 'legislat']].astype('int64')
 
     return ind_legis
 
-def processar_proposicoes(proposicoes_df, temas_prop_df, autores_prop_df):
+# Palavras que indicam proposições de baixa relevância (homenagens, datas, nomes de obras...)
+padrao_palavras_chave = re.compile(r"hora|dia|Dia|semana|Semana|Mês|ano|data|festa|calendario|calendário|titulo|título|prêmio|medalha|nome|galeria|ponte|ferrovia|estrada| aeroporto|rotatória|honorário")
+
+# Cache da classificação das ementas, por id.proposicao e hash da ementa
+arquivo_cache_ementas = "classificacao_ementas.pkl"
+
+def classificar_ementas(proposicoes_df, pasta_temp="temp"):
+    """
+    Marca as ementas que contêm alguma das palavras de padrao_palavras_chave.
+
+    O resultado de cada proposição fica guardado em cache pela chave (id.proposicao,
+    hash da ementa): só as ementas novas ou alteradas passam pela expressão regular,
+    de uma vez, com os métodos de texto do pandas. O cache é descartado se o padrão mudar.
+
+    Parâmetros:
+    - proposicoes_df: DataFrame com id.proposicao e ementa.
+    - pasta_temp: Diretório onde o cache é salvo (padrão: 'temp').
+
+    Retorna:
+    - Series de inteiros (1 se a ementa tem palavra-chave, 0 se não), com o índice de proposicoes_df.
+    """
+    caminho = os.path.join(pasta_temp, arquivo_cache_ementas)
+    ementas = proposicoes_df['ementa'].astype(str)
+    # Proposições sem id entram com id -1: a ementa é classificada do mesmo jeito
+    chaves = pd.MultiIndex.from_arrays([proposicoes_df['id.proposicao'].fillna(-1).astype('int64'),
+                                        pd.util.hash_pandas_object(ementas, index=False).to_numpy()],
+                                       names=['id.proposicao', 'hash'])
+
+    def ler_cache():
+        try:
+            cache = pd.read_pickle(caminho)
+            return cache['classificacao'] if cache.get('padrao') == padrao_palavras_chave.pattern else None
+        except Exception as e:
+            # Cache ilegível (corrompido, de outra versão do pandas...): vale como ausente
+            if os.path.exists(caminho):
+                print(f"Cache de ementas inválido, ignorando: {caminho} ({str(e)})")
+            return None
+
+    classificacao = ler_cache()
+    if classificacao is None:
+        classificacao = pd.Series(dtype='int8', index=chaves[:0])
+    posicoes = classificacao.index.get_indexer(chaves)
+
+    novas = posicoes < 0
+    if novas.any():
+        print(f"Classificando {novas.sum()} ementas novas ou alteradas...")
+        resultado = pd.Series(ementas[novas].str.contains(padrao_palavras_chave).to_numpy(dtype='int8'), index=chaves[novas])
+        resultado = resultado[~resultado.index.duplicated()]
+
+        # Relê o cache antes de gravar, para não perder o que outro processo acabou de acrescentar
+        atual = ler_cache()
+        atual = classificacao if atual is None else atual
+        classificacao = pd.concat([atual, resultado[~resultado.index.isin(atual.index)]])
+        os.makedirs(pasta_temp, exist_ok=True)
+        arquivo_parcial = f"{caminho}.{os.getpid()}.tmp"
+        pd.to_pickle({'padrao': padrao_palavras_chave.pattern, 'classificacao': classificacao}, arquivo_parcial)
+        os.replace(arquivo_parcial, caminho)
+        posicoes = classificacao.index.get_indexer(chaves)
+
+    return pd.Series(classificacao.to_numpy()[posicoes].astype(int), index=proposicoes_df.index)
+
+def processar_proposicoes(proposicoes_df, temas_prop_df, autores_prop_df, pasta_temp="temp"):
     """
     Processa as proposições legislativas, juntando com temas, autores e definindo a relevância.
     
@@ -522,6 +1288,7 @@ def processar_proposicoes(proposicoes_df, temas_prop_df, autores_prop_df):
     - proposicoes_df: DataFrame contendo as proposições legislativas.
     - temas_prop_df: DataFrame contendo os temas das proposições legislativas.
     - autores_prop_df: DataFrame contendo os autores das proposições legislativas.
+    - pasta_temp: Diretório do cache de classificação das ementas (padrão: 'temp').
     Retorna:
     - DataFrame processado com as transformações aplicadas.
     """
@@ -530,30 +1297,24 @@ def processar_proposicoes(proposicoes_df, temas_prop_df, autores_prop_df):
     proposicoes_df['dataApresentacao'] = pd.to_datetime(proposicoes_df['dataApresentacao'], errors='coerce')
     proposicoes_df['dataApresentacao'] = proposicoes_df['dataApresentacao'].dt.to_period('M').dt.to_timestamp()
 
-    keywords_pattern = r"hora|dia|Dia|semana|Semana|Mês|ano|data|festa|calendario|calendário|titulo|título|prêmio|medalha|nome|galeria|ponte|ferrovia|estrada| aeroporto|rotatória|honorário"
-    proposicoes_df['keywords'] = proposicoes_df['ementa'].apply(lambda x: 1 if re.search(keywords_pattern, str(x)) else 0)
+    proposicoes_df['keywords'] = classificar_ementas(proposicoes_df, pasta_temp)
 
-    proposicoes_df['id.proposicao'] = proposicoes_df['id.proposicao'].astype(str)
     proposicoes_df = proposicoes_df.drop(columns=['ementa']).drop_duplicates()
-    proposicoes_df.to_csv("/tmp/sem-tema.csv", index=False)
 
     # 2. Processar 'temas.prop'
-    temas_filtro = temas_prop_df[temas_prop_df['tema'] == "Homenagens e Datas Comemorativas"]
-    temas_filtro.loc[:,'id.proposicao'] = temas_filtro['id.proposicao'].astype(str)
-    temas_filtro.loc[:,'tema'] = 1
+    temas_filtro = temas_prop_df[temas_prop_df['tema'] == "Homenagens e Datas Comemorativas"].copy()
+    temas_filtro['tema'] = 1
     temas_filtro = temas_filtro[['id.proposicao', 'tema']].drop_duplicates()
 
     proposicoes_df = proposicoes_df.merge(temas_filtro, on='id.proposicao', how='left')
     
     with pd.option_context('future.no_silent_downcasting', True):
         proposicoes_df['tema'] = proposicoes_df['tema'].fillna(0).astype(int)
-    proposicoes_df.to_csv("/tmp/com_tema.csv", index=False)
 
     # 3. Juntar com 'autores.prop'
-    autores_prop_df = autores_prop_df.drop(columns=['uriProposicao', 'uriAutor', 'uriPartidoAutor'])
-    autores_prop_df['protagonista'] = autores_prop_df.apply(lambda row: 1 if row['ordemAssinatura'] == 1 and row['proponente'] == 1 else 0, axis=1)
-    autores_prop_df['id.proposicao'] = autores_prop_df['idProposicao'].astype(str)
-    autores_prop_df = autores_prop_df.drop(columns=['idProposicao']).drop_duplicates()
+    autores_prop_df = autores_prop_df.drop(columns=['uriProposicao', 'uriAutor', 'uriPartidoAutor'], errors='ignore')
+    autores_prop_df['protagonista'] = (autores_prop_df['ordemAssinatura'].eq(1) & autores_prop_df['proponente'].eq(1)).fillna(False).astype(int)
+    autores_prop_df = autores_prop_df.rename(columns={'idProposicao': 'id.proposicao'}).drop_duplicates()
 
     proposicoes_df = proposicoes_df.merge(autores_prop_df, on='id.proposicao', how='left')
     proposicoes_df = proposicoes_df.dropna(subset=['idDeputadoAutor'])
@@ -565,509 +1326,268 @@ def processar_proposicoes(proposicoes_df, temas_prop_df, autores_prop_df):
         'protagonista': int, 
         'ano.loop_y': int
     })    
-    proposicoes_df['relevancia'] = proposicoes_df.apply(lambda row: 0 if row['keywords'] == 1 or row['tema'] == 1 else 1, axis=1)
+    proposicoes_df['relevancia'] = ((proposicoes_df['keywords'] != 1) & (proposicoes_df['tema'] != 1)).astype(int)
     proposicoes_df = proposicoes_df.rename(columns={"ano.loop_y": "ano.loop.y", "ano.loop_x": "ano.loop.x"})
-    proposicoes_df = proposicoes_df[proposicoes_df['idDeputadoAutor'].notna() & (proposicoes_df['idDeputadoAutor'] != "") & (proposicoes_df['idDeputadoAutor'] != 0)]    
-    proposicoes_df.to_csv("/tmp/pre_leg.csv", index=False)
+    proposicoes_df = proposicoes_df[proposicoes_df['idDeputadoAutor'] != 0]
 
     # 4. Definir a legislatura
-    def definir_legislatura(dataHoraInicio):
-        if pd.isnull(dataHoraInicio):
-            return None
-        legislaturas = [
-            (datetime(1995, 2, 1), datetime(1999, 1, 31), "50"),
-            (datetime(1999, 2, 1), datetime(2003, 1, 31), "51"),
-            (datetime(2003, 2, 1), datetime(2007, 1, 31), "52"),
-            (datetime(2007, 2, 1), datetime(2011, 1, 31), "53"),
-            (datetime(2011, 2, 1), datetime(2015, 1, 31), "54"),
-            (datetime(2015, 2, 1), datetime(2019, 1, 31), "55"),
-            (datetime(2019, 2, 1), datetime(2023, 1, 31), "56"),
-            (datetime(2023, 2, 1), datetime(2027, 1, 31), "57")
-        ]
-        for inicio, fim, legislatura in legislaturas:
-            if inicio <= dataHoraInicio < fim:
-                return legislatura
-        return None
-
     proposicoes_df = proposicoes_df.rename(columns={"dataApresentacao": "dataHoraInicio"})
-    proposicoes_df['legislat'] = proposicoes_df['dataHoraInicio'].apply(definir_legislatura)
-    proposicoes_df['legislat'] = proposicoes_df['legislat'].astype('int64')
+    proposicoes_df['legislat'] = definir_legislatura(proposicoes_df['dataHoraInicio']).astype('int64')
     return proposicoes_df
 
 
-def calcula_var_1(proposicoes_df_filtradas, ind_legis_df):
-    """
-    Função que calcula a variável 'Var1' (proposições de protagonismo e relevância) e faz a junção com o DataFrame ind_legis.
-    
-    Parâmetros:
-    - proposicoes_df_filtradas: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
-    Retorna:
-    - DataFrame combinado com o cálculo de proposições de protagonismo e relevância.
-    """
-
-    # 1. Filtrar as proposições pelos tipos relevantes
-    prov = proposicoes_df_filtradas[proposicoes_df_filtradas['siglaTipo'].isin(["PDL", "PEC", "PL", "PLP", "PLV"])]
-
-    # 2. Agrupar por legislatura, idDeputadoAutor, protagonista, relevancia e contar as ocorrências
-    prov = (prov.groupby(['legislat', 'idDeputadoAutor', 'protagonista', 'relevancia'])
-            .size()
-            .reset_index(name='N'))
-
-    # 3. Filtrar as proposições onde protagonista == 1 e relevancia == 1
-    prov = prov[(prov['protagonista'] == 1) & (prov['relevancia'] == 1)]
-
-    # 4. Selecionar as colunas relevantes e renomear colunas
-    prov = prov[['legislat', 'idDeputadoAutor', 'N']].rename(columns={'N': 'proj.relev.prot', 'idDeputadoAutor': 'idDeputado'})
-
-    # 5. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-    return ind_legis_df
+# Tipos de proposição considerados projetos (Var1 a Var4 e Var12)
+tipos_projeto = ["PDL", "PEC", "PL", "PLP", "PLV"]
+
+def eh_projeto(p):
+    """Máscara das proposições que são projetos (tipos_projeto)."""
+    return p['siglaTipo'].isin(tipos_projeto)
+
+def descricao_mpv(p):
+    """Máscara das proposições cuja descrição do tipo menciona MPV."""
+    return p['descricaoTipo'].str.contains("MPV", na=False)
+
+# Variáveis calculadas a partir das proposições: cada uma é a coluna de saída e o
+# predicado que diz quais proposições (uma linha por autor) contam para ela.
+# Todas são contadas por legislatura e deputado autor em calcular_variaveis_proposicoes.
+variaveis_proposicoes = [
+    # Var1: projetos com protagonismo e relevantes
+    ('proj.relev.prot', lambda p: eh_projeto(p) & (p['protagonista'] == 1) & (p['relevancia'] == 1)),
+    # Var2: projetos com protagonismo e baixa relevância
+    ('proj.n.relev.prot', lambda p: eh_projeto(p) & (p['protagonista'] == 1) & (p['relevancia'] == 0)),
+    # Var3: projetos sem protagonismo, mas relevantes
+    ('proj.relev.n.prot', lambda p: eh_projeto(p) & (p['protagonista'] == 0) & (p['relevancia'] == 1)),
+    # Var4: projetos sem protagonismo e pouco relevantes
+    ('proj.n.relev.n.prot', lambda p: eh_projeto(p) & (p['protagonista'] == 0) & (p['relevancia'] == 0)),
+    # Var5: votos em separado
+    ('voto.separado', lambda p: p['siglaTipo'] == "VTS"),
+    # Var6: substitutivos
+    ('substitutivos', lambda p: p['siglaTipo'] == "SBT"),
+    # Var7: relatorias
+    ('relatorias', lambda p: p['siglaTipo'] == "PRL"),
+    # Var9: emendas em plenário
+    ('emendas.plenario', lambda p: p['siglaTipo'].isin(["EMP", "EMR"]) & ~descricao_mpv(p)),
+    # Var10: emendas às MPs
+    ('emendas.mp', lambda p: (p['siglaTipo'] == "EMP") & descricao_mpv(p)),
+    # Var11: emendas às LOA
+    ('emendas.loa', lambda p: p['siglaTipo'].isin(["EMO", "EML"])),
+    # Var12: projetos com status especial
+    ('proj.especial', lambda p: eh_projeto(p) & p['ultimoStatus_regime'].str.contains(r"^Especial$|202", na=False)),
+]
+
+def calcular_variaveis_proposicoes(proposicoes_df, variaveis=variaveis_proposicoes):
+    """
+    Calcula de uma só vez todas as variáveis baseadas em proposições (ver variaveis_proposicoes).
+
+    Cada predicado vira uma máscara booleana sobre a tabela de proposições; as máscaras
+    são somadas num único groupby por legislatura e deputado autor, em vez de um filtro
+    e um groupby por variável.
 
-def calcula_var_2(proposicoes_df, ind_legis_df):
-    """
-    Função que calcula a variável 'Var2' (proposições de protagonismo e baixa relevância) e faz a junção com o DataFrame ind_legis.
-    
     Parâmetros:
-    - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
-    Retorna:
-    - DataFrame combinado com o cálculo de proposições de protagonismo e baixa relevância.
-    """
-
-    # 1. Filtrar as proposições pelos tipos relevantes
-    prov = proposicoes_df[proposicoes_df['siglaTipo'].isin(["PDL", "PEC", "PL", "PLP", "PLV"])]
-
-    # 2. Agrupar por legislatura, idDeputadoAutor, protagonista, relevancia e contar as ocorrências
-    prov = (prov.groupby(['legislat', 'idDeputadoAutor', 'protagonista', 'relevancia'])
-            .size()
-            .reset_index(name='N'))
-
-    # 3. Filtrar as proposições onde protagonista == 1 e relevancia == 0
-    prov = prov[(prov['protagonista'] == 1) & (prov['relevancia'] == 0)]
-
-    # 4. Selecionar as colunas relevantes e renomear colunas
-    prov = prov[['legislat', 'idDeputadoAutor', 'N']].rename(columns={'N': 'proj.n.relev.prot', 'idDeputadoAutor': 'idDeputado'})
-    prov['legislat'] = prov['legislat'].astype('int64')
-    ind_legis_df['legislat'] = ind_legis_df['legislat'].astype('int64')
-
-    # 5. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-    return ind_legis_df
+    - proposicoes_df: DataFrame contendo as proposições legislativas (uma linha por autor).
+    - variaveis: Lista de pares (coluna de saída, predicado).
 
-
-def calcula_var_3(proposicoes_df, ind_legis_df):
-    """
-    Função que calcula a variável 'Var3' (proposições sem protagonismo, mas relevantes) e faz a junção com o DataFrame ind_legis.
-    
-    Parâmetros:
-    - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
     Retorna:
-    - DataFrame combinado com o cálculo de proposições sem protagonismo, mas relevantes.
+    - DataFrame com legislat, idDeputado e uma coluna de contagem por variável.
     """
+    colunas = [coluna for coluna, _ in variaveis]
+    contagens = pd.DataFrame({coluna: predicado(proposicoes_df).to_numpy(dtype=bool) for coluna, predicado in variaveis},
+                             index=proposicoes_df.index)
+    contagens['legislat'] = proposicoes_df['legislat']
+    contagens['idDeputado'] = proposicoes_df['idDeputadoAutor']
 
-    # 1. Filtrar as proposições pelos tipos relevantes
-    prov = proposicoes_df[proposicoes_df['siglaTipo'].isin(["PDL", "PEC", "PL", "PLP", "PLV"])]
-
-    # 2. Agrupar por legislatura, idDeputadoAutor, protagonista, relevancia e contar as ocorrências
-    prov = (prov.groupby(['legislat', 'idDeputadoAutor', 'protagonista', 'relevancia'])
-            .size()
-            .reset_index(name='N'))
-
-    # 3. Filtrar as proposições onde protagonista == 0 e relevancia == 1
-    prov = prov[(prov['protagonista'] == 0) & (prov['relevancia'] == 1)]
+    return contagens.groupby(['legislat', 'idDeputado'])[colunas].sum().reset_index()
 
-    # 4. Selecionar as colunas relevantes e renomear colunas
-    prov = prov[['legislat', 'idDeputadoAutor', 'N']].rename(columns={'N': 'proj.relev.n.prot', 'idDeputadoAutor': 'idDeputado'})
 
-    # 5. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-    return ind_legis_df
+# Categorias de eventos: cada uma é um bit da máscara de indexar_eventos. As que têm
+# coluna viram uma contagem de presenças (Var8 e Var15); as audiências públicas só
+# selecionam os requerimentos da Var14.
+categorias_eventos = [
+    ('pres.plenario', ["Sessão Deliberativa"]),
+    ('event.tecnico', ["Evento Técnico", "Reunião Técnica", "Visita Técnica"]),
+    ('audiencia', ["Audiência Pública", "Audiência Pública e Deliberação"]),
+]
+colunas_presenca_eventos = ['pres.plenario', 'event.tecnico']
 
-def calcula_var_4(proposicoes_df, ind_legis_df):
+def bit_categoria_evento(nome):
     """
-    Função que calcula a variável 'Var4' (proposições sem protagonismo e pouco relevantes) e faz a junção com o DataFrame ind_legis.
-    
-    Parâmetros:
-    - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
-    Retorna:
-    - DataFrame combinado com o cálculo de proposições sem protagonismo e pouco relevantes.
+    Retorna o bit de uma categoria de eventos (ver categorias_eventos).
     """
+    return 1 << [categoria for categoria, _ in categorias_eventos].index(nome)
 
-    # 1. Filtrar as proposições pelos tipos relevantes
-    prov = proposicoes_df[proposicoes_df['siglaTipo'].isin(["PDL", "PEC", "PL", "PLP", "PLV"])]
-
-    # 2. Agrupar por legislatura, idDeputadoAutor, protagonista, relevancia e contar as ocorrências
-    prov = (prov.groupby(['legislat', 'idDeputadoAutor', 'protagonista', 'relevancia'])
-            .size()
-            .reset_index(name='N'))
-
-    # 3. Filtrar as proposições onde protagonista == 0 e relevancia == 0
-    prov = prov[(prov['protagonista'] == 0) & (prov['relevancia'] == 0)]
-
-    # 4. Selecionar as colunas relevantes e renomear colunas
-    prov = prov[['legislat', 'idDeputadoAutor', 'N']].rename(columns={'N': 'proj.n.relev.n.prot', 'idDeputadoAutor': 'idDeputado'})
-
-    # 5. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-    return ind_legis_df
-
-
-def calcula_var_5(proposicoes_df, ind_legis_df):
+def indexar_eventos(eventos_df):
     """
-    Função que calcula a variável 'Var5' (Votos em separado) e faz a junção com o DataFrame ind_legis.
-    
-    Parâmetros:
-    - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
-    Retorna:
-    - DataFrame combinado com o cálculo de votos em separado.
-    """
-    
-    # 1. Filtrar as proposições com siglaTipo == "VTS"
-    prov = proposicoes_df[proposicoes_df['siglaTipo'] == "VTS"]
+    Monta, uma única vez, o índice dos eventos usado pelas variáveis de eventos.
 
-    # 2. Agrupar por legislatura e idDeputadoAutor e contar as ocorrências
-    prov = prov.groupby(['legislat', 'idDeputadoAutor']).size().reset_index(name='N')
-
-    # 3. Renomear colunas
-    prov = prov.rename(columns={'N': 'voto.separado', 'idDeputadoAutor': 'idDeputado'})
-    prov['legislat'] = prov['legislat'].astype('int64')
-
-    # 4. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-    return ind_legis_df
-
-
-def calcula_var_6(proposicoes_df, ind_legis_df):
-    """
-    Função que calcula a variável 'Var6' (Substitutivos) e faz a junção com o DataFrame ind_legis.
-    
     Parâmetros:
-    - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
-    Retorna:
-    - DataFrame combinado com o cálculo de substitutivos.
-    """
-    
-    # 1. Filtrar as proposições com siglaTipo == "SBT"
-    prov = proposicoes_df[proposicoes_df['siglaTipo'] == "SBT"]
+    - eventos_df: DataFrame contendo os eventos legislativos (com a coluna legislat).
 
-    # 2. Agrupar por legislatura e idDeputadoAutor e contar as ocorrências
-    prov = prov.groupby(['legislat', 'idDeputadoAutor']).size().reset_index(name='N')
-
-    # 3. Renomear colunas
-    prov = prov.rename(columns={'N': 'substitutivos', 'idDeputadoAutor': 'idDeputado'})
-    prov['legislat'] = prov['legislat'].astype('int64')
-
-    # 4. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-    return ind_legis_df
-
-
-def calcula_var_7(proposicoes_df, ind_legis_df):
-    """
-    Função que calcula a variável 'Var7' (Relatorias) e faz a junção com o DataFrame ind_legis.
-    
-    Parâmetros:
-    - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
     Retorna:
-    - DataFrame combinado com o cálculo de relatorias.
+    - DataFrame indexado por idEvento, com legislat e a máscara de bits das categorias do evento.
     """
-    
-    # 1. Filtrar as proposições com siglaTipo == "PRL"
-    prov = proposicoes_df[proposicoes_df['siglaTipo'] == "PRL"]
+    mascara = np.zeros(len(eventos_df), dtype=np.uint8)
+    for categoria, tipos in categorias_eventos:
+        mascara[eventos_df['descricaoTipo'].isin(tipos).to_numpy()] |= bit_categoria_evento(categoria)
 
-    # 2. Agrupar por legislatura e idDeputadoAutor e contar as ocorrências
-    prov = prov.groupby(['legislat', 'idDeputadoAutor']).size().reset_index(name='N')
+    indice = pd.DataFrame({'legislat': eventos_df['legislat'].to_numpy(), 'mascara': mascara},
+                          index=pd.Index(eventos_df['id'], name='idEvento'))
+    return indice[~indice.index.duplicated()]
 
-    # 3. Renomear colunas
-    prov = prov.rename(columns={'N': 'relatorias', 'idDeputadoAutor': 'idDeputado'})
-    prov['legislat'] = prov['legislat'].astype('int64')
-    prov.to_csv("/tmp/prov_7.csv", index=False)
-
-    # 4. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-    return ind_legis_df
-
-
-def calcula_var_8(eventos_df, dep_eventos_df, ind_legis_df):
+def contar_presencas_eventos(indice_eventos, dep_eventos_df, colunas=colunas_presenca_eventos):
     """
-    Função que calcula a variável 'Var8' (Presença em votações em Plenário) e faz a junção com o DataFrame ind_legis.
-    
+    Função que calcula as variáveis 'Var8' (Presença em votações em Plenário) e 'Var15'
+    (Reuniões e eventos técnicos), numa única passada pela tabela de presenças: cada
+    presença é ligada ao seu evento pela posição no índice, e a máscara do evento diz
+    em quais contagens ela entra.
+
     Parâmetros:
-    - eventos_df: DataFrame contendo os eventos legislativos.
+    - indice_eventos: Índice dos eventos (ver indexar_eventos).
     - dep_eventos_df: DataFrame contendo a presença dos deputados nos eventos.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
-    
-    Retorna:
-    - DataFrame combinado com o cálculo da presença em votações no plenário.
-    """
-
-    # 1. Converter 'dataHoraInicio' para formato de data
-    eventos_df['dataHoraInicio'] = pd.to_datetime(eventos_df['dataHoraInicio']).dt.date
-
-    # 2. Definir a legislatura com base nas faixas de datas
-    base_date = datetime(1995, 2, 1).date()
-    eventos_df['legislat'] = None
-    
-    def definir_legislatura(dataHoraInicio):
-        if base_date <= dataHoraInicio < base_date + timedelta(days=4*365):
-            return "50"
-        elif base_date + timedelta(days=4*365) <= dataHoraInicio < base_date + timedelta(days=8*365):
-            return "51"
-        elif base_date + timedelta(days=8*365) <= dataHoraInicio < base_date + timedelta(days=12*365):
-            return "52"
-        elif base_date + timedelta(days=12*365) <= dataHoraInicio < base_date + timedelta(days=16*365):
-            return "53"
-        elif base_date + timedelta(days=16*365) <= dataHoraInicio < base_date + timedelta(days=20*365):
-            return "54"
-        elif base_date + timedelta(days=20*365) <= dataHoraInicio < base_date + timedelta(days=24*365):
-            return "55"
-        elif base_date + timedelta(days=24*365) <= dataHoraInicio < base_date + timedelta(days=28*365):
-            return "56"
-        elif base_date + timedelta(days=28*365) <= dataHoraInicio < base_date + timedelta(days=32*365):
-            return "57"
-        return None
-
-    eventos_df['legislat'] = eventos_df['dataHoraInicio'].apply(definir_legislatura)
-
-    # 3. Filtrar eventos do tipo "Sessão Deliberativa"
-    eventos_filtrados = eventos_df[eventos_df['descricaoTipo'] == "Sessão Deliberativa"]
-
-    # 4. Selecionar colunas relevantes e fazer a junção com 'dep_eventos_df'
-    prov = eventos_filtrados[['id', 'legislat']].rename(columns={'id': 'idEvento'})
-    prov = pd.merge(prov, dep_eventos_df, on='idEvento', how='left')
-
-    # 5. Agrupar por legislatura e idDeputado e contar presenças
-    prov = prov.groupby(['legislat', 'idDeputado']).size().reset_index(name='pres.plenario')
-    prov = prov.round(0).astype(int)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-
-    # 6. Fazer a junção com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df['pres.plenario'] = ind_legis_df['pres.plenario'].astype(int)
+    - colunas: Categorias de eventos a contar.
 
-    return ind_legis_df
-
-def calcula_var_9(proposicoes_df, ind_legis_df):
-    """
-    Função que calcula a variável 'Var9' (Emendas em Plenário) e faz a junção com o DataFrame ind_legis.
+    Retorna:
+    - DataFrame com legislat, idDeputado e uma coluna de contagem por categoria.
     """
-    prov = proposicoes_df[(proposicoes_df['siglaTipo'].isin(["EMP", "EMR"])) & (~proposicoes_df['descricaoTipo'].str.contains("MPV"))]
-    prov = prov.groupby(['legislat', 'idDeputadoAutor']).size().reset_index(name='emendas.plenario')
-    prov = prov.rename(columns={'idDeputadoAutor': 'idDeputado'})
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-
-    return ind_legis_df
+    bits = sum(bit_categoria_evento(coluna) for coluna in colunas)
+    mascaras = np.append(indice_eventos['mascara'].to_numpy() & bits, 0)
 
+    # Só as presenças em eventos de alguma das categorias (posição -1: evento fora do índice)
+    posicoes = indice_eventos.index.get_indexer(dep_eventos_df['idEvento'])
+    contadas = mascaras[posicoes] != 0
+    posicoes = posicoes[contadas]
+    mascara = mascaras[posicoes]
 
-def calcula_var_10(proposicoes_df, ind_legis_df):
-    """
-    Função que calcula a variável 'Var10' (Emendas às MPs) e faz a junção com o DataFrame ind_legis.
-    """
-    prov = proposicoes_df[(proposicoes_df['siglaTipo'] == "EMP") & (proposicoes_df['descricaoTipo'].str.contains("MPV"))]
-    prov = prov.groupby(['legislat', 'idDeputadoAutor']).size().reset_index(name='emendas.mp')
-    prov = prov.rename(columns={'idDeputadoAutor': 'idDeputado'})
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    return ind_legis_df
+    prov = pd.DataFrame({
+        'legislat': indice_eventos['legislat'].to_numpy()[posicoes],
+        'idDeputado': dep_eventos_df['idDeputado'].to_numpy()[contadas],
+    })
+    for coluna in colunas:
+        prov[coluna] = (mascara & bit_categoria_evento(coluna)) != 0
 
+    return prov.groupby(['legislat', 'idDeputado'])[colunas].sum().reset_index()
 
-def calcula_var_11(proposicoes_df, ind_legis_df):
+def classificar_por_valor(valores, classificar):
     """
-    Função que calcula a variável 'Var11' (Emendas às LOA) e faz a junção com o DataFrame ind_legis.
-    """
-    prov = proposicoes_df[proposicoes_df['siglaTipo'].isin(["EMO", "EML"])]
-    prov = prov.groupby(['legislat', 'idDeputadoAutor']).size().reset_index(name='emendas.loa')
-    prov = prov.rename(columns={'idDeputadoAutor': 'idDeputado'})
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    return ind_legis_df
+    Classifica uma coluna com poucos valores distintos: classificar é chamada uma única
+    vez, sobre os valores distintos (como texto), e o resultado é espalhado de volta
+    pelas linhas através dos códigos categóricos. Valores nulos ficam com False.
 
+    Parâmetros:
+    - valores: Series a classificar.
+    - classificar: Função que recebe uma Series de textos e devolve uma Series booleana.
 
-def calcula_var_12(proposicoes_df, ind_legis_df):
-    """
-    Função que calcula a variável 'Var12' (Projeto com status especial) e faz a junção com o DataFrame ind_legis.
+    Retorna:
+    - Array booleano com uma posição por linha de valores.
     """
-    prov = proposicoes_df[(proposicoes_df['siglaTipo'].isin(["PDL", "PEC", "PL", "PLP", "PLV"])) & (proposicoes_df['ultimoStatus_regime'].str.contains(r"^Especial$|202"))]
-    prov = prov.groupby(['legislat', 'idDeputadoAutor']).size().reset_index(name='proj.especial')
-    prov = prov.rename(columns={'idDeputadoAutor': 'idDeputado'})
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-
-    ind_legis_df = ind_legis_df.round(0).astype(int)
+    categorias = valores if isinstance(valores.dtype, pd.CategoricalDtype) else valores.astype('category')
+    distintos = pd.Series(categorias.cat.categories.astype(str))
+    resultado = np.append(classificar(distintos).to_numpy(dtype=bool), False)
+    return resultado[categorias.cat.codes.to_numpy()]
 
-    return ind_legis_df
-
-
-def calcula_var_13(cargos_deputados_df, ind_legis_df):
+def calcula_var_13(cargos_deputados_df):
     """
-    Função que calcula a variável 'Var13' (Cargos ocupados) e faz a junção com o DataFrame ind_legis.
+    Função que calcula a variável 'Var13' (Cargos ocupados).
 
     Parâmetros:
     - cargos_deputados_df: DataFrame contendo os cargos dos deputados.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
 
     Retorna:
-    - DataFrame combinado com a variável calculada.
+    - DataFrame com legislat, idDeputado e a pontuação dos cargos.
     """
     # Filtrar e processar os cargos
     prov = cargos_deputados_df[~cargos_deputados_df['nomeOrgao'].isin(
         ["CONGRESSO NACIONAL", "Plenário", "Plenário Comissão Geral", "CÂMARA DOS DEPUTADOS", "Bancada de "]
     )].copy()
 
-    prov['idDeputadoAutor'] = pd.to_numeric(prov['id.deputado'], errors='coerce')
-    prov = prov.drop(columns=['id.deputado'])
-    prov['legislat'] = prov['legislat'].astype(str)
-    prov.to_csv("/tmp/ind_legis_df_atualizado_13-prov-1.csv", index=False)
+    prov = prov.rename(columns={'id.deputado': 'idDeputadoAutor'})
 
     # Peso 2 para presidente
     prov['cargos'] = np.where(prov['cargo'] == 'Presidente', 2, 1)
-    prov.to_csv("/tmp/ind_legis_df_atualizado_13-prov-2.csv", index=False)
-
-    # Atualizar a pontuação com base nas comissões
-    prov['nomePublicacaoOrgao'] = prov['nomePublicacaoOrgao'].astype(str)
-    # Atualizar a pontuação com base nas comissões usando expressões regulares
-    prov['nomePublicacaoOrgao'] = prov['nomePublicacaoOrgao'].str.  lower()    
-    prov['cargos'] = prov.apply(
-        lambda row: 2 if pd.notna(row['nomePublicacaoOrgao']) and 
-        not re.search(r'^comissão especial|comissão especial|cpi', row['nomePublicacaoOrgao']) and
-        re.search(r'^comissão | comissão', row['nomePublicacaoOrgao']) 
-        else row['cargos'], axis=1
-    )
+
+    # Atualizar a pontuação com base nas comissões (peso 2 para comissões que não são especiais nem CPI),
+    # classificando cada nome de órgão uma única vez
+    comissao = classificar_por_valor(prov['nomePublicacaoOrgao'], lambda nomes: (
+        nomes.str.lower().str.contains(r'^comissão | comissão') &
+        ~nomes.str.lower().str.contains(r'^comissão especial|comissão especial|cpi')
+    ))
+    prov['cargos'] = np.where(comissao, 2, prov['cargos'])
 
 
     # Agrupar por deputado e legislatura, somando a pontuação
     prov = prov.groupby(['legislat', 'idDeputadoAutor']).agg({'cargos': 'sum'}).reset_index()
     prov = prov.rename(columns={'idDeputadoAutor': 'idDeputado'})
-    prov['legislat'] = prov['legislat'].astype('int64')
-    prov.to_csv("/tmp/ind_legis_df_atualizado_13-prov-3.csv", index=False)
-    # Fazer a junção com ind_legis_df
-    ind_legis_df = ind_legis_df.merge(prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-
-    ind_legis_df = ind_legis_df.round(0).astype(int)
-
-    return ind_legis_df
+    return prov
 
-def calcula_var_14(eventos_df, requer_eventos_df, proposicoes_df, ind_legis_df):
+def requerimentos_de_audiencias(indice_eventos, requer_eventos_df):
     """
-    Função que calcula a variável 'Var14' (Requerimentos de Audiência Pública) e faz a junção com o DataFrame ind_legis.
+    Requerimentos ligados a eventos de Audiência Pública (uma linha por ligação evento-requerimento).
     
     Parâmetros:
-    - eventos_df: DataFrame contendo os eventos legislativos.
+    - indice_eventos: Índice dos eventos (ver indexar_eventos).
     - requer_eventos_df: DataFrame contendo os requerimentos dos eventos.
-    - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
     
     Retorna:
-    - DataFrame combinado com o cálculo dos requerimentos de Audiência Pública.
+    - DataFrame com a coluna idRequerimento.
     """
 
-    # Filtrar eventos que são audiências públicas
-    prov = eventos_df[eventos_df['descricaoTipo'].isin(["Audiência Pública", "Audiência Pública e Deliberação"])]
-    prov = prov[['id', 'legislat']].rename(columns={'id': 'idEvento'})
+    # Eventos que são audiências públicas, pela máscara do índice
+    audiencias = indice_eventos.index[(indice_eventos['mascara'].to_numpy() & bit_categoria_evento('audiencia')) != 0]
+    prov = requer_eventos_df[requer_eventos_df['idEvento'].isin(audiencias)]
+    return prov.loc[prov['idRequerimento'].notnull(), ['idRequerimento']]
 
-    # Juntar com os requerimentos dos eventos
-    prov = pd.merge(prov, requer_eventos_df, on="idEvento", how='left')
-    prov = prov[prov['idRequerimento'].notnull()]
+def autores_de_requerimentos(proposicoes_df):
+    """
+    Autores e legislatura das proposições do tipo REQ.
+    
+    Parâmetros:
+    - proposicoes_df: DataFrame contendo as proposições legislativas.
+    
+    Retorna:
+    - DataFrame com idRequerimento, legislat.req e idDeputado.
+    """
 
     # Filtrar proposições do tipo REQ
     proposicoes_req = proposicoes_df[proposicoes_df['siglaTipo'] == 'REQ']
-    proposicoes_req = proposicoes_req[['id.proposicao', 'siglaTipo', 'legislat', 'idDeputadoAutor']].rename(
+    return proposicoes_req[['id.proposicao', 'legislat', 'idDeputadoAutor']].rename(
         columns={'id.proposicao': 'idRequerimento', 'legislat': 'legislat.req', 'idDeputadoAutor': 'idDeputado'}
     )
 
-    # Juntar com os requerimentos
-    prov = pd.merge(prov, proposicoes_req, on="idRequerimento", how='left')
-    prov = prov[prov['idDeputado'].notnull()]
-
-    # Agrupar por legislatura e deputado
-    prov = prov.groupby(['idDeputado', 'legislat.req']).size().reset_index(name='aud.publ')
-    prov = prov.rename(columns={'legislat.req': 'legislat'})
-    prov['legislat'] = prov['legislat'].astype('int64')
-    ind_legis_df['legislat'] = ind_legis_df['legislat'].astype('int64')
-
-    # Juntar com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-
-    return ind_legis_df
-
-def calcula_var_15(eventos_df, dep_eventos_df, ind_legis_df):
+def calcula_var_14(audiencias_df, requerimentos_df):
     """
-    Função que calcula a variável 'Var15' (Reuniões e eventos técnicos) e faz a junção com o DataFrame ind_legis.
+    Função que calcula a variável 'Var14' (Requerimentos de Audiência Pública).
     
     Parâmetros:
-    - eventos_df: DataFrame contendo os eventos legislativos.
-    - dep_eventos_df: DataFrame contendo a presença dos deputados nos eventos.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
+    - audiencias_df: Requerimentos ligados a audiências públicas (ver requerimentos_de_audiencias).
+    - requerimentos_df: Autores dos requerimentos (ver autores_de_requerimentos).
     
     Retorna:
-    - DataFrame combinado com o cálculo de reuniões e eventos técnicos.
+    - DataFrame com legislat, idDeputado e o número de requerimentos de Audiência Pública.
     """
 
-    # Filtrar eventos técnicos
-    prov = eventos_df[eventos_df['descricaoTipo'].isin(["Evento Técnico", "Reunião Técnica", "Visita Técnica"])]
-    prov = prov[['legislat', 'id']].rename(columns={'id': 'idEvento'})
-    prov['event.tecnico'] = 1
-
-    # Juntar com a presença dos deputados nos eventos
-    prov = pd.merge(dep_eventos_df, prov, on='idEvento', how='left')
-
-    # Filtrar os eventos técnicos
-    prov = prov[prov['event.tecnico'] == 1]
+    # Juntar com os requerimentos
+    prov = pd.merge(audiencias_df, requerimentos_df, on="idRequerimento", how='left')
+    prov = prov[prov['idDeputado'].notnull()]
 
     # Agrupar por legislatura e deputado
-    prov = prov.groupby(['legislat', 'idDeputado']).size().reset_index(name='event.tecnico')
-
-    # Juntar com o DataFrame ind_legis
-    prov['legislat'] = prov['legislat'].astype('int64')
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-
-    return ind_legis_df
+    prov = prov.groupby(['idDeputado', 'legislat.req']).size().reset_index(name='aud.publ')
+    return prov.rename(columns={'legislat.req': 'legislat'})
 
-def calcula_var_16_17_18(proposicoes_df, ind_legis_df):
+def calcula_var_16_17_18(proposicoes_df):
     """
     Função que calcula as variáveis 'Var16' (Requerimentos de Fiscalização), 'Var17' (Convocação de Autoridades)
-    e 'Var18' (Requerimentos de CPI) e faz a junção com o DataFrame ind_legis.
+    e 'Var18' (Requerimentos de CPI).
 
     Parâmetros:
     - proposicoes_df: DataFrame contendo as proposições legislativas.
-    - ind_legis_df: DataFrame contendo o índice legislativo.
 
     Retorna:
-    - DataFrame combinado com as variáveis calculadas.
+    - DataFrame com legislat, idDeputado e as variáveis calculadas.
     """
-    # Criar colunas para identificar os diferentes tipos de requerimentos
-    proposicoes_df['req.fisc'] = proposicoes_df['descricaoTipo'].apply(lambda x: 1 if re.search('Proposta de Fiscalização e Controle', str(x)) else 0)
-    proposicoes_df['req.conv'] = proposicoes_df['descricaoTipo'].apply(lambda x: 1 if re.search('Ministro de Estado no Plenário|Ministro de Estado na Comissão|Convocação de Autoridade', str(x)) else 0)
-    proposicoes_df['req.cpi'] = proposicoes_df['descricaoTipo'].apply(lambda x: 1 if re.search('Comissão Parlamentar de Inquérito|Convocação em CPI|Instituição de CPI', str(x)) else 0)
+    # Criar colunas para identificar os diferentes tipos de requerimentos (cada descricaoTipo é classificada uma única vez)
+    descricao_tipo = proposicoes_df['descricaoTipo']
+    proposicoes_df['req.fisc'] = classificar_por_valor(descricao_tipo, lambda tipos: tipos.str.contains('Proposta de Fiscalização e Controle')).astype(int)
+    proposicoes_df['req.conv'] = classificar_por_valor(descricao_tipo, lambda tipos: tipos.str.contains('Ministro de Estado no Plenário|Ministro de Estado na Comissão|Convocação de Autoridade')).astype(int)
+    proposicoes_df['req.cpi'] = classificar_por_valor(descricao_tipo, lambda tipos: tipos.str.contains('Comissão Parlamentar de Inquérito|Convocação em CPI|Instituição de CPI')).astype(int)
 
     # Selecionar as colunas relevantes e garantir que sejam únicas
     prov = proposicoes_df[['id.proposicao', 'legislat', 'idDeputadoAutor', 'req.fisc', 'req.conv', 'req.cpi']].drop_duplicates()
@@ -1076,120 +1596,343 @@ def calcula_var_16_17_18(proposicoes_df, ind_legis_df):
     prov = prov.groupby(['legislat', 'idDeputadoAutor']).agg({'req.fisc': 'sum', 'req.conv': 'sum', 'req.cpi': 'sum'}).reset_index()
 
     # Renomear a coluna idDeputadoAutor para idDeputado
-    prov = prov.rename(columns={'idDeputadoAutor': 'idDeputado'})
-
-    # Juntar com o DataFrame ind_legis
-    ind_legis_df = pd.merge(ind_legis_df, prov, on=['legislat', 'idDeputado'], how='left')
-    ind_legis_df = ind_legis_df.fillna(0)
-    ind_legis_df = ind_legis_df.round(0).astype(int)
+    return prov.rename(columns={'idDeputadoAutor': 'idDeputado'})
 
-    return ind_legis_df
-
-def calcula_var_19(votacoes_df, dep_votacoes_df, ind_legis_df):
+def calcula_var_19(somas_desvio_df):
     """
-    Função que calcula a variável 'Var 19' (desvio e alinhamento em relação à maioria) 
-    e faz a junção com o DataFrame ind_legis_df.
+    Função que calcula a variável 'Var 19' (desvio e alinhamento em relação à maioria).
     
     Parâmetros:
-    - votacoes_df: DataFrame contendo as votações.
-    - dep_votacoes_df: DataFrame contendo os votos dos deputados.
-    - ind_legis_df: DataFrame com o índice legislativo.
+    - somas_desvio_df: DataFrame com a soma e a contagem dos desvios de cada deputado em
+      relação ao partido nas votações de plenário (ver somar_desvios).
     
     Retorna:
-    - DataFrame ind_legis_df atualizado com os valores de 'desv.voto' e 'align.voto'.
+    - DataFrame com legislat, idDeputado, 'desv.voto' e 'align.voto'.
     """
+    prov = somas_desvio_df.groupby(['legislat', 'idDeputado'])[['sum', 'count']].sum().reset_index()
+    prov['desv.voto'] = prov['sum'] / prov['count']
+    prov['align.voto'] = 1 - prov['desv.voto']
+    return prov[['legislat', 'idDeputado', 'desv.voto', 'align.voto']]
 
-    # Filtrar apenas votações no plenário
-    prov_votacoes = votacoes_df[votacoes_df['siglaOrgao'] == 'PLEN'].copy()
+def calcula_orientacao_lider(somas_orientacao_df):
+    """
+    Função que calcula a variável opcional 'orient.lider' (fidelidade à orientação da bancada).
+    
+    Parâmetros:
+    - somas_orientacao_df: DataFrame com a soma e a contagem dos votos que seguiram a
+      orientação da bancada (ver somar_orientacao).
     
-    # Selecionar colunas relevantes
-    prov_votacoes = prov_votacoes[['id', 'data', 'idEvento', 'aprovacao', 'votosSim', 'votosNao', 'votosOutros']].copy()
-    prov_votacoes = prov_votacoes.astype(str)  # Converter tudo para string
-    prov_votacoes = prov_votacoes.rename(columns={'id': 'idVotacao'})  # Renomear a coluna 'id' para 'idVotacao'
-    # Juntar com os dados de votos dos deputados
-    prov_votos = dep_votacoes_df[['idVotacao', 'deputado_idLegislatura', 'deputado_id', 'deputado_nome', 'deputado_siglaPartido', 'voto']].copy()
+    Retorna:
+    - DataFrame com legislat, idDeputado e 'orient.lider' (fração dos votos orientados que seguiram a orientação).
+    """
+    prov = somas_orientacao_df.groupby(['legislat', 'idDeputado'])[['sum', 'count']].sum().reset_index()
+    prov['orient.lider'] = prov['sum'] / prov['count']
+    return prov[['legislat', 'idDeputado', 'orient.lider']]
 
-    # Fazer o merge dos dados de votos dos deputados com os dados de votações
-    prov = prov_votos.merge(prov_votacoes, on='idVotacao', how='left')
+def montar_indice(ind_legis_df, variaveis):
+    """
+    Monta o índice legislativo com todas as variáveis de uma vez. As variáveis são
+    espalhadas, pela posição da chave (legislat, idDeputado), numa matriz numérica
+    alocada uma única vez, e o DataFrame final é criado no fim, em vez de uma junção
+    (e uma cópia da tabela inteira) por variável.
 
-    # Filtrar apenas votações com idEvento (votações no plenário)
-    prov = prov[prov['idEvento'].notna()].copy()
+    Parâmetros:
+    - ind_legis_df: DataFrame com legislat, idDeputado e meses (ver criar_indice_legislativo).
+    - variaveis: Lista de DataFrames, cada um com legislat, idDeputado e uma ou mais
+      colunas de valores (saídas das funções calcula_var_*).
 
-    # Transformar votos em valores numéricos (1 para 'Sim', 0 para os outros)
-    prov['voto'] = prov['voto'].apply(lambda x: 1 if x == 'Sim' else 0)
+    Retorna:
+    - DataFrame ind_legis com uma coluna por variável; deputados sem valor numa variável ficam com 0.
+    """
+    chaves = ['legislat', 'idDeputado']
+    indice = pd.MultiIndex.from_frame(ind_legis_df[chaves])
+    colunas = [coluna for prov in variaveis for coluna in prov.columns if coluna not in chaves]
+    matriz = np.zeros((len(indice), len(colunas)))
 
-    # Agrupar por legislatura, votação e partido e calcular a média dos votos
-    prov['deputado_idLegislatura'] = prov['deputado_idLegislatura'].astype(str)
-    prov['voto.part'] = prov.groupby(['deputado_idLegislatura', 'idVotacao', 'deputado_siglaPartido'])['voto'].transform('mean')
+    inicio = 0
+    inteiras = []
+    for prov in variaveis:
+        prov = prov.dropna(subset=chaves)
+        valores = prov.drop(columns=chaves)
+        inteiras += [coluna for coluna in valores.columns if pd.api.types.is_integer_dtype(valores[coluna])]
+        posicoes = indice.get_indexer(pd.MultiIndex.from_frame(prov[chaves].astype('int64')))
+        encontradas = posicoes >= 0
+        matriz[posicoes[encontradas], inicio:inicio + valores.shape[1]] = valores.to_numpy(dtype=float)[encontradas]
+        inicio += valores.shape[1]
 
-    # Calcular o desvio do voto do deputado em relação à média do partido
-    prov['desv.voto'] = abs(prov['voto'] - prov['voto.part'])
+    valores = pd.DataFrame(matriz, columns=colunas, index=ind_legis_df.index)
+    valores[inteiras] = valores[inteiras].astype('int64')
+    return pd.concat([ind_legis_df, valores], axis=1)
 
-    # Agrupar por legislatura e deputado para calcular o desvio médio
-    prov_desvio = prov.groupby(['deputado_idLegislatura', 'deputado_id']).agg({'desv.voto': 'mean'}).reset_index()
 
-    # Renomear colunas e calcular o alinhamento
-    prov_desvio = prov_desvio.rename(columns={'deputado_id': 'idDeputado', 'deputado_idLegislatura': 'legislat'})
-    prov_desvio['align.voto'] = 1 - prov_desvio['desv.voto']
+# Agregados parciais por ano. Cada ano é uma partição: as contagens por (legislat, idDeputado)
+# daquele ano são guardadas em disco junto com os checksums dos arquivos do ano, e só são
+# recalculadas quando algum desses arquivos muda. As partições são somadas a cada execução;
+# normalização e ordenação continuam sendo feitas sobre o índice inteiro. Mudanças nas
+# definições (ver assinatura_definicoes) já invalidam as partições; versao_particoes só
+# precisa aumentar quando muda o código do cálculo em si.
+versao_particoes = 5
+pasta_particoes = "particoes"
 
-    # Garantir que a coluna 'legislat' seja string em ambos os DataFrames
-    prov_desvio['legislat'] = prov_desvio['legislat'].astype(str)
+def caminho_particao(ano, pasta_temp="temp"):
+    """
+    Retorna o caminho do arquivo com os agregados parciais de um ano.
+    """
+    return os.path.join(pasta_temp, pasta_particoes, f"agregados-{ano}.pkl")
 
-    ind_legis_df['legislat'] = ind_legis_df['legislat'].astype(str)
+def assinatura_definicoes():
+    """
+    Resumo (SHA-256) das definições usadas no cálculo das partições: esquemas dos
+    datasets, variáveis de proposições (pelo código-fonte dos predicados), categorias
+    de eventos e o padrão de palavras-chave das ementas.
+    """
+    predicados = [eh_projeto, descricao_mpv] + [predicado for _, predicado in variaveis_proposicoes]
+    definicoes = {
+        'esquemas_datasets': esquemas_datasets,
+        'variaveis_proposicoes': [nome for nome, _ in variaveis_proposicoes],
+        'predicados': [inspect.getsource(predicado).strip() for predicado in predicados],
+        'tipos_projeto': tipos_projeto,
+        'categorias_eventos': categorias_eventos,
+        'padrao_palavras_chave': padrao_palavras_chave.pattern,
+    }
+    return hashlib.sha256(json.dumps(definicoes, sort_keys=True).encode()).hexdigest()
 
-    # Juntar o resultado com o DataFrame ind_legis_df
-    ind_legis_df = ind_legis_df.merge(prov_desvio, on=['legislat', 'idDeputado'], how='left')
-    return ind_legis_df
+def assinatura_particao(ano, pasta_temp="temp"):
+    """
+    Chave de validade da partição de um ano: muda quando algum arquivo do ano, as
+    definições do cálculo (assinatura_definicoes) ou versao_particoes mudam.
+    """
+    origens = {}
+    for nome_arquivo in datasets_anuais:
+        arquivo_csv = caminho_arquivo_csv(nome_arquivo, pasta_temp, str(ano))
+        origens[nome_arquivo] = checksum_origem(arquivo_csv, pasta_temp) if os.path.exists(arquivo_csv) else None
+    chave = {'versao': versao_particoes, 'definicoes': assinatura_definicoes(), 'origens': origens}
+    return hashlib.sha256(json.dumps(chave, sort_keys=True).encode()).hexdigest()
 
-def normaliza_indice(ind_legis):
+def calcular_agregados_ano(ano, pasta_temp="temp", em_blocos=None):
     """
-    Função que processa o DataFrame ind_legis, substitui NAs, ajusta a pontuação por tempo de mandato,
-    aplica transformações logarítmicas e normaliza os dados.
-    
+    Calcula os agregados parciais de um ano a partir apenas dos arquivos daquele ano.
+
     Parâmetros:
-    - ind_legis: DataFrame contendo os dados do índice legislativo.
+    - ano: Ano da partição.
+    - pasta_temp: Diretório onde os arquivos CSV são salvos (padrão: 'temp').
+    - em_blocos: Agrega os votos em blocos (padrão: agregar_votos_em_blocos).
 
     Retorna:
-    - DataFrame processado com as transformações aplicadas.
+    - Dicionário com:
+      - meses: idDeputado, legislat e número de meses com atividade no ano.
+      - contagens: {nome da variável: DataFrame com legislat, idDeputado e contagens}.
+      - audiencias e requerimentos: tabelas de ligação da Var14, juntadas só na combinação,
+        pois uma audiência pode citar um requerimento de outro ano.
+      - desvios: soma e contagem dos desvios de voto (Var19).
+      - orientacao: soma e contagem dos votos que seguiram a orientação da bancada.
+    """
+    proposicoes_df = processar_proposicoes(pegar_proposicoes(ano, ano, pasta_temp),
+                                           pegar_temas_proposicoes(ano, ano, pasta_temp),
+                                           pegar_autores_proposicoes(ano, ano, pasta_temp), pasta_temp)
+    eventos_df = pegar_eventos(ano, ano, pasta_temp)
+    dep_eventos_df = pegar_presenca_eventos_deputados(ano, ano, pasta_temp)
+    requer_eventos_df = pegar_requerimentos_eventos(ano, ano, pasta_temp)
+    votacoes_df = pegar_votacoes(ano, ano, pasta_temp)
+    orientacoes_df = pegar_votacoes_orientacoes(ano, ano, pasta_temp)
+    em_blocos = agregar_votos_em_blocos if em_blocos is None else em_blocos
+    agregar = agregar_votos_deputados if em_blocos else agregar_votos_em_memoria
+    votos_mensais_df, desvios_df, orientacao_df = agregar(votacoes_df, orientacoes_df, ano, ano, pasta_temp)
+
+    indice_eventos = indexar_eventos(eventos_df)
+    contagens = {
+        'var_proposicoes': calcular_variaveis_proposicoes(proposicoes_df),
+        'var_eventos': contar_presencas_eventos(indice_eventos, dep_eventos_df),
+        'var_16_18': calcula_var_16_17_18(proposicoes_df),
+    }
+    return {
+        # criar_indice_legislativo altera dep_eventos_df, por isso vem depois das contagens
+        'meses': criar_indice_legislativo(dep_eventos_df, votos_mensais_df),
+        'contagens': contagens,
+        'audiencias': requerimentos_de_audiencias(indice_eventos, requer_eventos_df),
+        'requerimentos': autores_de_requerimentos(proposicoes_df),
+        'desvios': desvios_df,
+        'orientacao': orientacao_df,
+    }
+
+def pegar_particao_ano(ano, pasta_temp="temp", em_blocos=None):
+    """
+    Retorna os agregados parciais de um ano, lendo a partição salva se os arquivos do ano
+    não mudaram desde que ela foi calculada, ou recalculando (e salvando) caso contrário.
+
+    Parâmetros:
+    - ano: Ano da partição.
+    - pasta_temp: Diretório onde os arquivos CSV são salvos (padrão: 'temp').
+    - em_blocos: Agrega os votos em blocos (padrão: agregar_votos_em_blocos).
+
+    Retorna:
+    - Dicionário de agregados (ver calcular_agregados_ano).
+    """
+    caminho = caminho_particao(ano, pasta_temp)
+    assinatura = assinatura_particao(ano, pasta_temp)
+    if os.path.exists(caminho):
+        try:
+            particao = pd.read_pickle(caminho)
+            if particao.get('assinatura') == assinatura:
+                print(f"Arquivos de {ano} sem mudanças, usando os agregados salvos")
+                return particao
+        except Exception as e:
+            # Qualquer falha de leitura (arquivo truncado, pickle de outra versão...) só obriga a recalcular
+            print(f"Partição inválida, refazendo: {caminho} ({str(e)})")
+
+    print(f"Calculando os agregados de {ano}...")
+    particao = calcular_agregados_ano(ano, pasta_temp, em_blocos)
+    particao['assinatura'] = assinatura
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    arquivo_parcial = f"{caminho}.{os.getpid()}.tmp"
+    pd.to_pickle(particao, arquivo_parcial)
+    os.replace(arquivo_parcial, caminho)
+    return particao
+
+def combinar_particoes(*particoes):
+    """
+    Soma os agregados parciais de todos os anos por (legislat, idDeputado).
+
+    Parâmetros:
+    - particoes: Agregados de cada ano (ver pegar_particao_ano).
+
+    Retorna:
+    - Tupla (ind_legis_df, var_proposicoes_df, var_eventos_df, var_14_df, var_16_18_df, var_19_df,
+      var_orientacao_df).
+    """
+    chaves = ['legislat', 'idDeputado']
+
+    def juntar(extrair):
+        return pd.concat([extrair(particao) for particao in particoes], ignore_index=True)
+
+    def somar(nome):
+        return juntar(lambda particao: particao['contagens'][nome]).groupby(chaves).sum().reset_index()
+
+    # os meses de anos diferentes são distintos, então a soma por ano é a contagem de meses da legislatura
+    ind_legis_df = juntar(lambda particao: particao['meses']).groupby(['idDeputado', 'legislat'])['meses'].sum().reset_index()
+    var_14_df = calcula_var_14(juntar(lambda particao: particao['audiencias']), juntar(lambda particao: particao['requerimentos']))
+    var_19_df = calcula_var_19(juntar(lambda particao: particao['desvios']))
+    var_orientacao_df = calcula_orientacao_lider(juntar(lambda particao: particao['orientacao']))
+
+    return (ind_legis_df, somar('var_proposicoes'), somar('var_eventos'), var_14_df,
+            somar('var_16_18'), var_19_df, var_orientacao_df)
+
+# Colunas corrigidas pelo tempo de mandato e colunas que ganham uma versão em log
+colunas_ajuste_mandato = [
+    "proj.relev.prot", "proj.n.relev.prot", "proj.relev.n.prot", 
+    "proj.n.relev.n.prot", "voto.separado", "substitutivos", "relatorias", 
+    "pres.plenario", "emendas.plenario", "emendas.mp", "emendas.loa", "cargos", 
+    "proj.especial", "aud.publ", "event.tecnico", "req.fisc", "req.conv", "req.cpi"
+]
+colunas_log = [
+    "proj.relev.prot", "proj.n.relev.prot", "proj.relev.n.prot", "proj.n.relev.n.prot", 
+    "voto.separado", "substitutivos", "relatorias", "pres.plenario", "emendas.plenario", 
+    "emendas.mp", "proj.especial", "emendas.loa", "cargos", "aud.publ", "event.tecnico", 
+    "req.fisc", "req.conv", "req.cpi", "desv.voto", "align.voto"
+]
+
+# Mínimos e máximos de cada variável por legislatura, usados na última normalização
+arquivo_estatisticas_normalizacao = "estatisticas_normalizacao.pkl"
+
+def transformar_variaveis(ind_legis):
+    """
+    Substitui NAs, ajusta a pontuação por tempo de mandato e acrescenta as versões em log
+    das variáveis, sobre o bloco de colunas inteiro de uma vez.
+
+    Parâmetros:
+    - ind_legis: DataFrame com legislat, idDeputado, meses e as variáveis brutas (um ou mais deputados).
+
+    Retorna:
+    - DataFrame com as variáveis transformadas, ainda não normalizadas.
     """
 
     # Substituímos NAs por 0
     ind_legis = ind_legis.fillna(0)
 
     # Corrigimos a pontuação por tempo de mandato
-    colunas_ajuste_mandato = [
-        "proj.relev.prot", "proj.n.relev.prot", "proj.relev.n.prot", 
-        "proj.n.relev.n.prot", "voto.separado", "substitutivos", "relatorias", 
-        "pres.plenario", "emendas.plenario", "emendas.mp", "emendas.loa", "cargos", 
-        "proj.especial", "aud.publ", "event.tecnico", "req.fisc", "req.conv", "req.cpi"
-    ]
-    
-    for coluna in colunas_ajuste_mandato:
-        ind_legis[coluna] = ind_legis[coluna] / (ind_legis['meses'] / 12)
+    ind_legis[colunas_ajuste_mandato] = ind_legis[colunas_ajuste_mandato].div(ind_legis['meses'] / 12, axis=0)
 
     # Aplicamos logarítimo às variáveis selecionadas
-    colunas_log = [
-        "proj.relev.prot", "proj.n.relev.prot", "proj.relev.n.prot", "proj.n.relev.n.prot", 
-        "voto.separado", "substitutivos", "relatorias", "pres.plenario", "emendas.plenario", 
-        "emendas.mp", "proj.especial", "emendas.loa", "cargos", "aud.publ", "event.tecnico", 
-        "req.fisc", "req.conv", "req.cpi", "desv.voto", "align.voto"
-    ]
+    logs = np.log(ind_legis[colunas_log] + 0.00001).add_suffix('.log')
+    return pd.concat([ind_legis, logs], axis=1)
+
+def colunas_normalizadas(ind_legis):
+    """
+    Colunas normalizadas por legislatura: todas menos os identificadores e os meses.
+    """
+    return ind_legis.columns.difference(['idDeputado', 'legislat', 'meses'])
+
+def normalizar(ind_legis, estatisticas):
+    """
+    Aplica (x - mínimo) / (máximo - mínimo) com os mínimos e máximos da legislatura de
+    cada linha; variáveis constantes na legislatura ficam com 0.
+    """
+    colunas = estatisticas['min'].columns
+    minimos = estatisticas['min'].reindex(ind_legis['legislat']).to_numpy()
+    maximos = estatisticas['max'].reindex(ind_legis['legislat']).to_numpy()
+    ind_legis = ind_legis.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ind_legis[colunas] = (ind_legis[colunas].to_numpy() - minimos) / (maximos - minimos)
+    return ind_legis.fillna(0)
+
+def carregar_estatisticas_normalizacao(pasta_temp="temp"):
+    """
+    Lê os mínimos e máximos por legislatura gravados pela última normalização.
+
+    Retorna:
+    - DataFrame indexado por legislat, com colunas ('min', variável) e ('max', variável).
+    """
+    return pd.read_pickle(os.path.join(pasta_temp, arquivo_estatisticas_normalizacao))
+
+def normaliza_indice(ind_legis, pasta_temp="temp"):
+    """
+    Função que processa o DataFrame ind_legis, substitui NAs, ajusta a pontuação por tempo de mandato,
+    aplica transformações logarítmicas e normaliza os dados.
+
+    Os mínimos e máximos de cada variável por legislatura são calculados com um único
+    groupby sobre o bloco de colunas e gravados em pasta_temp, para que normalizar_deputado
+    possa pontuar um deputado sem refazer a normalização de todos.
     
-    for coluna in colunas_log:
-        ind_legis[coluna + ".log"] = np.log(ind_legis[coluna] + 0.00001)
+    Parâmetros:
+    - ind_legis: DataFrame contendo os dados do índice legislativo.
+    - pasta_temp: Diretório onde os mínimos e máximos são salvos (padrão: 'temp').
+
+    Retorna:
+    - DataFrame processado com as transformações aplicadas.
+    """
+    ind_legis = transformar_variaveis(ind_legis)
 
     # Normalizamos as variáveis por legislatura
-    colunas_a_normalizar = ind_legis.columns.difference(['idDeputado', 'legislat', 'meses'])
+    grupos = ind_legis.groupby('legislat')[colunas_normalizadas(ind_legis)]
+    estatisticas = pd.concat({'min': grupos.min(), 'max': grupos.max()}, axis=1)
 
-    # Normalização por legislatura
-    ind_legis = ind_legis.groupby('legislat', group_keys=False).apply(
-        lambda group: group.assign(**{col: (group[col] - group[col].min()) / (group[col].max() - group[col].min())
-                                      for col in colunas_a_normalizar})
-    )
+    os.makedirs(pasta_temp, exist_ok=True)
+    estatisticas.to_pickle(os.path.join(pasta_temp, arquivo_estatisticas_normalizacao))
 
-    # Substituímos NAs por 0 após a normalização
-    ind_legis = ind_legis.fillna(0)
-    return ind_legis
+    return normalizar(ind_legis, estatisticas)
+
+def normalizar_deputado(ind_legis_deputado, estatisticas):
+    """
+    Pontua um deputado com valores brutos atualizados, usando os mínimos e máximos
+    gravados pela última normalização (carregar_estatisticas_normalizacao), sem
+    renormalizar os demais.
+
+    Parâmetros:
+    - ind_legis_deputado: DataFrame com as linhas brutas do deputado (as colunas de montar_indice).
+    - estatisticas: Mínimos e máximos por legislatura.
+
+    Retorna:
+    - Tupla (linhas normalizadas, dentro_dos_limites). Se algum valor sai da faixa
+      [mínimo, máximo] da sua legislatura, os limites mudam e dentro_dos_limites é False:
+      nesse caso o índice inteiro precisa ser normalizado de novo (normaliza_indice).
+    """
+    transformado = transformar_variaveis(ind_legis_deputado)
+    colunas = estatisticas['min'].columns
+    valores = transformado[colunas].to_numpy()
+    minimos = estatisticas['min'].reindex(transformado['legislat']).to_numpy()
+    maximos = estatisticas['max'].reindex(transformado['legislat']).to_numpy()
+    dentro_dos_limites = bool(np.all((valores >= minimos) & (valores <= maximos)))
+    return normalizar(transformado, estatisticas), dentro_dos_limites
 
 def calcular_notas_dos_eixos(ind_legis_df):
     """
@@ -1270,6 +2013,7 @@ def ordenar_variaveis(ind_legis_df):
         'req.conv': 'v15.req.conv', 
         'req.cpi': 'v16.req.cpi',
         'align.voto': 'v17.align.voto',
+        'orient.lider': 'v18.orient.lider',
 
         # Eixos
         'eixo.legis': 'v1.eixo.legis', 
@@ -1316,15 +2060,22 @@ def adicionar_info_pessoais(ind_legis_df, deputados_df):
     Retorna:
     - DataFrame atualizado com as informações pessoais dos deputados.
     """
-    # Converter idDeputado para string em ambos os DataFrames
-    ind_legis_df['idDeputado'] = ind_legis_df['idDeputado'].astype(str)
-    deputados_df['idDeputado'] = deputados_df['idDeputado'].astype(str)
-    
     # Adiciona informações pessoais
     ind_legis_df = ind_legis_df.merge(deputados_df, on='idDeputado', how='left')
 
     return ind_legis_df
 
+# Colunas de pontuação do índice final, na ordem publicada; são as colunas escaladas por arredondar_valores
+colunas_score = [
+    'v01.proj.relev.prot.log', 'v02.proj.n.relev.prot.log', 'v03.proj.relev.n.prot.log',
+    'v04.voto.separado.log', 'v05.substitutivos.log', 'v06.pres.plenario.log',
+    'v07.emendas.plenario.log', 'v08.emendas.mp.log', 'v09.emendas.loa.log',
+    'v10.proj.especial.log', 'v11.cargos.log', 'v12.aud.publ.log', 'v13.event.tecnico.log',
+    'v14.req.fisc.log', 'v15.req.conv.log', 'v16.req.cpi.log', 'v17.align.voto.log',
+    'v1.eixo.legis.log', 'v2.eixo.mob.log', 'v3.eixo.fisc.log', 'v4.eixo.part', 'score_final.log'
+]
+colunas_score_opcionais = ['v18.orient.lider']
+
 def selecionar_variaveis(ind_legis_df):
     """
     Função que organiza e seleciona as variáveis do DataFrame final.
@@ -1339,15 +2090,10 @@ def selecionar_variaveis(ind_legis_df):
     # Ordena e seleciona variáveis
     final_ind_legis_df = ind_legis_df.sort_values(by=['legislat', 'meses'], ascending=[False, False]).copy()
 
-    final_ind_legis_df = final_ind_legis_df[[
-        'legislat', 'idDeputado', 'nome', 'nomeCivil', 'cpf', 'meses', 'siglaSexo',
-        'v01.proj.relev.prot.log', 'v02.proj.n.relev.prot.log', 'v03.proj.relev.n.prot.log',
-        'v04.voto.separado.log', 'v05.substitutivos.log', 'v06.pres.plenario.log',
-        'v07.emendas.plenario.log', 'v08.emendas.mp.log', 'v09.emendas.loa.log',
-        'v10.proj.especial.log', 'v11.cargos.log', 'v12.aud.publ.log', 'v13.event.tecnico.log',
-        'v14.req.fisc.log', 'v15.req.conv.log', 'v16.req.cpi.log', 'v17.align.voto.log',
-        'v1.eixo.legis.log', 'v2.eixo.mob.log', 'v3.eixo.fisc.log', 'v4.eixo.part', 'score_final.log'
-    ]]
+    final_ind_legis_df = final_ind_legis_df[
+        ['legislat', 'idDeputado', 'nome', 'nomeCivil', 'cpf', 'meses', 'siglaSexo'] + colunas_score +
+        [coluna for coluna in colunas_score_opcionais if coluna in final_ind_legis_df.columns]
+    ]
 
     return final_ind_legis_df
 
@@ -1355,6 +2101,9 @@ def arredondar_valores(ind_legis_df):
     """
     Função que arredonda os valores numéricos e os escala para uma faixa de 0 a 10.
 
+    Só as colunas de pontuação (colunas_score e as opcionais presentes) são escaladas,
+    todas de uma vez.
+
     Parâmetros:
     - final_ind_legis_df: DataFrame com as variáveis finais.
 
@@ -1364,7 +2113,8 @@ def arredondar_valores(ind_legis_df):
     ind_legis_df = ind_legis_df.copy()
 
     # Multiplica por 10 e arredonda para duas casas decimais
-    ind_legis_df = ind_legis_df.apply(lambda col: col.map(lambda x: round(x * 10, 2) if isinstance(x, (int, float)) else x))
+    colunas = [coluna for coluna in colunas_score + colunas_score_opcionais if coluna in ind_legis_df.columns]
+    ind_legis_df[colunas] = (ind_legis_df[colunas].astype(float) * 10).round(2)
     return ind_legis_df
 
 def renomear_e_filtrar(final_ind_legis_df, legislatura_atual=57):
@@ -1395,8 +2145,11 @@ def renomear_e_filtrar(final_ind_legis_df, legislatura_atual=57):
         print("Número de colunas no DataFrame não corresponde ao número de colunas a serem renomeadas")
         raise ValueError("Número de colunas no DataFrame não corresponde ao número de colunas a serem renomeadas")
 
+    # Variável opcional, fora dos eixos
+    final_ind_legis_df = final_ind_legis_df.rename(columns={'v18.orient.lider': 'variavel_18_score'})
+
     # Filtrar para a legislatura atual
-    final_ind_legis_atual = final_ind_legis_df[final_ind_legis_df['legislat'] == str(legislatura_atual)]
+    final_ind_legis_atual = final_ind_legis_df[final_ind_legis_df['legislat'] == legislatura_atual]
 
     return final_ind_legis_atual
 
@@ -1414,7 +2167,6 @@ def atribuir_estrelas(final_ind_legis_57):
     final_ind_legis_57.loc[(final_ind_legis_57['rank'] > score_st) & (final_ind_legis_57['rank'] <= score_st * 2.5), 'estrelas'] = 4
     final_ind_legis_57.loc[(final_ind_legis_57['rank'] > score_st * 2.5) & (final_ind_legis_57['rank'] <= score_st * 4.5), 'estrelas'] = 3
     final_ind_legis_57.loc[(final_ind_legis_57['rank'] > score_st * 4.5) & (final_ind_legis_57['rank'] <= score_st * 7.5), 'estrelas'] = 2
-    final_ind_legis_57.to_csv("/tmp/final_ind_legis_57-rank.csv", index=False)
 
     # Remove colunas temporárias
     final_ind_legis_57.drop(columns=['rank'], inplace=True)
@@ -1422,40 +2174,299 @@ def atribuir_estrelas(final_ind_legis_57):
     
     return final_ind_legis_57
 
+# Consultas à API de deputados: concorrência, limite de requisições por segundo, tentativas e timeout
+max_consultas_simultaneas = 8
+requisicoes_por_segundo_api = 25
+max_tentativas_api = 5
+timeout_api = (10, 30)
+
+class LimitadorTaxa:
+    """
+    Balde de fichas compartilhado entre as threads: libera até `taxa` requisições por
+    segundo, com rajadas de até `capacidade` requisições.
+    """
+
+    def __init__(self, taxa, capacidade=None):
+        self.taxa = taxa
+        self.capacidade = capacidade or taxa
+        self.fichas = self.capacidade
+        self.atualizado = time.monotonic()
+        self.trava = threading.Lock()
+
+    def aguardar(self):
+        """
+        Bloqueia até haver uma ficha disponível e a consome.
+        """
+        while True:
+            with self.trava:
+                agora = time.monotonic()
+                self.fichas = min(self.capacidade, self.fichas + (agora - self.atualizado) * self.taxa)
+                self.atualizado = agora
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return
+                espera = (1 - self.fichas) / self.taxa
+            time.sleep(espera)
+
+limitador_api = LimitadorTaxa(requisicoes_por_segundo_api)
+
+def consultar_api(url):
+    """
+    Faz um GET na API de dados abertos pela sessão HTTP compartilhada, respeitando o
+    limitador de taxa. Respostas 429 e 5xx e falhas de conexão são tentadas de novo,
+    esperando o Retry-After do servidor ou, sem ele, 1, 2, 4... segundos.
+
+    Parâmetros:
+    - url: URL da consulta.
+
+    Retorna:
+    - JSON da resposta, ou None se a consulta falhou.
+    """
+    for tentativa in range(1, max_tentativas_api + 1):
+        limitador_api.aguardar()
+        espera = None
+        try:
+            response = sessao_http.get(url, timeout=timeout_api)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code != 429 and response.status_code < 500:
+                print(f"Erro ao consultar a API: {response.status_code} - {url}")
+                return None
+            print(f"API respondeu {response.status_code}: {url}")
+            retry_after = response.headers.get('Retry-After', '')
+            espera = int(retry_after) if retry_after.isdigit() else None
+        except requests.RequestException as e:
+            print(f"Falha na conexão com {url}: {str(e)}")
+
+        if tentativa < max_tentativas_api:
+            time.sleep(espera if espera is not None else 2 ** (tentativa - 1))
+
+    print(f"Erro ao consultar a API depois de {max_tentativas_api} tentativas: {url}")
+    return None
+
+# Cache em disco (SQLite) das respostas da API de deputados. Uma resposta mais nova que
+# validade_cache_api é usada direto; até validade_maxima_cache_api é usada e revalidada em
+# segundo plano; mais velha que isso é consultada de novo. Acima de max_entradas_cache_api,
+# as entradas usadas há mais tempo são descartadas.
+arquivo_cache_api = os.path.join("temp", "cache_api.sqlite")
+validade_cache_api = 7 * 24 * 3600
+validade_maxima_cache_api = 90 * 24 * 3600
+max_entradas_cache_api = 10_000
+
+contadores_cache_api = {'acertos': 0, 'vencidos': 0, 'faltas': 0}
+trava_cache_api = threading.Lock()
+revalidacoes_api = {}
+executor_revalidacoes = None
+
+def abrir_cache_api():
+    """
+    Abre (criando, se preciso) o banco do cache de respostas da API.
+    """
+    os.makedirs(os.path.dirname(arquivo_cache_api) or ".", exist_ok=True)
+    conexao = sqlite3.connect(arquivo_cache_api, timeout=30)
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS respostas (
+            chave TEXT PRIMARY KEY, conteudo TEXT NOT NULL, gravado_em REAL NOT NULL, usado_em REAL NOT NULL
+        )""")
+    return conexao
+
+def ler_cache_api(chave):
+    """
+    Lê uma resposta do cache e marca o momento do uso (para o descarte LRU).
+
+    Retorna:
+    - Tupla (resposta, idade em segundos), ou None se a chave não está no cache.
+    """
+    conexao = abrir_cache_api()
+    try:
+        with conexao:
+            linha = conexao.execute("SELECT conteudo, gravado_em FROM respostas WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                return None
+            agora = time.time()
+            conexao.execute("UPDATE respostas SET usado_em = ? WHERE chave = ?", (agora, chave))
+        return json.loads(linha[0]), agora - linha[1]
+    finally:
+        conexao.close()
+
+def gravar_cache_api(chave, resposta):
+    """
+    Grava uma resposta no cache e descarta as menos usadas recentemente se o limite de entradas passou.
+    """
+    conexao = abrir_cache_api()
+    try:
+        with conexao:
+            agora = time.time()
+            conexao.execute("INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?)", (chave, json.dumps(resposta), agora, agora))
+            conexao.execute("""
+                DELETE FROM respostas WHERE chave NOT IN (
+                    SELECT chave FROM respostas ORDER BY usado_em DESC LIMIT ?
+                )""", (max_entradas_cache_api,))
+    finally:
+        conexao.close()
+
+def contar_cache_api(contador):
+    with trava_cache_api:
+        contadores_cache_api[contador] += 1
+
+def revalidar_cache_api(url):
+    """
+    Consulta a API de novo em segundo plano e atualiza o cache (uma revalidação por URL de cada vez).
+    """
+    global executor_revalidacoes
+
+    def revalidar():
+        resposta = consultar_api(url)
+        if resposta is not None:
+            gravar_cache_api(url, resposta)
+
+    with trava_cache_api:
+        if url in revalidacoes_api:
+            return
+        if executor_revalidacoes is None:
+            executor_revalidacoes = ThreadPoolExecutor(max_workers=max_consultas_simultaneas)
+        revalidacoes_api[url] = executor_revalidacoes.submit(revalidar)
+
+def aguardar_revalidacoes():
+    """
+    Espera as revalidações em segundo plano terminarem, para que o cache fique atualizado.
+    """
+    with trava_cache_api:
+        pendentes = list(revalidacoes_api.values())
+    wait(pendentes)
+    with trava_cache_api:
+        revalidacoes_api.clear()
+
+def consultar_api_com_cache(url, descricao):
+    """
+    GET na API passando pelo cache em disco: resposta nova é usada direto, vencida é
+    usada e revalidada em segundo plano, ausente (ou velha demais) é consultada.
+
+    Parâmetros:
+    - url: URL da consulta (também a chave do cache).
+    - descricao: O que está sendo consultado, para o log.
+
+    Retorna:
+    - JSON da resposta, ou None se não está no cache e a consulta falhou.
+    """
+    em_cache = ler_cache_api(url)
+    if em_cache is not None:
+        resposta, idade = em_cache
+        if idade <= validade_cache_api:
+            contar_cache_api('acertos')
+            return resposta
+        if idade <= validade_maxima_cache_api:
+            contar_cache_api('vencidos')
+            revalidar_cache_api(url)
+            return resposta
+
+    contar_cache_api('faltas')
+    print(f"Consultando na API: {descricao}")
+    resposta = consultar_api(url)
+    if resposta is not None:
+        gravar_cache_api(url, resposta)
+    return resposta
+
+def consultar_deputado(deputado_id):
+    """
+    Dados de um deputado na API (/deputados/{id}), passando pelo cache em disco.
+
+    Parâmetros:
+    - deputado_id: Id do deputado.
+
+    Retorna:
+    - JSON da resposta, ou None se não está no cache e a consulta falhou.
+    """
+    return consultar_api_com_cache(f"{url_api}/deputados/{deputado_id}", deputado_id)
+
 def pegar_sigla_uf_deputado(deputado_id):
-    url = f"https://dadosabertos.camara.leg.br/api/v2/deputados/{deputado_id}"
+    data = consultar_deputado(deputado_id)
+    if data is None:
+        return None
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            # Acessa o campo 'siglaUf' dentro de 'ultimoStatus'
-            sigla_uf = data['dados']['ultimoStatus']['siglaUf']
-            return sigla_uf
-        else:
-            print(f"Erro ao buscar dados: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"Erro ao fazer a requisição: {str(e)}")
+        # Acessa o campo 'siglaUf' dentro de 'ultimoStatus'
+        return data['dados']['ultimoStatus']['siglaUf']
+    except (KeyError, TypeError):
+        print(f"Erro: 'siglaUf' não encontrado para o deputado {deputado_id}")
         return None
 
+# Índices em memória de CSVs consultados por id, por (caminho, coluna de id, separador).
+# Cada índice guarda o mtime e o tamanho do arquivo e é refeito quando o arquivo muda.
+indices_csv = {}
+trava_indices_csv = threading.Lock()
+
+def carregar_indice_csv(caminho_csv, coluna_id='id.deputado', separador=','):
+    """
+    Lê o CSV uma única vez e o indexa pela coluna de id (como texto, mantendo a primeira
+    linha de cada id). Chamadas seguintes reaproveitam o índice enquanto o mtime e o
+    tamanho do arquivo não mudarem.
+
+    Parâmetros:
+    - caminho_csv: Caminho do CSV.
+    - coluna_id: Coluna com o id (padrão: 'id.deputado').
+    - separador: Separador do CSV (padrão: ',').
+
+    Retorna:
+    - DataFrame indexado pelo id.
+    """
+    estado = os.stat(caminho_csv)
+    versao = (estado.st_mtime_ns, estado.st_size)
+    chave = (os.path.abspath(caminho_csv), coluna_id, separador)
+    with trava_indices_csv:
+        registro = indices_csv.get(chave)
+        if registro is not None and registro[0] == versao:
+            return registro[1]
+
+        df = pd.read_csv(caminho_csv, sep=separador)
+        if coluna_id not in df.columns:
+            raise KeyError(f"A coluna '{coluna_id}' não existe no arquivo CSV.")
+        ids = df[coluna_id].astype(str)
+        indice = df.set_axis(pd.Index(ids, name=coluna_id))
+        indice = indice[~indice.index.duplicated()]
+        indices_csv[chave] = (versao, indice)
+        return indice
+
+def consultar_valores_no_csv(ids, caminho_csv, colunas=("siglaUf",), coluna_id='id.deputado', separador=','):
+    """
+    Busca, de uma vez, os valores de várias colunas para vários ids de um CSV, pelo
+    índice de carregar_indice_csv.
+
+    Parâmetros:
+    - ids: Ids a consultar.
+    - caminho_csv: Caminho do CSV.
+    - colunas: Colunas desejadas (padrão: siglaUf).
+    - coluna_id: Coluna com o id (padrão: 'id.deputado').
+    - separador: Separador do CSV (padrão: ',').
+
+    Retorna:
+    - DataFrame com uma linha por id (na ordem recebida) e uma coluna por coluna
+      pedida; nulo onde o id ou o valor não existe. Colunas ausentes do CSV são omitidas.
+    """
+    indice = carregar_indice_csv(caminho_csv, coluna_id, separador)
+    colunas = list(colunas)
+    ausentes = [coluna for coluna in colunas if coluna not in indice.columns]
+    if ausentes:
+        print(f"Colunas {ausentes} não existem no arquivo CSV.")
+    ids = pd.Index([str(deputado_id) for deputado_id in ids], name=coluna_id)
+    return indice.reindex(index=ids, columns=[coluna for coluna in colunas if coluna not in ausentes])
+
 def verificar_valor_no_csv(deputado_id,caminho_csv,coluna_id='id.deputado', coluna_nome="siglaUf"):
     try:
-        # Lê o arquivo CSV
-        df = pd.read_csv(caminho_csv)
+        # Lê o arquivo CSV (uma vez; depois usa o índice em memória)
+        indice = carregar_indice_csv(caminho_csv, coluna_id)
 
         # Verifica se a coluna existe
-        if coluna_nome not in df.columns:
+        if coluna_nome not in indice.columns:
             print(f"A coluna '{coluna_nome}' não existe no arquivo CSV.")
             return None
         
         # Verifica se existe uma linha com o ID do deputado e se o valor na coluna especificada está preenchido
         deputado_id = str(deputado_id)  # Certifique-se de que o ID está no formato de string
-        linha = df.loc[df[coluna_id].astype(str) == deputado_id]        
-        if linha.empty:
+        if deputado_id not in indice.index:
             print(f"Não existe nenhuma linha com o deputado_id {deputado_id}.")
             return None
 
-        valor = linha[coluna_nome].values[0]
+        valor = indice.at[deputado_id, coluna_nome]
 
         # Verifica se o valor da coluna não está vazio (NA ou None)
         if pd.isna(valor):
@@ -1468,265 +2479,341 @@ def verificar_valor_no_csv(deputado_id,caminho_csv,coluna_id='id.deputado', colu
         print(f"Erro ao processar o arquivo CSV: {str(e)}")
         return None
 
-# Função para pegar a siglaUf da API
-import requests
-
+# Função para pegar as informações do deputado na API
 def get_info(deputado_id):
-    print(f"Consultando na API: {deputado_id}")
-    url = f"https://dadosabertos.camara.leg.br/api/v2/deputados/{deputado_id}"
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        try:
-            dados = data['dados']
-            ultimo_status = dados['ultimoStatus']
-            
-            # Captura dos campos requisitados
-            sigla_uf = ultimo_status.get('siglaUf')
-            sigla_partido = ultimo_status.get('siglaPartido')
-            uri = dados.get('uri')
-            url_foto = ultimo_status.get('urlFoto')
-            situacao = ultimo_status.get('situacao')
-            documento = dados.get('cpf')
-            email = ultimo_status['gabinete'].get('email')
-            data_nascimento = dados.get('dataNascimento')
-            
-            return {
-                "sigla_uf": sigla_uf,
-                "sigla_partido": sigla_partido,
-                "uri": uri,
-                "url_foto": url_foto,
-                "situacao": situacao,
-                "documento": documento,
-                "email": email,
-                "data_nascimento": data_nascimento
-            }
-        except KeyError as e:
-            print(f"Erro: Campo {e} não encontrado para o deputado {deputado_id}")
-            return None
-    else:
-        print(f"Erro ao consultar API para deputado {deputado_id}: {response.status_code}")
+    data = consultar_deputado(deputado_id)
+    if data is None:
         return None
 
-def get_deputado_sigla_partido(deputado_id):
-    print(f"consultando na API: {deputado_id}")
-    url = f"https://dadosabertos.camara.leg.br/api/v2/deputados/{deputado_id}"
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        try:
-            sigla_partido = data['dados']['ultimoStatus']['siglaPartido']
-            return sigla_partido
-        except KeyError:
-            print(f"Erro: 'siglaPartido' não encontrado para o deputado {deputado_id}")
-            return None
-    else:
-        print(f"Erro ao consultar API para deputado {deputado_id}: {response.status_code}")
+    try:
+        dados = data['dados']
+        ultimo_status = dados['ultimoStatus']
+        
+        # Captura dos campos requisitados
+        return {
+            "sigla_uf": ultimo_status.get('siglaUf'),
+            "sigla_partido": ultimo_status.get('siglaPartido'),
+            "uri": dados.get('uri'),
+            "url_foto": ultimo_status.get('urlFoto'),
+            "situacao": ultimo_status.get('situacao'),
+            "documento": dados.get('cpf'),
+            "email": (ultimo_status.get('gabinete') or {}).get('email'),
+            "data_nascimento": dados.get('dataNascimento')
+        }
+    except (KeyError, TypeError) as e:
+        print(f"Erro: Campo {e} não encontrado para o deputado {deputado_id}")
         return None
 
+def get_deputado_sigla_partido(deputado_id):
+    data = consultar_deputado(deputado_id)
+    if data is None:
+        return None
+    try:
+        return data['dados']['ultimoStatus']['siglaPartido']
+    except (KeyError, TypeError):
+        print(f"Erro: 'siglaPartido' não encontrado para o deputado {deputado_id}")
+        return None
 
-# Função que itera pelo DataFrame e preenche a coluna 'siglaUf'
-def pegar_info_deputados(df):
-    # Verifica se a coluna 'siglaUf' existe, se não, cria ela
-    if 'siglaUf' not in df.columns:
-        df['siglaUf'] = None
-    if 'siglaPartido' not in df.columns:
-        df['siglaPartido'] = None
-    if 'uri' not in df.columns:
-        df['uri'] = None
-    if 'urlFoto' not in df.columns:
-        df['urlFoto'] = None
-    if 'situacao' not in df.columns:
-        df['situacao'] = None
-    if 'documento' not in df.columns:
-        df['documento'] = None
-    if 'email' not in df.columns:
-        df['email'] = None
-    if 'dataNascimento' not in df.columns:
-        df['dataNascimento'] = None
-    for index, row in df.iterrows():
-        deputado_id = row['idDeputado']
-        info = get_info(deputado_id)
-        df.at[index, 'siglaPartido'] = info.get('sigla_partido')
-        df.at[index, 'siglaUf'] = info.get('sigla_uf')
-        df.at[index, 'uri'] = info.get('uri')
-        df.at[index, 'urlFoto'] = info.get('url_foto')
-        df.at[index, 'situacao'] = info.get('situacao')
-        df.at[index, 'documento'] = info.get('documento')
-        df.at[index, 'email'] = info.get('email')
-        df.at[index, 'dataNascimento'] = info.get('data_nascimento')
-    return df
-
-
-# deputados
-deputados_df = pegar_deputados()
-deputados_df.to_csv("/tmp/deputados_df.csv", index=False)
-
-# proposições
-proposicoes_df = pegar_proposicoes(ano_atual, ano_ini_legis)
-proposicoes_df.to_csv("/tmp/proposicoes_df.csv", index=False)
-
-# autores
-autores_prop_df = pegar_autores_proposicoes(ano_atual, ano_ini_legis)
-autores_prop_df.to_csv("/tmp/autores_prop_df.csv", index=False)
-
-# temas
-temas_prop_df = pegar_temas_proposicoes(ano_atual, ano_ini_legis)
-temas_prop_df.to_csv("/tmp/temas_prop_df.csv", index=False)
-
-# eventos
-eventos_df = pegar_eventos(ano_atual, ano_ini_legis)
-eventos_df.to_csv("/tmp/eventos_df.csv", index=False)
-
-# presença em eventos
-dep_eventos_df = pegar_presenca_eventos_deputados(ano_atual, ano_ini_legis)
-dep_eventos_df.to_csv("/tmp/dep_eventos_df.csv", index=False)
-
-# requerimentos dos eventos
-requer_eventos_df = pegar_requerimentos_eventos(ano_atual, ano_ini_legis)
-requer_eventos_df.to_csv("/tmp/requer_eventos_df.csv", index=False)
-
-# votações
-votacoes_df = pegar_votacoes(ano_atual, ano_ini_legis)
-votacoes_df.to_csv("/tmp/votacoes_df.csv", index=False)
-
-# votações por deputado
-dep_votacoes_df = pegar_votacoes_deputados(ano_atual, ano_ini_legis)
-dep_votacoes_df.to_csv("/tmp/dep_votacoes_df.csv", index=False)
-
-# votações e orientações dos líderes
-part_votacoes_df = pegar_votacoes_orientacoes(ano_atual, ano_ini_legis)
-part_votacoes_df.to_csv("/tmp/part_votacoes_df.csv", index=False)
-
-# cargos dos deputados
-cargos_deputados_df = pegar_cargos_deputados(57)
-cargos_deputados_df.to_csv("/tmp/cargos_deputados_df.csv", index=False)
-
-# órgãos
-orgaos_df = pegar_orgaos()
-orgaos_df.to_csv("/tmp/orgaos_df.csv", index=False)
-
-# índice legislativo
-ind_legis_df = criar_indice_legislativo(dep_eventos_df, dep_votacoes_df)
-ind_legis_df.to_csv("/tmp/ind_legis_df.csv", index=False)
-
-# proposições filtradas
-proposicoes_df_filtrado = processar_proposicoes(proposicoes_df, temas_prop_df, autores_prop_df)
-proposicoes_df_filtrado.to_csv("/tmp/proposicoes_df_filtrado.csv", index=False)
 
-# índice legislativo com Var1
-ind_legis_df_atualizado_1 = calcula_var_1(proposicoes_df_filtrado, ind_legis_df)
-ind_legis_df_atualizado_1.to_csv("/tmp/ind_legis_df_atualizado_1.csv", index=False)
+# Colunas preenchidas por pegar_info_deputados e o campo correspondente de get_info
+colunas_info_deputados = {
+    'siglaUf': 'sigla_uf',
+    'siglaPartido': 'sigla_partido',
+    'uri': 'uri',
+    'urlFoto': 'url_foto',
+    'situacao': 'situacao',
+    'documento': 'documento',
+    'email': 'email',
+    'dataNascimento': 'data_nascimento',
+}
+
+# Enriquecimento pela listagem paginada (/deputados?idLegislatura=N), que traz todos os
+# deputados da legislatura em poucas páginas, completada pelo deputados.csv já baixado.
+# A situação vem da listagem sem legislatura, que traz só os deputados em exercício.
+# Só os deputados que ficarem sem algum dos campos de colunas_somente_detalhe (ex.: os que
+# não estão em exercício) são consultados um a um, e só esses campos são tirados da
+# consulta. Se alguma listagem falha, ou com modo_info_deputados = "detalhe", todos os
+# deputados são consultados um a um, como antes.
+modo_info_deputados = "lista"
+itens_por_pagina_api = 100
+colunas_lista_deputados = ['siglaUf', 'siglaPartido', 'uri', 'urlFoto', 'email']
+colunas_cadastro_deputados = {'uri': 'uri', 'cpf': 'documento', 'dataNascimento': 'dataNascimento'}
+colunas_somente_detalhe = ['situacao']
+situacao_em_exercicio = "Exercício"
+
+def listar_deputados(legislatura=None):
+    """
+    Percorre a listagem paginada de deputados, seguindo os links 'next'. Cada página
+    passa pelo cache em disco (ver consultar_api_com_cache).
 
-# índice legislativo com Var2
-ind_legis_df_atualizado_2 = calcula_var_2(proposicoes_df_filtrado, ind_legis_df_atualizado_1)
-ind_legis_df_atualizado_2.to_csv("/tmp/ind_legis_df_atualizado_2.csv", index=False)
+    Parâmetros:
+    - legislatura: Número da legislatura; sem ela, a API lista os deputados em exercício.
 
-# calcula_var_3
-ind_legis_df_atualizado_3 = calcula_var_3(proposicoes_df_filtrado, ind_legis_df_atualizado_2)
-ind_legis_df_atualizado_3.to_csv("/tmp/ind_legis_df_atualizado_3.csv")
+    Retorna:
+    - DataFrame com idDeputado e as colunas de colunas_lista_deputados, ou None se alguma página falhou.
+    """
+    descricao = f"deputados da legislatura {legislatura}" if legislatura is not None else "deputados em exercício"
+    filtro = f"idLegislatura={legislatura}&" if legislatura is not None else ""
+    url = f"{url_api}/deputados?{filtro}itens={itens_por_pagina_api}&pagina=1"
+    registros = []
+    while url:
+        resposta = consultar_api_com_cache(url, f"{descricao} ({url})")
+        if resposta is None:
+            print(f"Listagem de {descricao} incompleta")
+            return None
+        registros.extend(resposta.get('dados') or [])
+        url = next((link.get('href') for link in resposta.get('links') or [] if link.get('rel') == 'next'), None)
 
+    lista = pd.DataFrame(registros).reindex(columns=['id'] + colunas_lista_deputados)
+    lista['idDeputado'] = pd.to_numeric(lista.pop('id'), errors='coerce')
+    return lista.dropna(subset=['idDeputado'])
 
-# calcula_var_4
-ind_legis_df_atualizado_4 = calcula_var_4(proposicoes_df_filtrado, ind_legis_df_atualizado_3)
-ind_legis_df_atualizado_4.to_csv("/tmp/ind_legis_df_atualizado_4.csv", index=False)
+def tabela_info_deputados_lista(legislaturas, deputados_df=None):
+    """
+    Monta a tabela de informações dos deputados pelas listagens das legislaturas e pelo
+    deputados.csv. Campos da listagem têm prioridade sobre os do CSV; um deputado que
+    aparece em mais de uma legislatura fica com os dados da mais recente. Os deputados
+    da listagem de deputados em exercício recebem a situação situacao_em_exercicio; os
+    demais ficam sem situação.
 
+    Parâmetros:
+    - legislaturas: Legislaturas a listar.
+    - deputados_df: DataFrame de pegar_deputados (opcional).
 
-# Exemplo de uso da Var5 (Votos em separado)
-ind_legis_df_atualizado_5 = calcula_var_5(proposicoes_df_filtrado, ind_legis_df_atualizado_4)
-ind_legis_df_atualizado_5.to_csv("/tmp/ind_legis_df_atualizado_5.csv", index=False)
+    Retorna:
+    - DataFrame indexado por idDeputado, com as colunas de colunas_info_deputados,
+      ou None se alguma listagem falhou.
+    """
+    listas = [listar_deputados(legislatura) for legislatura in sorted(legislaturas)]
+    em_exercicio = listar_deputados()
+    if em_exercicio is None or any(lista is None for lista in listas):
+        return None
 
-# Exemplo de uso da Var6 (Substitutivos)
-ind_legis_df_atualizado_6 = calcula_var_6(proposicoes_df_filtrado, ind_legis_df_atualizado_5)
-ind_legis_df_atualizado_6.to_csv("/tmp/ind_legis_df_atualizado_6.csv", index=False)
+    tabela = pd.concat(listas, ignore_index=True).drop_duplicates('idDeputado', keep='last')
+    tabela = tabela.set_index(tabela['idDeputado'].astype('int64')).reindex(columns=list(colunas_info_deputados))
+    tabela['situacao'] = tabela['situacao'].astype(object).mask(tabela.index.isin(em_exercicio['idDeputado']), situacao_em_exercicio)
 
-# Exemplo de uso da Var7 (Relatorias)
-ind_legis_df_atualizado_7 = calcula_var_7(proposicoes_df_filtrado, ind_legis_df_atualizado_6)
-ind_legis_df_atualizado_7.to_csv("/tmp/ind_legis_df_atualizado_7.csv", index=False)
+    if deputados_df is not None:
+        cadastro = deputados_df.dropna(subset=['idDeputado']).drop_duplicates('idDeputado', keep='last')
+        cadastro = cadastro.set_index(cadastro['idDeputado'].astype('int64'))
+        cadastro = cadastro.reindex(columns=list(colunas_cadastro_deputados)).rename(columns=colunas_cadastro_deputados)
+        tabela = tabela.combine_first(cadastro)
 
-# Exemplo de uso da Var8 (Presença em votações em Plenário)
-ind_legis_df_atualizado_8 = calcula_var_8(eventos_df, dep_eventos_df, ind_legis_df_atualizado_7)
-ind_legis_df_atualizado_8.to_csv("/tmp/ind_legis_df_atualizado_8.csv", index=False)
+    return tabela.reindex(columns=list(colunas_info_deputados))
 
-# Exemplo de uso da Var9 (Emendas em plenário)
-ind_legis_df_atualizado_9 = calcula_var_9(proposicoes_df_filtrado, ind_legis_df_atualizado_8)
-ind_legis_df_atualizado_9.to_csv("/tmp/ind_legis_df_atualizado_9.csv", index=False)
+def tabela_info_deputados_detalhe(ids, max_simultaneas=max_consultas_simultaneas):
+    """
+    Consulta /deputados/{id} para cada deputado (até max_simultaneas ao mesmo tempo).
 
-# Exemplo de uso da Var10 (Emendas às MPs)
-ind_legis_df_atualizado_10 = calcula_var_10(proposicoes_df_filtrado, ind_legis_df_atualizado_9)
-ind_legis_df_atualizado_10.to_csv("/tmp/ind_legis_df_atualizado_10.csv", index=False)
+    Retorna:
+    - DataFrame indexado por idDeputado, com as colunas de colunas_info_deputados
+      (linha vazia para os deputados cuja consulta falhou).
+    """
+    with ThreadPoolExecutor(max_workers=max_simultaneas) as executor:
+        infos = dict(zip(ids, executor.map(get_info, ids)))
 
-# Exemplo de uso da Var11 (Emendas às LOA)
-ind_legis_df_atualizado_11 = calcula_var_11(proposicoes_df_filtrado, ind_legis_df_atualizado_10)
-ind_legis_df_atualizado_11.to_csv("/tmp/ind_legis_df_atualizado_11.csv", index=False)
+    falhas = [deputado_id for deputado_id, info in infos.items() if info is None]
+    if falhas:
+        print(f"Sem informações da API para {len(falhas)} deputados: {falhas}")
 
-# Exemplo de uso da Var12 (Projetos com status especial)
-ind_legis_df_atualizado_12 = calcula_var_12(proposicoes_df_filtrado, ind_legis_df_atualizado_11)
-ind_legis_df_atualizado_12.to_csv("/tmp/ind_legis_df_atualizado_12.csv", index=False)
+    return pd.DataFrame([[(info or {}).get(campo) for campo in colunas_info_deputados.values()] for info in infos.values()],
+                        index=list(infos), columns=list(colunas_info_deputados))
 
-# Exemplo de uso da Var13 (Cargos ocupados)
-ind_legis_df_atualizado_13 = calcula_var_13(cargos_deputados_df, ind_legis_df_atualizado_12)
-ind_legis_df_atualizado_13.to_csv("/tmp/ind_legis_df_atualizado_13.csv", index=False)
-# Exemplo de uso da Var14 (Requerimentos de Audiência Pública)
+def pegar_info_deputados(df, deputados_df=None, max_simultaneas=max_consultas_simultaneas, modo=None):
+    """
+    Preenche UF, partido, foto, situação e contatos de cada deputado com a API.
 
-ind_legis_df_atualizado_14 = calcula_var_14(eventos_df, requer_eventos_df, proposicoes_df_filtrado, ind_legis_df_atualizado_13)
-ind_legis_df_atualizado_14.to_csv("/tmp/ind_legis_df_atualizado_14.csv", index=False)
+    No modo "lista" (ver modo_info_deputados), os campos vêm das listagens paginadas
+    (de cada legislatura presente em df e dos deputados em exercício) e do deputados.csv;
+    só os deputados sem algum campo de colunas_somente_detalhe são consultados um a um,
+    e só esses campos são tirados da consulta. No modo "detalhe", ou se alguma listagem
+    falha, cada deputado é consultado uma vez. As consultas passam pelo cache em disco
+    (ver consultar_api_com_cache), com até max_simultaneas ao mesmo tempo (limitadas
+    também por limitador_api), e as colunas são escritas de uma vez no fim, com um único
+    reindex pela tabela montada. Valores que faltarem nas respostas mantêm o que o
+    deputado já tinha.
 
-# Exemplo de uso da Var15 (Reuniões e eventos técnicos)
-ind_legis_df_atualizado_15 = calcula_var_15(eventos_df, dep_eventos_df, ind_legis_df_atualizado_14)
-ind_legis_df_atualizado_15.to_csv("/tmp/ind_legis_df_atualizado_15.csv", index=False)
+    Parâmetros:
+    - df: DataFrame com a coluna idDeputado (e legislat, para o modo "lista").
+    - deputados_df: DataFrame de pegar_deputados (opcional).
+    - max_simultaneas: Número máximo de consultas em andamento.
+    - modo: "lista" ou "detalhe" (padrão: modo_info_deputados).
 
-ind_legis_df_atualizado_16_18 = calcula_var_16_17_18(proposicoes_df_filtrado, ind_legis_df_atualizado_15)
-ind_legis_df_atualizado_16_18.to_csv("/tmp/ind_legis_df_atualizado_16_18.csv", index=False)
+    Retorna:
+    - DataFrame com as colunas de colunas_info_deputados preenchidas.
+    """
+    modo = modo or modo_info_deputados
+    colunas = list(colunas_info_deputados)
+    ids = df['idDeputado'].dropna().unique()
 
-# votacoes_df = pd.read_csv('/tmp/votacoes_df.csv')
-# dep_votacoes_df = pd.read_csv('/tmp/dep_votacoes_df.csv')
-# deputados_df = pd.read_csv('/tmp/deputados_df.csv')
-# ind_legis_df_atualizado_16_18 = pd.read_csv('/tmp/ind_legis_df_atualizado_16_18.csv')
-# # # Exemplo de uso para calcular a variável Var19
-ind_legis_df_atualizado_19 = calcula_var_19(votacoes_df, dep_votacoes_df, ind_legis_df_atualizado_16_18)
-ind_legis_df_atualizado_19.to_csv("/tmp/ind_legis_df_atualizado_19.csv", index=False)
-# ind_legis_df_atualizado_19 = pd.read_csv('/tmp/ind_legis_df_atualizado_19.csv')
+    tabela = None
+    if modo == "lista":
+        legislaturas = df['legislat'].dropna().unique() if 'legislat' in df.columns else [legislatura_atual]
+        tabela = tabela_info_deputados_lista(legislaturas, deputados_df)
+        if tabela is None:
+            print("Listagem de deputados indisponível, consultando cada deputado")
 
-# normaliza_indice
-ind_legis_df_normalizado = normaliza_indice(ind_legis_df_atualizado_19)
-ind_legis_df_normalizado.to_csv("/tmp/ind_legis_df_normalizado.csv", index=False)
+    if tabela is None:
+        tabela = tabela_info_deputados_detalhe(ids, max_simultaneas)
+    else:
+        incompletos = tabela.reindex(ids)[colunas_somente_detalhe].isna().any(axis=1).to_numpy()
+        print(f"Informações de {len(ids)} deputados pela listagem; {incompletos.sum()} consultados um a um")
+        if incompletos.any():
+            detalhes = tabela_info_deputados_detalhe(ids[incompletos], max_simultaneas)
+            tabela = tabela.combine_first(detalhes[colunas_somente_detalhe])
+
+    aguardar_revalidacoes()
+    print(f"Cache da API: {contadores_cache_api['acertos']} acertos, {contadores_cache_api['vencidos']} vencidos (revalidados) "
+          f"e {contadores_cache_api['faltas']} faltas")
+
+    novos = tabela.reindex(columns=colunas).reindex(df['idDeputado']).set_axis(df.index)
+    atuais = df.reindex(columns=colunas)
+    df[colunas] = novos.where(novos.notna(), atuais)
+    return df
 
-# calcular_notas_dos_eixos
-ind_legis_df_eixos = calcular_notas_dos_eixos(ind_legis_df_normalizado)
-ind_legis_df_eixos.to_csv("/tmp/ind_legis_df_eixos.csv", index=False)
 
-# ordenar_variaveis
-ind_legis_df_ordenado = ordenar_variaveis(ind_legis_df_eixos)
-ind_legis_df_ordenado.to_csv("/tmp/ind_legis_df_ordenado.csv", index=False)
+# Execução do pipeline como um grafo de etapas
+# Estas variáveis são lidas no processo principal (definir_etapas/executar_etapas). Os processos
+# das etapas podem ser iniciados com spawn e não ver mudanças feitas nelas em tempo de execução,
+# então as opções que as funções das etapas usam (ex.: agregar_votos_em_blocos) vão nos parametros.
+incluir_orientacao_lider = False  # acrescenta a variável opcional 'orient.lider' ao índice
+max_processos_etapas = os.cpu_count() or 1
+gravar_intermediarios = True
+pasta_intermediarios = "/tmp"
 
+def definir_etapas(ano_atual, ano_ini_legis, legislatura_atual):
+    """
+    Descreve o pipeline como uma lista de etapas. Cada etapa é um dicionário com:
+    - nome: Nome da etapa.
+    - funcao: Função (de nível de módulo, para poder rodar em outro processo).
+    - entradas: Nomes dos resultados de outras etapas, passados como primeiros argumentos.
+    - depois: Nomes de resultados que precisam existir antes, mas não são passados (opcional).
+    - parametros: Argumentos fixos passados depois das entradas, incluindo as opções do
+      módulo que a função usa, lidas aqui no processo principal.
+    - saidas: Nomes dados ao resultado (mais de um nome se a função retorna uma tupla).
 
-# adicionar_info_pessoais
-ind_legis_df_info_pessoal = adicionar_info_pessoais(ind_legis_df_ordenado, deputados_df)
-ind_legis_df_info_pessoal.to_csv("/tmp/ind_legis_df_info_pessoal.csv", index=False)
+    Parâmetros:
+    - ano_atual: Ano atual.
+    - ano_ini_legis: Ano inicial da legislatura.
+    - legislatura_atual: Legislatura do índice.
 
+    Retorna:
+    - Lista de etapas, no formato aceito por executar_etapas.
+    """
+    anos = range(ano_ini_legis, ano_atual + 1)
+    return [
+        # downloads de todos os arquivos em paralelo; as leituras só começam depois
+        {'nome': 'downloads', 'funcao': baixar_arquivos, 'entradas': [],
+         'parametros': (listar_downloads(ano_atual, ano_ini_legis, legislatura_atual),), 'saidas': ['downloads']},
+
+        # agregados parciais de cada ano, recalculados só quando os arquivos do ano mudam
+        *[{'nome': f'particao_{ano}', 'funcao': pegar_particao_ano, 'entradas': [], 'depois': ['downloads'],
+           'parametros': (ano, "temp", agregar_votos_em_blocos), 'saidas': [f'particao_{ano}']} for ano in anos],
+        {'nome': 'agregados', 'funcao': combinar_particoes, 'entradas': [f'particao_{ano}' for ano in anos],
+         'saidas': ['ind_legis_df', 'var_proposicoes_df', 'var_eventos_df', 'var_14_df', 'var_16_18_df', 'var_19_df',
+                    'var_orientacao_df']},
+
+        # conjuntos de dados lidos por inteiro
+        {'nome': 'deputados', 'funcao': pegar_deputados, 'entradas': [], 'depois': ['downloads'], 'saidas': ['deputados_df']},
+        {'nome': 'cargos', 'funcao': pegar_cargos_deputados, 'entradas': [], 'depois': ['downloads'], 'parametros': (legislatura_atual,), 'saidas': ['cargos_deputados_df']},
+        {'nome': 'orgaos', 'funcao': pegar_orgaos, 'entradas': [], 'depois': ['downloads'], 'saidas': ['orgaos_df']},
+        {'nome': 'var_13', 'funcao': calcula_var_13, 'entradas': ['cargos_deputados_df'], 'saidas': ['var_13_df']},
+
+        # montagem, normalização e saída
+        {'nome': 'montagem', 'funcao': montar_indice_com_variaveis,
+         'entradas': ['ind_legis_df', 'var_proposicoes_df', 'var_eventos_df', 'var_13_df', 'var_14_df', 'var_16_18_df', 'var_19_df']
+                     + (['var_orientacao_df'] if incluir_orientacao_lider else []),
+         'saidas': ['ind_legis_df_atualizado_19']},
+        {'nome': 'normalizacao', 'funcao': normaliza_indice, 'entradas': ['ind_legis_df_atualizado_19'], 'saidas': ['ind_legis_df_normalizado']},
+        {'nome': 'eixos', 'funcao': calcular_notas_dos_eixos, 'entradas': ['ind_legis_df_normalizado'], 'saidas': ['ind_legis_df_eixos']},
+        {'nome': 'ordenacao', 'funcao': ordenar_variaveis, 'entradas': ['ind_legis_df_eixos'], 'saidas': ['ind_legis_df_ordenado']},
+        {'nome': 'info_pessoais', 'funcao': adicionar_info_pessoais, 'entradas': ['ind_legis_df_ordenado', 'deputados_df'], 'saidas': ['ind_legis_df_info_pessoal']},
+        {'nome': 'selecao', 'funcao': selecionar_variaveis, 'entradas': ['ind_legis_df_info_pessoal'], 'saidas': ['ind_legis_df_selecionado']},
+        {'nome': 'arredondamento', 'funcao': arredondar_valores, 'entradas': ['ind_legis_df_selecionado'], 'saidas': ['ind_legis_df_arredondado']},
+        {'nome': 'filtro', 'funcao': renomear_e_filtrar, 'entradas': ['ind_legis_df_arredondado'], 'parametros': (legislatura_atual,), 'saidas': ['final_ind_legis_filtrado']},
+        {'nome': 'estrelas', 'funcao': atribuir_estrelas, 'entradas': ['final_ind_legis_filtrado'], 'saidas': ['final_ind_legis_estrelas']},
+
+        # Garantir as UFs preenchidas
+        {'nome': 'info_deputados', 'funcao': pegar_info_deputados, 'entradas': ['final_ind_legis_estrelas', 'deputados_df'], 'saidas': ['final_ind_legis']},
+    ]
 
-# selecionar_variaveis
-ind_legis_df_selecionado = selecionar_variaveis(ind_legis_df_info_pessoal)
-ind_legis_df_selecionado.to_csv("/tmp/ind_legis_df_selecionado.csv", index=False)
+def montar_indice_com_variaveis(ind_legis_df, *variaveis):
+    """
+    Versão de montar_indice que recebe cada DataFrame de variáveis como um argumento (formato das etapas).
+    """
+    return montar_indice(ind_legis_df, list(variaveis))
 
+def executar_etapas(etapas, max_processos=max_processos_etapas):
+    """
+    Executa as etapas respeitando as dependências: cada etapa é enviada a um pool de
+    processos assim que todas as suas entradas estiverem prontas, de modo que ramos
+    independentes (ex.: leitura de votos e de proposições, ou as diferentes variáveis)
+    rodam ao mesmo tempo.
 
-# arredondar_valores
-ind_legis_df_arredondado = arredondar_valores(ind_legis_df_selecionado)
-ind_legis_df_arredondado.to_csv("/tmp/ind_legis_df_arredondado.csv", index=False)
+    Parâmetros:
+    - etapas: Lista de etapas (ver definir_etapas).
+    - max_processos: Número máximo de etapas rodando ao mesmo tempo.
 
-# renomear_e_filtrar
-final_ind_legis_57 = renomear_e_filtrar(ind_legis_df_arredondado, legislatura_atual=57)
-final_ind_legis_57.to_csv("/tmp/final_ind_legis_57-filtrado.csv", index=False)
+    Retorna:
+    - Dicionário {nome da saída: resultado} com os resultados de todas as etapas.
+    """
+    def dependencias(etapa):
+        return etapa['entradas'] + etapa.get('depois', [])
+
+    produzidas = {saida for etapa in etapas for saida in etapa['saidas']}
+    faltando = {entrada for etapa in etapas for entrada in dependencias(etapa)} - produzidas
+    if faltando:
+        raise ValueError(f"Entradas sem etapa que as produza: {sorted(faltando)}")
+
+    resultados = {}
+    pendentes = list(etapas)
+    with ProcessPoolExecutor(max_workers=max_processos) as executor:
+        em_execucao = {}
+        while pendentes or em_execucao:
+            for etapa in [e for e in pendentes if all(entrada in resultados for entrada in dependencias(e))]:
+                pendentes.remove(etapa)
+                argumentos = [resultados[entrada] for entrada in etapa['entradas']] + list(etapa.get('parametros', ()))
+                print(f"Iniciando etapa {etapa['nome']}...")
+                em_execucao[executor.submit(etapa['funcao'], *argumentos)] = etapa
+
+            if not em_execucao:
+                raise ValueError(f"Dependência circular entre as etapas: {[e['nome'] for e in pendentes]}")
+
+            concluidas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                etapa = em_execucao.pop(futuro)
+                resultado = futuro.result()
+                saidas = resultado if len(etapa['saidas']) > 1 else (resultado,)
+                for nome, valor in zip(etapa['saidas'], saidas):
+                    resultados[nome] = valor
+                    if gravar_intermediarios and isinstance(valor, pd.DataFrame):
+                        valor.to_csv(os.path.join(pasta_intermediarios, f"{nome}.csv"), index=False)
+                print(f"Etapa {etapa['nome']} concluída")
+
+    return resultados
+
+
+# Formato do arquivo publicado
+separador_csv_final = ';'
+decimal_csv_final = ','
+linhas_por_bloco_csv = 10_000
+
+def gravar_indice_final(final_ind_legis_df, caminho):
+    """
+    Grava o índice final no formato publicado (separador ';' e vírgula decimal),
+    escrevendo linhas_por_bloco_csv linhas por vez direto no arquivo.
 
-final_ind_legis_57 = atribuir_estrelas(final_ind_legis_57)
-final_ind_legis_57.to_csv("/tmp/final_ind_legis_57-estrelas.csv", index=False)
+    Parâmetros:
+    - final_ind_legis_df: DataFrame final (ver pegar_info_deputados).
+    - caminho: Caminho do arquivo CSV.
+    """
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        final_ind_legis_df.to_csv(arquivo, sep=separador_csv_final, decimal=decimal_csv_final,
+                                  index=False, chunksize=linhas_por_bloco_csv)
 
-# Garantir as UFs preenchidas
-final_ind_legis_57 = pegar_info_deputados(final_ind_legis_57)
 
-# salvar csv
-final_ind_legis_57.to_csv("./final_ind_legis_57.csv", sep=';', decimal=',', index=False)
+if __name__ == "__main__":
+    resultados = executar_etapas(definir_etapas(ano_atual, ano_ini_legis, legislatura_atual))
 
+    # salvar csv
+    gravar_indice_final(resultados['final_ind_legis'], "./final_ind_legis_57.csv")
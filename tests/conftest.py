@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dados_sinteticos  # noqa: E402
+import gera_csv  # noqa: E402
+
+# Ano dos arquivos baixados para os testes de agregação
+ano_teste = 2024
+
+
+def iniciar_servidor(pasta, falhas=0, comprimir=False):
+    """Sobe um servidor local numa porta livre, numa thread. Retorna (servidor, URL base)."""
+    servidor = dados_sinteticos.criar_servidor(pasta, 0, falhas, comprimir)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://localhost:{servidor.server_address[1]}"
+
+
+def apontar_para(monkeypatch, url):
+    """Faz o gera_csv usar o servidor local em vez do portal."""
+    monkeypatch.setattr(gera_csv, "url_arquivos", f"{url}/arquivos")
+    monkeypatch.setattr(gera_csv, "url_api", f"{url}/api/v2")
+
+
+@pytest.fixture(scope="session")
+def pasta_dados(tmp_path_factory):
+    """Conjunto sintético em escala 1, gerado uma vez por sessão."""
+    pasta = str(tmp_path_factory.mktemp("dados_abertos"))
+    dados_sinteticos.gerar_dados(pasta, escala=1, semente=0)
+    return pasta
+
+
+@pytest.fixture(scope="session")
+def url_dados(pasta_dados):
+    """URL do servidor local da sessão, sem falhas nem compressão."""
+    servidor, url = iniciar_servidor(pasta_dados)
+    yield url
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def servidor(url_dados, monkeypatch):
+    """Aponta o gera_csv para o servidor da sessão. Retorna a URL base."""
+    apontar_para(monkeypatch, url_dados)
+    return url_dados
+
+
+@pytest.fixture
+def subir_servidor(pasta_dados, monkeypatch):
+    """
+    Sobe servidores com opções próprias (falhas, compressão) e aponta o gera_csv para o
+    último deles. Retorna a URL base.
+    """
+    servidores = []
+
+    def subir(falhas=0, comprimir=False):
+        servidor, url = iniciar_servidor(pasta_dados, falhas, comprimir)
+        servidores.append(servidor)
+        apontar_para(monkeypatch, url)
+        return url
+
+    yield subir
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+@pytest.fixture(scope="session")
+def pasta_baixada(tmp_path_factory, url_dados):
+    """Pasta temporária com os arquivos de ano_teste e os não anuais já baixados."""
+    pasta = str(tmp_path_factory.mktemp("temp"))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        apontar_para(monkeypatch, url_dados)
+        caminhos = gera_csv.baixar_arquivos(gera_csv.listar_downloads(ano_teste, ano_teste, gera_csv.legislatura_atual), pasta)
+    assert all(caminhos.values())
+    return pasta
+
+
+@pytest.fixture
+def pasta_temp(tmp_path, monkeypatch):
+    """Pasta de trabalho vazia, sem espera entre tentativas de download."""
+    monkeypatch.setattr(gera_csv.time, "sleep", lambda segundos: None)
+    return str(tmp_path / "temp")
@@ -0,0 +1,137 @@
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import gera_csv
+from conftest import ano_teste
+
+
+def test_agregacao_em_blocos_igual_a_em_memoria(pasta_baixada):
+    votacoes_df = gera_csv.pegar_votacoes(ano_teste, ano_teste, pasta_baixada)
+    orientacoes_df = gera_csv.pegar_votacoes_orientacoes(ano_teste, ano_teste, pasta_baixada)
+
+    em_memoria = gera_csv.agregar_votos_em_memoria(votacoes_df, orientacoes_df, ano_teste, ano_teste, pasta_baixada)
+    # Blocos pequenos e de tamanho que não divide o arquivo: categorias novas aparecem no meio
+    em_blocos = gera_csv.agregar_votos_deputados(votacoes_df, orientacoes_df, ano_teste, ano_teste, pasta_baixada,
+                                                 tamanho_bloco=7777)
+
+    for esperado, obtido in zip(em_memoria, em_blocos):
+        assert len(esperado) > 0
+        pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_agregacao_de_blocos_separados_por_partido():
+    # Média do partido na votação: PT (Sim, Sim, Não) = 2/3 e PL (Não) = 0
+    votos = pd.DataFrame({
+        'idVotacao': ['1', '1', '1', '1', '2'],
+        'dataHoraVoto': ['2024-03-01T10:00:00'] * 4 + ['2024-04-01T10:00:00'],
+        'voto': ['Sim', 'Sim', 'Não', 'Não', 'Sim'],
+        'deputado_id': pd.array([10, 11, 12, 13, 10], dtype='Int32'),
+        'deputado_siglaPartido': ['PT', 'PT', 'PT', 'PL', 'PT'],
+        'deputado_idLegislatura': pd.array([57] * 5, dtype='Int16'),
+    })
+    orientacoes = pd.DataFrame({'idVotacao': ['1', '1'], 'siglaBancada': ['PT', 'PL'], 'orientacao': ['Sim', 'Liberado']})
+
+    def blocos():
+        return [votos.iloc[:2], votos.iloc[2:]]
+
+    mensais, desvios, orientacao = gera_csv.agregar_votos(blocos, pd.Index(['1']), orientacoes)
+
+    assert mensais.set_index(['idDeputado', 'dataHoraInicio'])['N'].sum() == 5
+    desvios = desvios.set_index('idDeputado')
+    np.testing.assert_allclose(desvios.loc[[10, 11, 12, 13], 'sum'], [1 / 3, 1 / 3, 2 / 3, 0])
+    assert desvios['count'].tolist() == [1, 1, 1, 1]
+    # 'Liberado' não conta como orientação
+    orientacao = orientacao.set_index('idDeputado')
+    assert sorted(orientacao.index) == [10, 11, 12]
+    assert orientacao.loc[[10, 11, 12], 'sum'].tolist() == [1, 1, 0]
+
+
+def copiar_pasta_com_links(origem, destino):
+    """Pasta com links para os CSVs baixados e cópia do manifesto, para poder alterar arquivos."""
+    os.makedirs(destino)
+    for nome in os.listdir(origem):
+        if nome.endswith(".csv"):
+            os.symlink(os.path.join(origem, nome), os.path.join(destino, nome))
+    shutil.copy(os.path.join(origem, gera_csv.arquivo_manifesto), destino)
+
+
+def test_particao_reaproveitada_e_invalidada(pasta_baixada, tmp_path, monkeypatch):
+    pasta_temp = str(tmp_path / "temp")
+    copiar_pasta_com_links(pasta_baixada, pasta_temp)
+    calcular = gera_csv.calcular_agregados_ano
+    calculos = []
+    monkeypatch.setattr(gera_csv, "calcular_agregados_ano",
+                        lambda *argumentos: calculos.append(argumentos) or calcular(*argumentos))
+
+    particao = gera_csv.pegar_particao_ano(ano_teste, pasta_temp)
+    assert os.path.exists(gera_csv.caminho_particao(ano_teste, pasta_temp))
+    assert len(calculos) == 1
+
+    # Nada mudou: a partição salva é usada
+    salva = gera_csv.pegar_particao_ano(ano_teste, pasta_temp)
+    assert len(calculos) == 1
+    pd.testing.assert_frame_equal(salva['desvios'], particao['desvios'])
+
+    # Um arquivo do ano mudou
+    arquivo_csv = gera_csv.caminho_arquivo_csv("eventosRequerimentos", pasta_temp, str(ano_teste))
+    conteudo = open(arquivo_csv, encoding="utf-8").read()
+    os.remove(arquivo_csv)
+    with open(arquivo_csv, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo.rstrip("\n").rsplit("\n", 1)[0] + "\n")
+    gera_csv.pegar_particao_ano(ano_teste, pasta_temp)
+    assert len(calculos) == 2
+
+    # Uma definição do cálculo mudou, sem mudar versao_particoes
+    monkeypatch.setattr(gera_csv, "padrao_palavras_chave", re.compile(gera_csv.padrao_palavras_chave.pattern + "|viaduto"))
+    gera_csv.pegar_particao_ano(ano_teste, pasta_temp)
+    assert len(calculos) == 3
+
+    # Partição ilegível: recalcula
+    with open(gera_csv.caminho_particao(ano_teste, pasta_temp), "wb") as arquivo:
+        arquivo.write(b"corrompido")
+    gera_csv.pegar_particao_ano(ano_teste, pasta_temp)
+    assert len(calculos) == 4
+
+
+def indice_bruto(semente=0):
+    """Índice com as colunas de montar_indice, com duas legislaturas."""
+    rng = np.random.default_rng(semente)
+    colunas = sorted(set(gera_csv.colunas_ajuste_mandato + gera_csv.colunas_log))
+    n = 12
+    ind_legis = pd.DataFrame(rng.integers(0, 50, size=(n, len(colunas))).astype(float), columns=colunas)
+    ind_legis.insert(0, 'meses', rng.integers(1, 49, size=n))
+    ind_legis.insert(0, 'idDeputado', np.arange(100, 100 + n))
+    ind_legis.insert(0, 'legislat', [56] * 5 + [57] * 7)
+    return ind_legis
+
+
+def test_estatisticas_normalizacao(tmp_path):
+    pasta_temp = str(tmp_path)
+    ind_legis = indice_bruto()
+
+    normalizado = gera_csv.normaliza_indice(ind_legis.copy(), pasta_temp)
+    estatisticas = gera_csv.carregar_estatisticas_normalizacao(pasta_temp)
+
+    transformado = gera_csv.transformar_variaveis(ind_legis.copy())
+    colunas = estatisticas['min'].columns
+    pd.testing.assert_frame_equal(estatisticas['min'], transformado.groupby('legislat')[colunas].min())
+    pd.testing.assert_frame_equal(estatisticas['max'], transformado.groupby('legislat')[colunas].max())
+    # Cada variável vai de 0 a 1 dentro da legislatura
+    por_legislatura = normalizado.groupby('legislat')[colunas]
+    assert ((por_legislatura.min() == 0) | (estatisticas['min'] == estatisticas['max'])).all().all()
+    assert ((por_legislatura.max() == 1) | (estatisticas['min'] == estatisticas['max'])).all().all()
+
+    # Um deputado repontuado com os mesmos valores fica igual e dentro dos limites
+    linha = ind_legis.iloc[[7]].copy()
+    repontuado, dentro = gera_csv.normalizar_deputado(linha, estatisticas)
+    assert dentro
+    pd.testing.assert_frame_equal(repontuado[normalizado.columns], normalizado.iloc[[7]])
+
+    # Um valor acima do máximo da legislatura pede a normalização de todos
+    linha['relatorias'] = 10 ** 6
+    _, dentro = gera_csv.normalizar_deputado(linha, estatisticas)
+    assert not dentro
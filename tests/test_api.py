@@ -0,0 +1,100 @@
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+import pytest
+
+import gera_csv
+
+
+@pytest.fixture(autouse=True)
+def cache_api(tmp_path, monkeypatch):
+    """Cache da API e contadores próprios de cada teste."""
+    monkeypatch.setattr(gera_csv, "arquivo_cache_api", str(tmp_path / "cache_api.sqlite"))
+    monkeypatch.setattr(gera_csv, "contadores_cache_api", {'acertos': 0, 'vencidos': 0, 'faltas': 0})
+    return gera_csv.arquivo_cache_api
+
+
+def envelhecer(chave, segundos):
+    """Recua o momento em que uma resposta foi gravada no cache."""
+    with sqlite3.connect(gera_csv.arquivo_cache_api) as conexao:
+        conexao.execute("UPDATE respostas SET gravado_em = gravado_em - ? WHERE chave = ?", (segundos, chave))
+
+
+def test_cache_api_validade_e_revalidacao(servidor, pasta_dados):
+    deputados = json.load(open(os.path.join(pasta_dados, "api", "deputados.json"), encoding="utf-8"))
+    deputado_id = deputados[0]["id"]
+    url = f"{gera_csv.url_api}/deputados/{deputado_id}"
+
+    # Falta, depois acerto
+    resposta = gera_csv.consultar_deputado(deputado_id)
+    assert resposta["dados"]["id"] == deputado_id
+    assert gera_csv.consultar_deputado(deputado_id) == resposta
+    assert gera_csv.contadores_cache_api == {'acertos': 1, 'vencidos': 0, 'faltas': 1}
+
+    # Vencida, mas dentro da validade máxima: a resposta velha é usada e revalidada em segundo plano
+    gera_csv.gravar_cache_api(url, {"dados": "velho"})
+    envelhecer(url, gera_csv.validade_cache_api + 60)
+    assert gera_csv.consultar_deputado(deputado_id) == {"dados": "velho"}
+    assert gera_csv.contadores_cache_api['vencidos'] == 1
+    gera_csv.aguardar_revalidacoes()
+    atualizada, idade = gera_csv.ler_cache_api(url)
+    assert atualizada == resposta
+    assert idade < gera_csv.validade_cache_api
+
+    # Velha demais: consulta a API antes de responder
+    gera_csv.gravar_cache_api(url, {"dados": "velho"})
+    envelhecer(url, gera_csv.validade_maxima_cache_api + 60)
+    assert gera_csv.consultar_deputado(deputado_id) == resposta
+    assert gera_csv.contadores_cache_api == {'acertos': 1, 'vencidos': 1, 'faltas': 2}
+
+
+def test_cache_api_descarta_menos_usadas(monkeypatch):
+    monkeypatch.setattr(gera_csv, "max_entradas_cache_api", 2)
+    gera_csv.gravar_cache_api("a", {"n": 1})
+    time.sleep(0.01)
+    gera_csv.gravar_cache_api("b", {"n": 2})
+    time.sleep(0.01)
+    gera_csv.ler_cache_api("a")
+    time.sleep(0.01)
+    gera_csv.gravar_cache_api("c", {"n": 3})
+
+    assert gera_csv.ler_cache_api("b") is None
+    assert gera_csv.ler_cache_api("a")[0] == {"n": 1}
+    assert gera_csv.ler_cache_api("c")[0] == {"n": 3}
+
+
+def test_info_deputados_pela_listagem_com_consulta_aos_licenciados(servidor, pasta_dados, pasta_baixada, monkeypatch):
+    deputados = json.load(open(os.path.join(pasta_dados, "api", "deputados.json"), encoding="utf-8"))
+    da_legislatura = [d for d in deputados if d["atual"]]
+    licenciados = {d["id"] for d in da_legislatura if d["situacao"] != "Exercício"}
+    assert licenciados
+
+    get_info = gera_csv.get_info
+    consultados = []
+    monkeypatch.setattr(gera_csv, "get_info", lambda deputado_id: consultados.append(deputado_id) or get_info(deputado_id))
+
+    df = pd.DataFrame({'legislat': 57, 'idDeputado': [d["id"] for d in da_legislatura]})
+    df = gera_csv.pegar_info_deputados(df, gera_csv.pegar_deputados(pasta_baixada), modo="lista")
+
+    # Só quem não está na listagem de deputados em exercício é consultado um a um
+    assert set(consultados) == licenciados
+    situacao = df.set_index('idDeputado')['situacao']
+    assert (situacao[list(licenciados)] == "Licença").all()
+    assert (situacao.drop(list(licenciados)) == gera_csv.situacao_em_exercicio).all()
+    por_id = {d["id"]: d for d in da_legislatura}
+    assert (df['siglaUf'] == df['idDeputado'].map(lambda i: por_id[i]["siglaUf"])).all()
+    assert df['documento'].notna().all()
+
+
+def test_info_deputados_sem_listagem_consulta_todos(servidor, pasta_dados, monkeypatch):
+    deputados = json.load(open(os.path.join(pasta_dados, "api", "deputados.json"), encoding="utf-8"))
+    ids = [d["id"] for d in deputados if d["atual"]][:20]
+    monkeypatch.setattr(gera_csv, "listar_deputados", lambda legislatura=None: None)
+
+    df = gera_csv.pegar_info_deputados(pd.DataFrame({'legislat': 57, 'idDeputado': ids}), modo="lista")
+
+    assert df['situacao'].notna().all()
+    assert gera_csv.contadores_cache_api['faltas'] == len(ids)
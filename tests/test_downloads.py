@@ -0,0 +1,99 @@
+import filecmp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import gera_csv
+
+
+def test_download_com_servidor_comprimindo(pasta_dados, subir_servidor, pasta_temp):
+    # O servidor comprime quem aceita gzip; o download pede identity e grava os bytes originais
+    subir_servidor(comprimir=True)
+    url = f"{gera_csv.url_arquivos}/deputados/csv/deputados.csv"
+    origem = origem_deputados(pasta_dados)
+
+    arquivo_csv = gera_csv.baixar_arquivo("deputados", url, pasta_temp)
+
+    assert arquivo_csv is not None
+    assert filecmp.cmp(arquivo_csv, origem, shallow=False)
+    registro = gera_csv.carregar_manifesto(pasta_temp)[os.path.basename(arquivo_csv)]
+    assert registro["tamanho"] == os.path.getsize(origem)
+    assert registro["sha256"] == gera_csv.calcular_checksum(origem)
+
+
+def test_transferencia_pede_bytes_sem_compressao(pasta_dados, subir_servidor, tmp_path):
+    # Com Accept-Encoding: identity o Content-Length confere com os bytes gravados
+    subir_servidor(comprimir=True)
+    url = f"{gera_csv.url_arquivos}/deputados/csv/deputados.csv"
+    arquivo_parcial = str(tmp_path / "deputados.csv.part")
+
+    status, headers, total, completo = gera_csv.transferir_arquivo(url, arquivo_parcial, {})
+
+    assert (status, completo) == (200, True)
+    assert "Content-Encoding" not in headers
+    assert total == os.path.getsize(arquivo_parcial)
+
+
+def origem_deputados(pasta_dados):
+    return os.path.join(pasta_dados, "arquivos", "deputados", "csv", "deputados.csv")
+
+
+def test_download_condicional_sem_mudanca(pasta_dados, servidor, pasta_temp, capsys):
+    # Na segunda vez o download é condicional (If-None-Match) e o servidor responde 304
+    url = f"{gera_csv.url_arquivos}/deputados/csv/deputados.csv"
+    arquivo_csv = gera_csv.baixar_arquivo("deputados", url, pasta_temp)
+    modificado_em = os.stat(arquivo_csv).st_mtime_ns
+    capsys.readouterr()
+
+    assert gera_csv.baixar_arquivo("deputados", url, pasta_temp) == arquivo_csv
+    assert "não mudou no servidor" in capsys.readouterr().out
+    assert os.stat(arquivo_csv).st_mtime_ns == modificado_em
+
+
+def test_download_condicional_com_cache_corrompido(pasta_dados, servidor, pasta_temp):
+    # 304 com o arquivo local alterado: baixa de novo, sem condição
+    url = f"{gera_csv.url_arquivos}/deputados/csv/deputados.csv"
+    arquivo_csv = gera_csv.baixar_arquivo("deputados", url, pasta_temp)
+    with open(arquivo_csv, "r+b") as arquivo:
+        arquivo.write(b"X")
+
+    assert gera_csv.baixar_arquivo("deputados", url, pasta_temp) == arquivo_csv
+    assert filecmp.cmp(arquivo_csv, origem_deputados(pasta_dados), shallow=False)
+
+
+def test_download_retomado_com_range(pasta_dados, subir_servidor, pasta_temp, monkeypatch):
+    # A primeira resposta é cortada no meio; a segunda tentativa pede só o restante
+    subir_servidor(falhas=1)
+    url = f"{gera_csv.url_arquivos}/deputados/csv/deputados.csv"
+    transferir = gera_csv.transferir_arquivo
+    tentativas = []
+
+    def transferir_registrando(url, arquivo_parcial, cabecalhos, validador_parcial=None):
+        inicio = os.path.getsize(arquivo_parcial) if os.path.exists(arquivo_parcial) else 0
+        resultado = transferir(url, arquivo_parcial, cabecalhos, validador_parcial)
+        tentativas.append((inicio, validador_parcial, resultado[0]))
+        return resultado
+
+    monkeypatch.setattr(gera_csv, "transferir_arquivo", transferir_registrando)
+    # Blocos menores que o arquivo, para que parte dele chegue ao '.part' antes do corte
+    monkeypatch.setattr(gera_csv, "tamanho_bloco_download", 16 * 1024)
+    arquivo_csv = gera_csv.baixar_arquivo("deputados", url, pasta_temp)
+
+    assert filecmp.cmp(arquivo_csv, origem_deputados(pasta_dados), shallow=False)
+    assert len(tentativas) == 2
+    inicio, validador, status = tentativas[1]
+    assert inicio > 0 and validador is not None and status == 206
+    assert not os.path.exists(arquivo_csv + ".part")
+
+
+def test_manifesto_entre_processos(tmp_path):
+    # Processos gravando ao mesmo tempo não perdem os registros uns dos outros
+    pasta_temp = str(tmp_path)
+    nomes = [os.path.join(pasta_temp, f"arquivo_{i}.csv") for i in range(40)]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(gera_csv.atualizar_manifesto, [pasta_temp] * len(nomes), nomes,
+                          [{'tamanho': i} for i in range(len(nomes))]))
+
+    manifesto = gera_csv.carregar_manifesto(pasta_temp)
+    assert {nome: registro['tamanho'] for nome, registro in manifesto.items()} == \
+        {os.path.basename(nome): i for i, nome in enumerate(nomes)}
+    assert not [nome for nome in os.listdir(pasta_temp) if nome.endswith(".tmp")]
@@ -0,0 +1,31 @@
+import os
+
+import pandas as pd
+
+import gera_csv
+
+
+def proposicoes():
+    return pd.DataFrame({
+        'id.proposicao': pd.array([1, None, 3], dtype='Int32'),
+        'ementa': ["Institui o Dia Nacional do Teste", "Altera a Lei nº 1", "Denomina a ponte sobre o rio"],
+    })
+
+
+def test_classificar_ementas_com_id_ausente(tmp_path):
+    pasta_temp = str(tmp_path)
+    esperado = [1, 0, 1]
+
+    assert gera_csv.classificar_ementas(proposicoes(), pasta_temp).tolist() == esperado
+    # Segunda vez, tudo vem do cache
+    assert gera_csv.classificar_ementas(proposicoes(), pasta_temp).tolist() == esperado
+
+
+def test_classificar_ementas_com_cache_corrompido(tmp_path):
+    pasta_temp = str(tmp_path)
+    with open(os.path.join(pasta_temp, gera_csv.arquivo_cache_ementas), 'wb') as arquivo:
+        arquivo.write(b"\x80\x04 isto nao e um pickle")
+
+    assert gera_csv.classificar_ementas(proposicoes(), pasta_temp).tolist() == [1, 0, 1]
+    cache = pd.read_pickle(os.path.join(pasta_temp, gera_csv.arquivo_cache_ementas))
+    assert len(cache['classificacao']) == 3
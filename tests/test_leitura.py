@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pytest
+
+import gera_csv
+
+
+def escrever(caminho, texto):
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(texto)
+
+
+@pytest.mark.skipif(gera_csv.pa is None, reason="cache colunar precisa de pyarrow")
+def test_cache_colunar_invalidado(tmp_path, monkeypatch):
+    pasta_temp = str(tmp_path)
+    arquivo_csv = str(tmp_path / "eventos_2024.csv")
+    escrever(arquivo_csv, "id;descricaoTipo\n1;Seminário\n2;Sessão Deliberativa\n")
+    esquema = {"id": "Int32", "descricaoTipo": "category"}
+    leituras = []
+    ler_csv_com_esquema = gera_csv.ler_csv_com_esquema
+    monkeypatch.setattr(gera_csv, "ler_csv_com_esquema",
+                        lambda *argumentos: leituras.append(argumentos) or ler_csv_com_esquema(*argumentos))
+
+    primeira = gera_csv.ler_csv(arquivo_csv, pasta_temp, esquema)
+    assert os.path.exists(gera_csv.caminho_arquivo_colunar(arquivo_csv))
+    pd.testing.assert_frame_equal(gera_csv.ler_csv(arquivo_csv, pasta_temp, esquema), primeira)
+    assert len(leituras) == 1
+
+    # CSV alterado: o arquivo colunar é refeito
+    escrever(arquivo_csv, "id;descricaoTipo\n1;Seminário\n2;Sessão Deliberativa\n3;Visita Técnica\n")
+    assert gera_csv.ler_csv(arquivo_csv, pasta_temp, esquema)["id"].tolist() == [1, 2, 3]
+    assert len(leituras) == 2
+
+    # Esquema alterado: também
+    assert list(gera_csv.ler_csv(arquivo_csv, pasta_temp, {"id": "Int32"}).columns) == ["id"]
+    assert len(leituras) == 3
+    gera_csv.ler_csv(arquivo_csv, pasta_temp, {"id": "Int32"})
+    assert len(leituras) == 3
+
+
+@pytest.mark.parametrize("data, legislatura", [
+    ("1995-01-31", None),
+    ("1995-02-01", 50),
+    ("2019-01-31 23:59:59", 55),
+    ("2019-02-01 00:00:00", 56),
+    ("2023-01-31", 56),
+    ("2023-02-01", 57),
+    ("2027-01-31", 57),
+    ("2027-02-01", None),
+    (None, None),
+    ("data inválida", None),
+])
+def test_definir_legislatura_nos_limites(data, legislatura):
+    resultado = gera_csv.definir_legislatura(pd.Series([data], dtype=object))
+    assert str(resultado.dtype) == "Int64"
+    if legislatura is None:
+        assert resultado.isna().all()
+    else:
+        assert resultado.tolist() == [legislatura]